@@ -5,15 +5,20 @@ bl_info = {
     "blender": (4, 5, 3),
     "description": "Blender-based Architectural Design Assistant Tool",
 }
+import os
 import bpy
 from . import operators
-from . import ui
 from . import props
 
 
 classes = [
     operators.Setbase,
+    operators.SetSite,
     operators.Auto,
+    operators.AutoModal,
+    operators.Sweep,
+    operators.LoadResults,
+    operators.UpdateLod,
     operators.BrowseSavePath,
     operators.Merge,
     operators.Branch,
@@ -25,30 +30,56 @@ classes = [
     operators.Frature,
     operators.Expland,
     props.ADTProps,
-    ui.Auto_panel,
-    ui.Prop_panel,
-    ui.Merge_panel,
-    ui.Branch_panel,
-    ui.Extract_panel,
-    ui.Offset_panel,
-    ui.Twist_panel,
-    ui.Shift_panel,
-    ui.Carve_panel,
-    ui.Frature_panel,
-    ui.Expland_panel,
 ]
 
 
+def uiClasses():
+    from . import ui
+
+    return [
+        ui.Auto_panel,
+        ui.Prop_panel,
+        ui.Merge_panel,
+        ui.Branch_panel,
+        ui.Extract_panel,
+        ui.Offset_panel,
+        ui.Twist_panel,
+        ui.Shift_panel,
+        ui.Carve_panel,
+        ui.Frature_panel,
+        ui.Expland_panel,
+    ]
+
+
+def isHeadless():
+    """后台运行(blender -b)或环境变量ADT_HEADLESS=1时只注册算子和属性，不注册面板"""
+    return bpy.app.background or os.environ.get("ADT_HEADLESS") == "1"
+
+
+_unregister_classes = None
+
+
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    global _unregister_classes
+
+    registered = classes if isHeadless() else classes + uiClasses()
+    register_classes, _unregister_classes = bpy.utils.register_classes_factory(registered)
+    register_classes()
 
     bpy.types.Scene.adt_props = bpy.props.PointerProperty(type=props.ADTProps)
+    bpy.app.handlers.depsgraph_update_post.append(operators.autoLod)
 
 
 def unregister():
-    for cls in classes:
-        bpy.utils.unregister_class(cls)
+    global _unregister_classes
+
+    operators.closePool()
+    if operators.autoLod in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(operators.autoLod)
+
+    if _unregister_classes is not None:
+        _unregister_classes()
+        _unregister_classes = None
 
     del bpy.types.Scene.adt_props
 
@@ -0,0 +1,276 @@
+"""分片列式数据集：把生成的模型按分片写成可内存映射的 .npy 数组
+
+目录结构:
+    index.json                  分片列表、各次写入的生成参数（runs，分片的params为其序号）
+    shard_00000_verts.npy       float32 (V, 3)  分片内全部模型的顶点（局部坐标）
+    shard_00000_faces.npy       int32   (F, 3)  三角面，顶点序号相对各自模型
+    shard_00000_offsets.npy     int64   (N+1, 2) 每个模型在verts/faces中的起始位置
+    shard_00000_chains.npy      uint8   (N, L)  规则链编码，不足L的位置为NO_RULE
+    shard_00000_models.json     每个模型的名称、序号等元数据
+
+写入时在内存中缓冲，每满一个分片一次性写出；读取时用 mmap_mode="r" 按需映射。
+"""
+
+import json
+import os
+
+import numpy as np
+
+from . import transport
+
+FORMAT_VERSION = 2
+INDEX_NAME = "index.json"
+# 规则链补齐值
+NO_RULE = 255
+
+ARRAYS = ("verts", "faces", "offsets", "chains")
+
+
+def shardName(number):
+    return f"shard_{number:05d}"
+
+
+def shardPaths(path, name):
+    """OutPut:{数组名: 文件路径}，另含 models 元数据路径"""
+    paths = {key: os.path.join(path, f"{name}_{key}.npy") for key in ARRAYS}
+    paths["models"] = os.path.join(path, f"{name}_models.json")
+    return paths
+
+
+def loadIndex(path):
+    with open(os.path.join(path, INDEX_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def indexRuns(index):
+    """OutPut:各次写入的生成参数列表（版本1的索引只有一组params）"""
+    return index.get("runs") or [index.get("params", {})]
+
+
+def _writeJson(data, path):
+    # 先写临时文件再替换，中断时不会留下半个索引
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class DatasetWriter:
+    """缓冲写入器，每shard_size个模型写出一个分片
+
+    目录中已有数据集时在其后追加新分片；参数不同的写入各自记入runs，
+    新分片的params指向本次写入的参数，不会沿用首次写入的参数
+    """
+
+    def __init__(self, path, shard_size=1000, params=None):
+        self.path = path
+        self.shard_size = max(1, shard_size)
+        os.makedirs(path, exist_ok=True)
+
+        # 经JSON往返后再比较，元组与列表等写入后不变的差异不算参数不同
+        params = json.loads(json.dumps(params or {}))
+        if os.path.exists(os.path.join(path, INDEX_NAME)):
+            self.index = loadIndex(path)
+            self.index["runs"] = indexRuns(self.index)
+            self.index["version"] = FORMAT_VERSION
+        else:
+            self.index = {"version": FORMAT_VERSION, "params": params, "runs": [], "shards": []}
+
+        runs = self.index["runs"]
+        if params not in runs:
+            runs.append(params)
+        self.run = runs.index(params)
+        self._reset()
+
+    def _reset(self):
+        self.verts = []
+        self.faces = []
+        self.chains = []
+        self.models = []
+
+    @property
+    def count(self):
+        """OutPut:已写出和缓冲中的模型总数"""
+        return sum(shard["models"] for shard in self.index["shards"]) + len(self.models)
+
+    def add(self, verts, faces, chain, meta=None):
+        """缓冲一个模型，满一个分片时写出（复制数据，可直接传入共享内存视图）
+
+        OutPut:写出的分片名，未写出时为None
+        """
+        self.verts.append(np.array(verts, dtype=np.float32).reshape(-1, 3))
+        self.faces.append(np.array(faces, dtype=np.int32).reshape(-1, 3))
+        self.chains.append(np.array(chain, dtype=np.uint8).ravel())
+        self.models.append(dict(meta or {}))
+
+        if len(self.models) >= self.shard_size:
+            return self.flush()
+        return None
+
+    def addShared(self, descriptor, chain, meta=None):
+        """缓冲worker经共享内存发来的模型（verts/faces），读取后删除共享内存"""
+        block = transport.receive(descriptor)
+        try:
+            return self.add(block["verts"], block["faces"], chain, meta)
+        finally:
+            block.close()
+            block.unlink()
+
+    def flush(self):
+        """把缓冲区写成一个分片并更新索引"""
+        if not self.models:
+            return None
+
+        count = len(self.models)
+        offsets = np.zeros((count + 1, 2), dtype=np.int64)
+        offsets[1:, 0] = np.cumsum([len(v) for v in self.verts])
+        offsets[1:, 1] = np.cumsum([len(f) for f in self.faces])
+
+        width = max(len(chain) for chain in self.chains)
+        chains = np.full((count, width), NO_RULE, dtype=np.uint8)
+        for row, chain in zip(chains, self.chains):
+            row[: len(chain)] = chain
+
+        name = shardName(len(self.index["shards"]))
+        paths = shardPaths(self.path, name)
+        np.save(paths["verts"], np.concatenate(self.verts))
+        np.save(paths["faces"], np.concatenate(self.faces))
+        np.save(paths["offsets"], offsets)
+        np.save(paths["chains"], chains)
+        _writeJson(self.models, paths["models"])
+
+        self.index["shards"].append(
+            {
+                "name": name,
+                "models": count,
+                "verts": int(offsets[-1, 0]),
+                "faces": int(offsets[-1, 1]),
+                "params": self.run,
+            }
+        )
+        _writeJson(self.index, os.path.join(self.path, INDEX_NAME))
+
+        self._reset()
+        return name
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DatasetReader:
+    """按需内存映射分片的只读访问，model(i) 返回映射数组上的视图"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index = loadIndex(path)
+        self.shards = self.index["shards"]
+        # starts[k] 为第k个分片第一个模型的全局序号
+        self.starts = np.concatenate(([0], np.cumsum([s["models"] for s in self.shards])))
+        self._mapped = {}
+        self._models = {}
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    @property
+    def params(self):
+        """OutPut:首次写入的生成参数，追加过其他参数的写入时用modelParams"""
+        return self.index.get("params", {})
+
+    def modelParams(self, index):
+        """OutPut:生成第index个模型时的参数"""
+        number, _ = self.locate(index)
+        return indexRuns(self.index)[self.shards[number].get("params", 0)]
+
+    def shard(self, number):
+        """OutPut:{verts, faces, offsets, chains} 内存映射数组"""
+        if number not in self._mapped:
+            paths = shardPaths(self.path, self.shards[number]["name"])
+            self._mapped[number] = {
+                key: np.load(paths[key], mmap_mode="r") for key in ARRAYS
+            }
+        return self._mapped[number]
+
+    def locate(self, index):
+        """OutPut:(分片号, 分片内序号)"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"模型序号越界: {index}")
+        number = int(np.searchsorted(self.starts, index, side="right")) - 1
+        return number, int(index - self.starts[number])
+
+    def model(self, index):
+        """OutPut:verts(N,3 float32), faces(M,3 int32)，均为映射视图"""
+        number, local = self.locate(index)
+        arrays = self.shard(number)
+        (v0, f0), (v1, f1) = arrays["offsets"][local], arrays["offsets"][local + 1]
+        return arrays["verts"][v0:v1], arrays["faces"][f0:f1]
+
+    def chain(self, index):
+        """OutPut:规则链编码（去掉补齐值）"""
+        number, local = self.locate(index)
+        row = np.asarray(self.shard(number)["chains"][local])
+        return row[row != NO_RULE]
+
+    def meta(self, index):
+        number, local = self.locate(index)
+        if number not in self._models:
+            paths = shardPaths(self.path, self.shards[number]["name"])
+            with open(paths["models"], "r", encoding="utf-8") as f:
+                self._models[number] = json.load(f)
+        return self._models[number][local]
+
+
+def storedIndices(path, run=None):
+    """OutPut:已写入分片的模型序号集合，run不为None时只统计元数据中run相同的模型"""
+    if not os.path.exists(os.path.join(path, INDEX_NAME)):
+        return set()
+    stored = set()
+    for shard in loadIndex(path)["shards"]:
+        with open(shardPaths(path, shard["name"])["models"], "r", encoding="utf-8") as f:
+            for meta in json.load(f):
+                if run is None or meta.get("run") == run:
+                    stored.add(meta.get("index"))
+    return stored
+
+
+def spiralIndex(x, y):
+    """setBoxPos(2D)的逆运算，OutPut:网格坐标(x, y)处的物体序号（支持数组）"""
+    x = np.asarray(x, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    layer = np.maximum(np.abs(x), np.abs(y))
+    # 前面各层共 (2*layer-1)^2 个位置
+    before = (2 * layer - 1) ** 2
+
+    index = np.where(
+        (y == -layer) & (x < layer),
+        x + layer,  # 底边
+        np.where(
+            (x == layer) & (y < layer),
+            3 * layer + y,  # 右边
+            np.where(
+                y == layer,
+                5 * layer - x,  # 顶边
+                7 * layer - y,  # 左边
+            ),
+        ),
+    )
+    return np.where(layer == 0, 0, before + index)
+
+
+def windowIndices(centerx, centery, radius, count):
+    """OutPut:以网格(centerx, centery)为中心、半径radius格的窗口内的
+    (物体序号, 网格x, 网格y)，只保留序号小于count的格子
+    """
+    span = np.arange(-radius, radius + 1)
+    xs, ys = np.meshgrid(centerx + span, centery + span, indexing="ij")
+    xs = xs.ravel()
+    ys = ys.ravel()
+    ids = spiralIndex(xs, ys)
+    keep = ids < count
+    return ids[keep], xs[keep], ys[keep]
@@ -0,0 +1,195 @@
+"""方向表：整数方向编码、预计算的单位向量与投影矩阵、批量随机方向采样
+
+编码 0 为无方向（零向量），1~6 依次为 +x,+y,+z,-x,-y,-z，与字符串方向一一对应。
+"""
+
+import numpy as np
+
+NONE, PX, PY, PZ, NX, NY, NZ = range(7)
+
+NAMES = ("", "+x", "+y", "+z", "-x", "-y", "-z")
+
+# 字符串和整数编码都映射到编码，未知值为NONE
+CODES = {name: code for code, name in enumerate(NAMES) if name}
+CODES.update({code: code for code in range(len(NAMES))})
+
+VECTORS = np.array(
+    [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (-1, 0, 0), (0, -1, 0), (0, 0, -1)],
+    dtype=np.float64,
+)
+# 供构造mathutils.Vector使用
+VECTOR_TUPLES = tuple(tuple(float(v) for v in row) for row in VECTORS)
+
+# 轴序号：0,1,2 对应 x,y,z，NONE为-1
+AXES = (-1, 0, 1, 2, 0, 1, 2)
+
+# 去掉沿方向分量的投影矩阵 I - v v^T（NONE为单位矩阵，即不约束）
+PROJECTORS = np.eye(3)[None, :, :] - VECTORS[:, :, None] * VECTORS[:, None, :]
+
+
+def code(dir):
+    """OutPut:方向编码（字符串或整数均可）"""
+    return CODES.get(dir, NONE)
+
+
+def projector(perp):
+    """OutPut:去掉perp方向分量的3x3投影矩阵，perp可为方向编码、字符串或向量"""
+    if perp is None or isinstance(perp, (int, str)):
+        return PROJECTORS[code(perp)]
+    perp = np.asarray(perp, dtype=np.float64)
+    length = np.linalg.norm(perp)
+    if length == 0:
+        return PROJECTORS[NONE]
+    perp = perp / length
+    return np.eye(3) - np.outer(perp, perp)
+
+
+def randomVectors(n, perp=None, rng=None):
+    """OutPut:(n,3) 随机单位向量，给定perp时与perp垂直
+
+    与 randomVector 相同：在[-1,1]^3内均匀取点，投影后归一化
+    """
+    rng = np.random.default_rng(rng)
+    matrix = projector(perp)
+
+    vectors = rng.uniform(-1, 1, (n, 3)) @ matrix.T
+    lengths = np.linalg.norm(vectors, axis=1)
+    # 极少数投影后接近零的样本重新抽取
+    bad = lengths < 1e-9
+    while bad.any():
+        vectors[bad] = rng.uniform(-1, 1, (int(bad.sum()), 3)) @ matrix.T
+        lengths[bad] = np.linalg.norm(vectors[bad], axis=1)
+        bad = lengths < 1e-9
+
+    return vectors / lengths[:, None]
+
+
+def basisMatrix(updir, stretchdir):
+    """OutPut:列为(右, 伸展, 上)的3x3正交旋转矩阵
+
+    以updir为准对stretchdir做正交化，右方向取 stretch x up 保证右手系
+    """
+    up = np.asarray(updir, dtype=np.float64)
+    up = up / np.linalg.norm(up)
+    stretch = np.asarray(stretchdir, dtype=np.float64)
+    stretch = stretch - (stretch @ up) * up
+    stretch = stretch / np.linalg.norm(stretch)
+    right = np.cross(stretch, up)
+    return np.stack([right, stretch, up], axis=1)
+
+
+# 单位立方体角点（x∈[-0.5,0.5]，y∈[0,1]，z∈[-0.5,0.5]）与朝外的四边形面
+BOX_CORNERS = np.array(
+    [
+        (-0.5, 0, -0.5), (0.5, 0, -0.5), (0.5, 1, -0.5), (-0.5, 1, -0.5),
+        (-0.5, 0, 0.5), (0.5, 0, 0.5), (0.5, 1, 0.5), (-0.5, 1, 0.5),
+    ],
+    dtype=np.float64,
+)
+BOX_QUADS = np.array(
+    [
+        (0, 3, 2, 1),  # -z
+        (4, 5, 6, 7),  # +z
+        (0, 1, 5, 4),  # -y
+        (2, 3, 7, 6),  # +y
+        (0, 4, 7, 3),  # -x
+        (1, 2, 6, 5),  # +x
+    ],
+    dtype=np.int32,
+)
+
+
+def boxVerts(updir, stretchdir, width, height, depth, isCenter=False):
+    """OutPut:(8,3) 盒子顶点（相对放置点）
+
+    宽沿右方向、深沿stretchdir、高沿updir；isCenter为True时深度方向为[-depth, depth]，
+    否则为[0, depth]（与原crateBoxWithDir一致）
+    """
+    local = BOX_CORNERS * (width, depth, height)
+    if isCenter:
+        local[:, 1] = (BOX_CORNERS[:, 1] * 2 - 1) * depth
+    return local @ basisMatrix(updir, stretchdir).T
+
+
+def lWallOutline(dir1, dir2, width, length):
+    """L形墙截面：沿dir1、dir2两个方向各伸出length、宽width的墙及其交角
+
+    在(dir1, r1)平面坐标中计算，r_i = up x d_i。P(s1, s2)为直线 p·r1 = s1·w/2 与
+    p·r2 = s2·w/2 的交点，A_i(s)为第i面墙s侧的远端点。
+    OutPut:(8,2) 逆时针的(x, y)顶点（dir1, r1坐标），dir1与dir2平行时为None
+    """
+    d1 = np.array([1.0, 0.0])
+    r1 = np.array([0.0, 1.0])
+    d2 = np.asarray(dir2, dtype=np.float64)
+    r2 = np.array([-d2[1], d2[0]])
+    half = width / 2
+
+    d1r2 = d1 @ r2
+    if abs(d1r2) < 1e-6:
+        return None
+    r1r2 = r1 @ r2
+
+    def P(s1, s2):
+        y = s1 * half
+        return np.array([(s2 * half - y * r1r2) / d1r2, y])
+
+    # 第1面墙从交角的 p·r2 = f2·w/2 边伸出，第2面墙从 p·r1 = f1·w/2 边伸出
+    f2 = np.sign(d1 @ r2)
+    f1 = np.sign(d2 @ r1)
+    corners = {(s1, s2): P(s1, s2) for s1 in (-1, 1) for s2 in (-1, 1)}
+    reach = length + max(abs(p @ d) for p in corners.values() for d in (d1, d2))
+
+    def A1(s):
+        return s * half * r1 + reach * d1
+
+    def A2(s):
+        return s * half * r2 + reach * d2
+
+    outline = np.array(
+        [
+            corners[(f1, f2)],
+            A1(f1),
+            A1(-f1),
+            corners[(-f1, f2)],
+            corners[(-f1, -f2)],
+            corners[(f1, -f2)],
+            A2(-f2),
+            A2(f2),
+        ]
+    )
+
+    # 统一为逆时针
+    x, y = outline[:, 0], outline[:, 1]
+    if np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)) < 0:
+        outline = outline[::-1]
+    return outline
+
+
+def lWallPrism(updir, dir1, dir2, width, length):
+    """把L形截面沿updir拉伸为[-length, length]的棱柱
+
+    OutPut:verts(16,3)（相对放置点）, loops(面顶点序号展开), loop_starts；dir1与dir2平行时为None
+    """
+    basis = basisMatrix(updir, dir1)
+    # basis 列为 (stretch x up, stretch, up)，截面坐标取 (dir1, r1 = up x dir1)
+    d1, up = basis[:, 1], basis[:, 2]
+    r1 = -basis[:, 0]
+    d2 = np.asarray(dir2, dtype=np.float64)
+    d2 = d2 - (d2 @ up) * up
+    d2 = d2 / np.linalg.norm(d2)
+
+    outline = lWallOutline(dir1, (d2 @ d1, d2 @ r1), width, length)
+    if outline is None:
+        return None
+
+    plane = outline[:, :1] * d1 + outline[:, 1:] * r1
+    verts = np.concatenate([plane - length * up, plane + length * up])
+
+    count = len(outline)
+    bottom = np.arange(count)[::-1]
+    top = np.arange(count) + count
+    sides = [(i, (i + 1) % count, (i + 1) % count + count, i + count) for i in range(count)]
+
+    loops = np.concatenate([bottom, top, np.ravel(sides)]).astype(np.int32)
+    starts = np.concatenate([[0, count], 2 * count + 4 * np.arange(count)]).astype(np.int32)
+    return verts, loops, starts
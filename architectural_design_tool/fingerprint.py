@@ -0,0 +1,112 @@
+"""几何指纹：与平移、旋转无关的廉价形体特征，用于Auto中的去重
+
+特征向量 = [log体积, log表面积, 主轴尺度比(2), 法线张量特征值(3), 法线-径向夹角直方图(bins)]
+所有量都按面积加权，与网格细分程度无关。两个指纹的所有分量差都不超过容差时视为重复。
+"""
+
+import numpy as np
+
+DEFAULT_BINS = 8
+
+
+def triangleData(verts, tris):
+    """OutPut:每个三角形的重心(M,3)、叉积(M,3)与面积(M)"""
+    v0 = verts[tris[:, 0]]
+    v1 = verts[tris[:, 1]]
+    v2 = verts[tris[:, 2]]
+    crosses = np.cross(v1 - v0, v2 - v0)
+    areas = 0.5 * np.linalg.norm(crosses, axis=1)
+    return (v0 + v1 + v2) / 3.0, crosses, areas
+
+
+def tetraVolumes(verts, tris, crosses=None):
+    """OutPut:每个三角形与原点构成的四面体有向体积(M)
+
+    crosses为triangleData的叉积时直接复用：v0·((v1-v0)×(v2-v0)) = v0·(v1×v2)
+    """
+    v0 = verts[tris[:, 0]]
+    if crosses is None:
+        crosses = np.cross(verts[tris[:, 1]], verts[tris[:, 2]])
+    return np.einsum("ij,ij->i", v0, crosses) / 6.0
+
+
+def signedVolume(verts, tris):
+    return float(tetraVolumes(verts, tris).sum())
+
+
+def fingerprint(verts, tris, bins=DEFAULT_BINS):
+    """OutPut:特征向量(float64)；空网格或零面积返回None"""
+    if len(verts) == 0 or len(tris) == 0:
+        return None
+
+    centers, crosses, areas = triangleData(verts, tris)
+    area = float(areas.sum())
+    if area <= 1e-12:
+        return None
+    volume = abs(signedVolume(verts, tris))
+
+    valid = areas > 1e-12
+    centers = centers[valid]
+    normals = crosses[valid] / (2 * areas[valid])[:, None]
+    weights = areas[valid] / area
+
+    # 表面二阶矩的特征值比（旋转不变的包围尺度比）
+    centroid = weights @ centers
+    offsets = centers - centroid
+    moments = np.linalg.eigvalsh((offsets * weights[:, None]).T @ offsets)[::-1]
+    ratios = np.sqrt(np.clip(moments[1:], 0, None) / max(moments[0], 1e-12))
+
+    # 法线张量特征值：描述面朝向的分布
+    normal_tensor = np.linalg.eigvalsh((normals * weights[:, None]).T @ normals)[::-1]
+
+    # 面法线与重心径向夹角的直方图
+    lengths = np.linalg.norm(offsets, axis=1)
+    radial = offsets / np.maximum(lengths, 1e-12)[:, None]
+    cosines = np.abs(np.einsum("ij,ij->i", normals, radial))
+    hist, _ = np.histogram(cosines, bins=bins, range=(0, 1), weights=weights)
+
+    return np.concatenate(
+        [
+            [np.log(max(volume, 1e-12)), np.log(area)],
+            ratios,
+            normal_tensor,
+            hist,
+        ]
+    )
+
+
+class FingerprintIndex:
+    """内存中的指纹索引，以(log体积, log面积)网格为键快速查找近邻"""
+
+    def __init__(self, tolerance=0.02):
+        self.tolerance = tolerance
+        self.cells = {}
+        self.count = 0
+        self.rejected = 0
+
+    def key(self, fp):
+        return (
+            int(np.floor(fp[0] / self.tolerance)),
+            int(np.floor(fp[1] / self.tolerance)),
+        )
+
+    def find(self, fp):
+        """OutPut:与fp重复的已有指纹序号，无则返回None"""
+        kx, ky = self.key(fp)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for index, other in self.cells.get((kx + dx, ky + dy), []):
+                    if np.abs(other - fp).max() <= self.tolerance:
+                        return index
+        return None
+
+    def add(self, fp):
+        """若不重复则加入索引，OutPut:是否为重复"""
+        if fp is None:
+            return False
+        if self.find(fp) is not None:
+            self.rejected += 1
+            return True
+        self.cells.setdefault(self.key(fp), []).append((self.count, fp))
+        self.count += 1
+        return False
@@ -1,13 +1,19 @@
 import bpy
+import itertools
 import random
 import bmesh
 import math
+import time
+import uuid
+import numpy as np
 from mathutils.bvhtree import BVHTree
-from mathutils import Vector, Matrix
+from mathutils import Vector
+
+from . import directions, lod, predicates, transport, weld
 
 if 1:  # 基础函数
 
-    def onePass(id1, id2, offset1, offset2, addname):
+    def onePass(id1, id2, offset1, offset2, addname, prefix="", origin=Vector((0, 0, 0))):
         obj = bpy.context.scene.objects["BaseBox"]
         id2 += 1
 
@@ -15,8 +21,10 @@ if 1:  # 基础函数
         new_obj.data = obj.data.copy()
         bpy.context.collection.objects.link(new_obj)
         bpy.context.view_layer.objects.active = new_obj
-        new_obj.location = Vector((offset1 * id1, offset2 * id2, 0))
-        new_obj.name = str(id1) + addname
+        new_obj.location = origin + Vector((offset1 * id1, offset2 * id2, 0))
+        new_obj.name = prefix + str(id1) + addname
+        clearTracking(new_obj)
+        return new_obj
 
     def clean():
         """清理未使用的对象和数据块"""
@@ -29,6 +37,7 @@ if 1:  # 基础函数
             if obj.users == 0:
                 bpy.data.objects.remove(obj)
 
+        clearMeshCache()
         bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
 
     def setBoxPos(obj_id, spacing, is_3d=False):
@@ -163,20 +172,8 @@ if 1:  # 基础函数
         )
 
     def dir2Vec3(dir):
-        if dir == "+x":
-            return Vector((1, 0, 0))
-        elif dir == "+y":
-            return Vector((0, 1, 0))
-        elif dir == "+z":
-            return Vector((0, 0, 1))
-        elif dir == "-x":
-            return Vector((-1, 0, 0))
-        elif dir == "-y":
-            return Vector((0, -1, 0))
-        elif dir == "-z":
-            return Vector((0, 0, -1))
-        else:
-            return Vector((0, 0, 0))
+        """dir为方向字符串(+x..-z)或方向编码，其余值返回零向量"""
+        return Vector(directions.VECTOR_TUPLES[directions.CODES.get(dir, 0)])
 
     def randomValue(min=0, max=1):
         return random.uniform(min, max)
@@ -184,6 +181,11 @@ if 1:  # 基础函数
     def randomBool():
         return random.choice([True, False])
 
+    def toList(objs):
+        if isinstance(objs, (list, tuple)):
+            return objs
+        return [objs]
+
     def setActive(obj):
         bpy.context.view_layer.objects.active = obj
 
@@ -198,37 +200,200 @@ if 1:  # 基础函数
     def delobj(obj):
         bpy.data.objects.remove(obj)
 
+    def snapshot(obj):
+        """OutPut:obj不链接到场景的副本（含网格和追踪数据），规则失败时用于回退"""
+        new_obj = obj.copy()
+        new_obj.data = obj.data.copy()
+        return new_obj
+
+    def restoreSnapshot(snap, name="BaseBox"):
+        """删除场景中的name物体，换成snap的副本，OutPut:恢复的物体"""
+        old = bpy.context.scene.objects.get(name)
+        if old is not None:
+            delobj(old)
+        obj = snapshot(snap)
+        bpy.context.collection.objects.link(obj)
+        obj.name = name
+        setActive(obj)
+        return obj
+
+    def dropSnapshot(snap):
+        mesh = snap.data
+        bpy.data.objects.remove(snap)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
     def applyMod(obj, name):
         bpy.context.view_layer.objects.active = obj
         bpy.ops.object.modifier_apply(modifier=name)
+        touchMesh(obj)
         return obj
 
     def getBound(obj):
-        """OutPut:+x,+y,+z,-x,-y,-z"""
-
-        maxx = maxy = maxz = -float("inf")
-        minx = miny = minz = float("inf")
-
-        # 遍历顶点，计算边界框
-        for v in obj.data.vertices:
-            co = obj.matrix_world @ v.co
-
-            # 更新边界值
-            if co.x > maxx:
-                maxx = co.x
-            if co.x < minx:
-                minx = co.x
-            if co.y > maxy:
-                maxy = co.y
-            if co.y < miny:
-                miny = co.y
-            if co.z > maxz:
-                maxz = co.z
-            if co.z < minz:
-                minz = co.z
+        """OutPut:+x,+y,+z,-x,-y,-z（使用包围盒缓存）"""
+        bounds = cachedBounds(obj)
+        if bounds is None:
+            inf = float("inf")
+            return -inf, -inf, -inf, inf, inf, inf
 
+        minx, miny, minz, maxx, maxy, maxz = bounds
         return maxx, maxy, maxz, minx, miny, minz
 
+    def getMeshArrays(obj, world=True):
+        """OutPut:verts(N,3 float64),tris(M,3 int32)，由foreach_get读取loop_triangles"""
+        mesh = obj.data
+        mesh.calc_loop_triangles()
+
+        verts = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", verts)
+        verts = verts.reshape(-1, 3)
+
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        tris = tris.reshape(-1, 3)
+
+        if world:
+            matrix = np.array(obj.matrix_world)
+            verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
+
+        return verts, tris
+
+    def meshFromArrays(name, verts, faces, loop_starts=None):
+        """用foreach_set直接从数组（可为内存映射视图）创建网格，不经过Python列表
+
+        verts:(N,3) float32, faces:(M,k) int32，每个面k个顶点（三角面k=3）；
+        给定loop_starts时faces为展开的面顶点序号，loop_starts为每个面的起始位置
+        """
+        verts = np.ascontiguousarray(verts, dtype=np.float32)
+        faces = np.ascontiguousarray(faces, dtype=np.int32)
+
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(verts))
+        mesh.vertices.foreach_set("co", verts.ravel())
+        mesh.loops.add(faces.size)
+        mesh.loops.foreach_set("vertex_index", faces.ravel())
+        if loop_starts is None:
+            corners = faces.shape[1] if faces.ndim == 2 else 3
+            loop_starts = np.arange(0, faces.size, corners, dtype=np.int32)
+        mesh.polygons.add(len(loop_starts))
+        mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_starts, dtype=np.int32))
+        mesh.update(calc_edges=True)
+        return mesh
+
+    def shareMesh(obj, world=True, polygons=True):
+        """把obj的网格写入共享内存，OutPut:transport.SharedArrays
+
+        verts(N,3 float32)、faces(M,3 int32 三角面)与导出布局相同，polygons为True时另含loops/starts
+        """
+        verts, faces = getMeshArrays(obj, world)
+        arrays = {"verts": verts.astype(np.float32), "faces": faces}
+        if polygons:
+            mesh = obj.data
+            arrays["loops"] = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get("vertex_index", arrays["loops"])
+            arrays["starts"] = np.empty(len(mesh.polygons), dtype=np.int32)
+            mesh.polygons.foreach_get("loop_start", arrays["starts"])
+        return transport.share(**arrays)
+
+    def meshFromShared(name, block):
+        """用共享内存中的网格（shareMesh写入）新建网格，直接从映射视图foreach_set；有loops时保留多边形"""
+        if "loops" in block:
+            return meshFromArrays(name, block["verts"], block["loops"], block["starts"])
+        return meshFromArrays(name, block["verts"], block["faces"])
+
+    def makeLods(obj, resolution=8, level="PROXY", keep_full=True):
+        """为obj生成简化代理和包围盒代理网格，并切换到level显示
+
+        保留的网格都设为假用户，切换时不会被clean()清理；keep_full为False时（各阶段的中间副本）
+        不保留原始网格，切换到代理后随clean()释放，之后该物体只在两种代理之间切换
+        """
+        full = obj.data
+        verts, tris = getMeshArrays(obj, world=False)
+        proxy = meshFromArrays(obj.name + "_proxy", *lod.clusterDecimate(verts, tris, resolution))
+        box = meshFromArrays(obj.name + "_box", *lod.boxProxy(verts))
+
+        meshes = {"FULL": full} if keep_full else {}
+        meshes.update(PROXY=proxy, BOX=box)
+        for mesh in meshes.values():
+            mesh.use_fake_user = True
+        obj["adt_lod"] = {name: mesh.name for name, mesh in meshes.items()}
+        setLod(obj, level)
+        return obj
+
+    def setLod(obj, level):
+        """切换obj显示的LOD网格，没有该级别（未保留原始网格）时不切换，OutPut:是否切换"""
+        names = obj.get("adt_lod")
+        if names is None or level not in names:
+            return False
+        mesh = bpy.data.meshes.get(names[level])
+        if mesh is None or obj.data == mesh:
+            return False
+        obj.data = mesh
+        return True
+
+    def dropLods(obj):
+        """取消obj各LOD网格的假用户，使其随物体一起被clean()清理"""
+        names = obj.get("adt_lod")
+        if names is None:
+            return
+        for name in names.values():
+            mesh = bpy.data.meshes.get(name)
+            if mesh is not None:
+                mesh.use_fake_user = False
+
+    def worldBounds(obj):
+        """OutPut:世界坐标包围盒 [minx, miny, minz, maxx, maxy, maxz]"""
+        verts = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+        obj.data.vertices.foreach_get("co", verts)
+        verts = verts.reshape(-1, 3)
+        if not len(verts):
+            return None
+
+        matrix = np.array(obj.matrix_world)
+        verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
+        return list(verts.min(axis=0)) + list(verts.max(axis=0))
+
+    def worldOBB(obj):
+        """OutPut:(OBB, isBox)，OBB为predicates的(center, half)，空网格为None
+
+        规则生成的盒子把方向烘焙在顶点里、物体本身无旋转，因此盒轴由世界坐标顶点求得（见predicates.fitOBB）；
+        isBox表示网格恰好是这个长方体（8个顶点是它的8个角、6个面），此时OBB判断是精确的
+        """
+        mesh = obj.data
+        verts = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", verts)
+        verts = verts.reshape(-1, 3)
+        if not len(verts):
+            return None, False
+
+        matrix = np.array(obj.matrix_world)
+        box, isBox = predicates.fitOBB(verts @ matrix[:3, :3].T + matrix[:3, 3])
+        return box, isBox and len(mesh.polygons) == 6
+
+    def unionBounds(a, b):
+        """OutPut:两个包围盒的并集（任一为None时返回另一个）"""
+        if a is None:
+            return None if b is None else list(b)
+        if b is None:
+            return list(a)
+        return [min(a[k], b[k]) for k in range(3)] + [max(a[k], b[k]) for k in range(3, 6)]
+
+    def updatedBounds(before, cutter, type, eps=1e-6):
+        """布尔运算后的包围盒增量更新，OutPut:新包围盒，None表示需要重新计算
+
+        add:两者并集；sub:切割体未触及原包围盒任何一侧时不变；mul:重新计算
+        """
+        if type == "add":
+            return unionBounds(before, cutter)
+        if type == "sub" and before is not None:
+            if cutter is None:
+                return list(before)
+            for k in range(3):
+                if cutter[k] <= before[k] + eps or cutter[k + 3] >= before[k + 3] - eps:
+                    return None
+            return list(before)
+        return None
+
     def randomInsidePoint(obj):
 
         maxx, maxy, maxz, minx, miny, minz = getBound(obj)
@@ -240,27 +405,292 @@ if 1:  # 基础函数
         return Vector((posx, posy, posz))
 
     def randomDir():
-        return random.choice(["+x", "+y", "+z", "-x", "-y", "-z"])
+        return directions.NAMES[random.randint(1, 6)]
 
-    def randomVector(dir=Vector((0, 0, 0))):
-        """dir为限定的垂直方向（Vector）"""
+    def randomVectors(n, dir=None):
+        """一次采样n个随机单位向量（numpy (n,3)），dir为限定的垂直方向（Vector、方向字符串或编码）
 
-        rdir = Vector(
-            (randomValue(-1, 1), randomValue(-1, 1), randomValue(-1, 1))
-        ).normalized()
+        随机数生成器由random模块派生，random.seed可复现
+        """
+        return directions.randomVectors(n, dir, random.getrandbits(64))
 
-        if dir == Vector((0, 0, 0)):
-            return rdir
-        else:
-            dir_component = rdir.dot(dir)
-            caled_rdir = rdir - dir_component * dir
-            return caled_rdir.normalized()
+    def randomVector(dir=Vector((0, 0, 0))):
+        """dir为限定的垂直方向（Vector）"""
+        return Vector(randomVectors(1, dir)[0])
 
     def centerPos(obj):
         maxx, maxy, maxz, minx, miny, minz = getBound(obj)
         return Vector(((maxx + minx) / 2, (maxy + miny) / 2, (maxz + minz) / 2))
 
 
+if 1:  # 增量缓存
+
+    # 几何修改时为网格分配新的修订号(adt_rev)，缓存键为(修订号, 顶点数, 世界矩阵)，
+    # 因此移动、复制、transform_apply都不会读到过期数据。
+    # adt_rev随.blend保存、随mesh.copy()复制，修订号带本进程的随机前缀，
+    # 读入的旧文件或其他进程生成的网格不会与本进程新分配的修订号相同
+    _session = uuid.uuid4().hex[:12]
+    _revisions = itertools.count(1)
+    # 键 -> {"bounds": 世界包围盒, "obb": (有向包围盒, 是否为盒子), "bvh": 世界坐标BVHTree}，按最近使用顺序排列
+    meshCache = {}
+    MESH_CACHE_SIZE = 64
+
+    def touchMesh(obj):
+        """标记obj的几何已被修改，OutPut:新修订号"""
+        rev = f"{_session}:{next(_revisions)}"
+        obj.data["adt_rev"] = rev
+        return rev
+
+    def clearMeshCache():
+        meshCache.clear()
+
+    def _cacheEntry(obj):
+        mesh = obj.data
+        rev = mesh.get("adt_rev")
+        if rev is None:
+            rev = touchMesh(obj)
+        matrix = tuple(value for row in obj.matrix_world for value in row)
+        key = (rev, len(mesh.vertices), matrix)
+
+        entry = meshCache.pop(key, None)
+        if entry is None:
+            entry = {}
+            if len(meshCache) >= MESH_CACHE_SIZE:
+                del meshCache[next(iter(meshCache))]
+        meshCache[key] = entry
+        return entry
+
+    def cachedBounds(obj):
+        """OutPut:世界包围盒 [minx, miny, minz, maxx, maxy, maxz]，几何未变时直接取缓存"""
+        entry = _cacheEntry(obj)
+        if "bounds" not in entry:
+            entry["bounds"] = worldBounds(obj)
+        return entry["bounds"]
+
+    def setCachedBounds(obj, bounds):
+        _cacheEntry(obj)["bounds"] = bounds
+
+    def cachedBVH(obj):
+        """OutPut:世界坐标BVHTree，几何未变时直接取缓存"""
+        entry = _cacheEntry(obj)
+        if "bvh" not in entry:
+            bm = bmesh.new()
+            bm.from_mesh(obj.data)
+            bm.transform(obj.matrix_world)
+            entry["bvh"] = BVHTree.FromBMesh(bm)
+            bm.free()
+        return entry["bvh"]
+
+    def cachedOBB(obj):
+        """OutPut:(世界坐标OBB, isBox)，见worldOBB，几何未变时直接取缓存"""
+        entry = _cacheEntry(obj)
+        if "obb" not in entry:
+            entry["obb"] = worldOBB(obj)
+        return entry["obb"]
+
+    def markDirty(obj):
+        """把obj的全部面标记为脏(adt_dirty)，布尔运算会把该面属性带到结果网格上"""
+        mesh = obj.data
+        attr = mesh.attributes.get("adt_dirty")
+        if attr is None:
+            attr = mesh.attributes.new("adt_dirty", "BOOLEAN", "FACE")
+        attr.data.foreach_set("value", np.ones(len(mesh.polygons), dtype=bool))
+
+    def dirtyVertices(obj, clear=True):
+        """OutPut:脏面上的顶点索引，网格没有adt_dirty属性时为None"""
+        mesh = obj.data
+        attr = mesh.attributes.get("adt_dirty")
+        if attr is None:
+            return None
+
+        flags = np.zeros(len(mesh.polygons), dtype=bool)
+        attr.data.foreach_get("value", flags)
+        totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", totals)
+        loops = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loops)
+
+        if clear:
+            mesh.attributes.remove(attr)
+        return np.unique(loops[np.repeat(flags, totals)])
+
+    def clearTracking(obj):
+        """删除脏区标记和接缝记录（保存模型副本前调用）"""
+        if "adt_seam" in obj:
+            del obj["adt_seam"]
+        attr = obj.data.attributes.get("adt_dirty")
+        if attr is not None:
+            obj.data.attributes.remove(attr)
+
+
+if 1:  # 切割体预处理
+
+    # 差集/交集中切割体超出BaseBox的部分不影响结果，布尔前把切割体裁到
+    # BaseBox包围盒外扩边距的范围内，避免超大操作数降低精度、拖慢求解器
+    CLIP_CUTTERS = True
+    # 边距 = 比例 * BaseBox最大边长 + 最小边距
+    CLIP_MARGIN_RATIO = 0.05
+    CLIP_MARGIN_MIN = 0.001
+
+    # 裁剪次数、裁剪前后切割体最大边长之和、裁剪耗时
+    clipStats = {"count": 0, "extent_before": 0.0, "extent_after": 0.0, "seconds": 0.0}
+
+    def resetClipStats():
+        clipStats.update(count=0, extent_before=0.0, extent_after=0.0, seconds=0.0)
+
+    def boundsExtent(bounds):
+        """OutPut:包围盒最大边长，None为0"""
+        if bounds is None:
+            return 0.0
+        return max(0.0, max(bounds[k + 3] - bounds[k] for k in range(3)))
+
+    def clipMargin(bounds):
+        return CLIP_MARGIN_RATIO * boundsExtent(bounds) + CLIP_MARGIN_MIN
+
+    def clipPlanes(cutter, bounds, margin):
+        """OutPut:[(平面点, 朝外法向)]，只包含切割体超出bounds外扩margin的那几侧"""
+        planes = []
+        for k in range(3):
+            for side, limit in ((-1, bounds[k] - margin), (1, bounds[k + 3] + margin)):
+                reach = cutter[k] if side < 0 else cutter[k + 3]
+                if (reach - limit) * side > 0:
+                    co = [0.0, 0.0, 0.0]
+                    no = [0.0, 0.0, 0.0]
+                    co[k] = limit
+                    no[k] = float(side)
+                    planes.append((tuple(co), tuple(no)))
+        return planes
+
+    def clipCutter(obj, bounds, margin=None):
+        """把切割体obj裁到世界包围盒bounds外扩margin的范围内并封口
+
+        OutPut:裁剪后的世界包围盒（无需裁剪时为原包围盒）
+        """
+        cutter = cachedBounds(obj)
+        if cutter is None or bounds is None:
+            return cutter
+        if margin is None:
+            margin = clipMargin(bounds)
+        planes = clipPlanes(cutter, bounds, margin)
+        if not planes:
+            return cutter
+
+        start = time.perf_counter()
+        mesh = obj.data
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bm.transform(obj.matrix_world)
+        for co, no in planes:
+            result = bmesh.ops.bisect_plane(
+                bm,
+                geom=bm.verts[:] + bm.edges[:] + bm.faces[:],
+                dist=1e-6,
+                plane_co=co,
+                plane_no=no,
+                clear_outer=True,
+            )
+            edges = [ele for ele in result["geom_cut"] if isinstance(ele, bmesh.types.BMEdge)]
+            bmesh.ops.holes_fill(bm, edges=edges, sides=0)
+        bm.transform(obj.matrix_world.inverted())
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
+        touchMesh(obj)
+
+        clipped = cachedBounds(obj)
+        clipStats["count"] += 1
+        clipStats["extent_before"] += boundsExtent(cutter)
+        clipStats["extent_after"] += boundsExtent(clipped)
+        clipStats["seconds"] += time.perf_counter() - start
+        return clipped
+
+    def clipReport():
+        """OutPut:切割体裁剪统计报告"""
+        if not clipStats["count"]:
+            return []
+        ratio = clipStats["extent_after"] / clipStats["extent_before"]
+        return [
+            f"切割体裁剪: {clipStats['count']}次，操作数尺寸缩小到{ratio:.1%}，"
+            f"裁剪耗时{clipStats['seconds'] * 1000:.1f}ms"
+        ]
+
+
+if 1:  # 采样统计
+
+    # 均匀提议近期接受率低于该值时，ADAPTIVE模式直接使用约束提议
+    ADAPTIVE_MIN_RATE = 0.05
+    # 单次采样中均匀提议连续失败该次数后切换为约束提议
+    ADAPTIVE_SWITCH_ATTEMPTS = 20
+    # 近期接受率为每次均匀提议的指数滑动平均，每次尝试的权重
+    ADAPTIVE_DECAY = 0.1
+    # 直接使用约束提议时，每隔该次数的采样仍先试均匀提议，BaseBox变化后接受率可以回升
+    ADAPTIVE_PROBE_INTERVAL = 10
+
+    # rule -> {"uniform": [尝试, 接受], "constrained": [尝试, 接受], "failed": 失败次数,
+    #          "site": 超出场地未创建网格的提议数, "recent": 均匀提议近期接受率, "probe": 直接使用约束提议的采样数}
+    sampleStats = {}
+
+    def resetSampleStats():
+        sampleStats.clear()
+
+    def _ruleStats(rule):
+        if rule not in sampleStats:
+            sampleStats[rule] = {
+                "uniform": [0, 0], "constrained": [0, 0], "failed": 0, "site": 0, "recent": 1.0, "probe": 0
+            }
+        return sampleStats[rule]
+
+    def recordSample(rule, proposal, attempts, accepted):
+        """记录attempts次尝试（accepted时最后一次被接受）"""
+        ruleStats = _ruleStats(rule)
+        stats = ruleStats[proposal]
+        stats[0] += attempts
+        if accepted:
+            stats[1] += 1
+        if proposal == "uniform":
+            ruleStats["recent"] *= (1 - ADAPTIVE_DECAY) ** attempts
+            if accepted:
+                ruleStats["recent"] += ADAPTIVE_DECAY
+
+    def recordFailure(rule):
+        _ruleStats(rule)["failed"] += 1
+
+    def recordSiteReject(rule, count=1):
+        _ruleStats(rule)["site"] += count
+
+    def sampleRate(rule, proposal=None):
+        """接受率，proposal为None时合并所有提议；无记录时返回1"""
+        if rule not in sampleStats:
+            return 1.0
+        stats = sampleStats[rule]
+        proposals = [proposal] if proposal else ["uniform", "constrained"]
+        attempts = sum(stats[p][0] for p in proposals)
+        accepted = sum(stats[p][1] for p in proposals)
+        if attempts == 0:
+            return 1.0
+        return accepted / attempts
+
+    def recentRate(rule):
+        """均匀提议的近期接受率（指数滑动平均，早期的失败逐渐失去影响）；无记录时返回1"""
+        if rule not in sampleStats:
+            return 1.0
+        return sampleStats[rule]["recent"]
+
+    def sampleReport():
+        """OutPut:每个规则一行的接受率与尝试次数报告"""
+        lines = []
+        for rule, stats in sampleStats.items():
+            attempts = stats["uniform"][0] + stats["constrained"][0]
+            accepted = stats["uniform"][1] + stats["constrained"][1]
+            lines.append(
+                f"{rule}: 接受率 {sampleRate(rule):.1%}，尝试 {attempts} 次，"
+                f"接受 {accepted}，失败 {stats['failed']}"
+                f"（约束提议 {stats['constrained'][0]} 次）"
+                + (f"，场地剔除 {stats['site']} 次（未建网格）" if stats["site"] else "")
+            )
+        return lines
+
+
 if 1:  # 生成函数
 
     def snapGround(obj):
@@ -286,72 +716,261 @@ if 1:  # 生成函数
 
         return obj
 
-    def cutLineWithDir(obj, stringdir, interval=0.05):
-        setActive(obj)
-        obj.select_set(True)
-        maxx, maxy, maxz, minx, miny, minz = getBound(obj)
-        imin = 0
-        imax = 0
-
-        if stringdir == "+x" or stringdir == "-x":
-            imin = minx
-            imax = maxx
-        if stringdir == "+y" or stringdir == "-y":
-            imin = miny
-            imax = maxy
-        if stringdir == "+z" or stringdir == "-z":
-            imin = minz
-            imax = maxz
-
-        maxstep = int((imax - imin) / interval)
+    # 切分间隔下限，与Twist属性的最小值一致，防止间隔为0时除零或切分次数失控
+    MIN_CUT_INTERVAL = 0.001
 
+    def cutLineWithDir(objs, stringdir, interval=0.05):
+        """沿方向按间隔切分网格（对象模式bmesh，不切换编辑模式），objs可为单个物体或列表"""
         dir = dir2Vec3(stringdir)
-        start = dir * (imin + interval)
-
-        bpy.ops.object.mode_set(mode="EDIT")
-        for i in range(maxstep):
-
-            bpy.ops.mesh.select_all(action="SELECT")
+        interval = max(interval, MIN_CUT_INTERVAL)
+
+        for obj in toList(objs):
+            maxx, maxy, maxz, minx, miny, minz = getBound(obj)
+            imin = 0
+            imax = 0
+
+            if stringdir == "+x" or stringdir == "-x":
+                imin = minx
+                imax = maxx
+            if stringdir == "+y" or stringdir == "-y":
+                imin = miny
+                imax = maxy
+            if stringdir == "+z" or stringdir == "-z":
+                imin = minz
+                imax = maxz
+
+            maxstep = int((imax - imin) / interval)
+            start = dir * (imin + interval)
+
+            # 切割平面从世界坐标转换到物体局部坐标
+            imat = obj.matrix_world.inverted()
+            plane_no = (obj.matrix_world.to_3x3().transposed() @ dir).normalized()
+
+            bm = bmesh.new()
+            bm.from_mesh(obj.data)
+            for i in range(maxstep):
+                bmesh.ops.bisect_plane(
+                    bm,
+                    geom=bm.verts[:] + bm.edges[:] + bm.faces[:],
+                    dist=0.0001,
+                    plane_co=imat @ (start + dir * i * interval),
+                    plane_no=plane_no,
+                )
+            bm.to_mesh(obj.data)
+            bm.free()
+            obj.data.update()
+            touchMesh(obj)
+
+        return objs
+
+    def weldMesh(obj, dist=0.001, region=None, dirty=None):
+        """按距离合并顶点，dirty为脏顶点索引时只处理其邻近顶点，
+        region为世界坐标包围盒时只处理其附近的顶点
+
+        OutPut:合并的顶点数
+        """
+        mesh = obj.data
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3)
+
+        candidates = None
+        if dirty is not None:
+            candidates = weld.nearIndices(coords, dirty, 2 * dist)
+        elif region is not None:
+            matrix = np.array(obj.matrix_world)
+            world = coords @ matrix[:3, :3].T + matrix[:3, 3]
+            candidates = weld.regionIndices(world, region, margin=2 * dist)
+
+        sources, targets = weld.weldMap(coords, dist, candidates)
+        if not len(sources):
+            return 0
+
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bm.verts.ensure_lookup_table()
+        targetmap = {bm.verts[s]: bm.verts[t] for s, t in zip(sources.tolist(), targets.tolist())}
+        bmesh.ops.weld_verts(bm, targetmap=targetmap)
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
+        touchMesh(obj)
+        return len(sources)
+
+    def optimizeMesh(objs, merge_threshold=0.001):
+        """合并重复顶点（对象模式bmesh，不切换编辑模式），objs可为单个物体或列表
+
+        优先只在布尔运算标记的脏面(adt_dirty)附近查找，其次在接缝记录(adt_seam)内查找，
+        都没有时处理全部顶点
+        """
+        for obj in toList(objs):
+            seam = obj.get("adt_seam")
+            if seam is not None:
+                seam = list(seam)
+                del obj["adt_seam"]
 
-            bpy.ops.mesh.bisect(
-                plane_co=start + dir * i * interval,
-                plane_no=dir,
-                flip=False,
-            )
-        bpy.ops.object.mode_set(mode="OBJECT")
+            weldMesh(obj, merge_threshold, seam, dirtyVertices(obj))
+            setActive(obj)
 
-    def optimizeMesh(obj, merge_threshold=0.001):
+        return objs
 
-        setActive(obj)
+    def limitComplexity(obj, max_verts, angle=0.0872665, merge_threshold=0.001, collapse=True):
+        """顶点数超过max_verts时合并重复点并做有限融并，仍超出则逐步放宽角度；
+        collapse为True时最后用Decimate塌陷到预算内（会改变形状），否则保留融并结果
 
-        bpy.ops.object.mode_set(mode="EDIT")
-        bm = bmesh.from_edit_mesh(obj.data)
+        OutPut:处理前顶点数,处理后顶点数（collapse为False时可能仍超出预算）
+        """
+        before = len(obj.data.vertices)
+        if max_verts <= 0 or before <= max_verts:
+            return before, before
 
+        bm = bmesh.new()
+        bm.from_mesh(obj.data)
         bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=merge_threshold)
 
-        bmesh.update_edit_mesh(obj.data)
-
-        bpy.ops.object.mode_set(mode="OBJECT")
+        for i in range(3):
+            if len(bm.verts) <= max_verts:
+                break
+            bmesh.ops.dissolve_limit(
+                bm, angle_limit=angle * (2**i), verts=bm.verts[:], edges=bm.edges[:]
+            )
 
-        return obj
+        bm.to_mesh(obj.data)
+        bm.free()
+        obj.data.update()
+        touchMesh(obj)
 
-    def randomCube(min_size, max_size, max_area):
-        lenghx = randomValue(min_size, max_size)
-        lenghy = randomValue(min_size, max_size)
-        lenghz = randomValue(min_size, max_size)
-        posx = randomValue(0, max_area)
-        posy = randomValue(0, max_area)
-        posz = randomValue(0, max_area)
+        after = len(obj.data.vertices)
+        # Decimate按面数比例塌陷，顶点数只是近似达到，必要时再塌陷一次
+        for i in range(3):
+            if not collapse or after <= max_verts:
+                break
+            mod = obj.modifiers.new(name="Decimate", type="DECIMATE")
+            mod.ratio = max_verts / after
+            applyMod(obj, "Decimate")
+            after = len(obj.data.vertices)
+
+        return before, after
+
+    def randomCubeParams(min_size, max_size, max_area, region=None):
+        """OutPut:(位置, 尺寸)，region为(minx, miny, maxx, maxy)时水平位置在其中采样"""
+        size = [randomValue(min_size, max_size) for i in range(3)]
+        if region is None:
+            pos = [randomValue(0, max_area) for i in range(3)]
+        else:
+            pos = [
+                randomValue(region[0], region[2]),
+                randomValue(region[1], region[3]),
+                randomValue(0, max_area),
+            ]
+        return pos, size
+
+    def createCube(location, scale):
         bpy.ops.mesh.primitive_cube_add(
             size=1,
             enter_editmode=False,
             align="WORLD",
-            location=(posx, posy, posz),
-            scale=(lenghx, lenghy, lenghz),
+            location=location,
+            scale=scale,
         )
         cube = bpy.context.active_object
         return cube
 
+    def cubeBounds(location, scale):
+        """OutPut:createCube(location, scale)的包围盒（cachedBounds布局），无需创建网格"""
+        lo = [location[i] - scale[i] / 2 for i in range(3)]
+        hi = [location[i] + scale[i] / 2 for i in range(3)]
+        return lo + hi
+
+    def randomCube(min_size, max_size, max_area, region=None):
+        return createCube(*randomCubeParams(min_size, max_size, max_area, region))
+
+    def randomSiteCube(site, min_size, max_size, max_area, max_attempts):
+        """在场地内采样方体：参数先做解析检查，超出场地的候选不创建网格
+
+        site为None时等同randomCube，OutPut:方体（None表示失败）
+        """
+        if site is None:
+            return randomCube(min_size, max_size, max_area)
+        for attempt in range(max_attempts):
+            params = randomCubeParams(min_size, max_size, max_area, site.region)
+            if site.fitsBounds(cubeBounds(*params)):
+                return createCube(*params)
+        return None
+
+    def randomCubeNearParams(baseobj, min_size, max_size):
+        """约束提议：附加体中心落在BaseBox包围盒某个面的两侧，
+        使包围盒必然相交且不被完全包含，OutPut:(位置, 尺寸)"""
+        bound = getBound(baseobj)
+        hi = bound[:3]
+        lo = bound[3:]
+
+        size = [randomValue(min_size, max_size) for i in range(3)]
+        axis = randomInt(0, 2)
+
+        pos = []
+        for i in range(3):
+            half = size[i] / 2
+            if i == axis:
+                face = hi[i] if randomBool() else lo[i]
+                pos.append(randomValue(face - half, face + half))
+            else:
+                pos.append(randomValue(lo[i] - half, hi[i] + half))
+        return pos, size
+
+    def randomCubeNear(baseobj, min_size, max_size):
+        return createCube(*randomCubeNearParams(baseobj, min_size, max_size))
+
+    def proposeSiteCube(site, constrained, baseobj, min_size, max_size, max_area):
+        """按提议采样附加体参数，在场地内才创建网格，OutPut:方体（超出场地为None）"""
+        if constrained:
+            params = randomCubeNearParams(baseobj, min_size, max_size)
+        else:
+            params = randomCubeParams(min_size, max_size, max_area, site.region)
+        if not site.fitsBounds(cubeBounds(*params)):
+            return None
+        return createCube(*params)
+
+    def sampleAddBox(rule, baseobj, min_size, max_size, max_area, max_attempts, mode="ADAPTIVE", site=None):
+        """拒绝采样一个与baseobj相交且不被包含的附加体
+
+        mode(string):UNIFORM,CONSTRAINED,ADAPTIVE
+        ADAPTIVE 在均匀提议的近期接受率过低时切换为约束提议，并每隔ADAPTIVE_PROBE_INTERVAL次重试均匀提议
+        site(sitecheck.Site):超出场地的提议在创建网格前丢弃
+        OutPut:addBox(None表示失败),attempts(int)
+        """
+        constrained = mode == "CONSTRAINED"
+        if mode == "ADAPTIVE" and recentRate(rule) < ADAPTIVE_MIN_RATE:
+            stats = _ruleStats(rule)
+            stats["probe"] += 1
+            constrained = stats["probe"] % ADAPTIVE_PROBE_INTERVAL != 0
+
+        for attempt in range(max_attempts):
+            proposal = "constrained" if constrained else "uniform"
+            if site is not None:
+                addBox = proposeSiteCube(site, constrained, baseobj, min_size, max_size, max_area)
+            elif constrained:
+                addBox = randomCubeNear(baseobj, min_size, max_size)
+            else:
+                addBox = randomCube(min_size, max_size, max_area)
+
+            if addBox is None:
+                recordSample(rule, proposal, 1, False)
+                recordSiteReject(rule)
+            elif isIntersect(baseobj, addBox) and not isInside(baseobj, addBox)[0]:
+                recordSample(rule, proposal, 1, True)
+                return addBox, attempt + 1
+            else:
+                recordSample(rule, proposal, 1, False)
+                delobj(addBox)
+                setActive(baseobj)
+
+            if mode == "ADAPTIVE" and not constrained and attempt + 1 >= ADAPTIVE_SWITCH_ATTEMPTS:
+                constrained = True
+
+        recordFailure(rule)
+        return None, max_attempts
+
     def calBool(baseobj, boolobj, type):
         """Boolean type(string):add,sub,mul"""
 
@@ -368,8 +987,25 @@ if 1:  # 生成函数
         mod.operation = t
         mod.object = boolobj
 
+        before = cachedBounds(baseobj)
+        if CLIP_CUTTERS and type in ("sub", "mul"):
+            cutter = clipCutter(boolobj, before)
+        else:
+            cutter = cachedBounds(boolobj)
+
+        # 切割体的面标记为脏，并记录接缝区域（切割体的包围盒），供optimizeMesh只在改动处合并顶点
+        markDirty(boolobj)
+        seam = unionBounds(baseobj.get("adt_seam"), boolobj.get("adt_seam"))
+        seam = unionBounds(seam, cutter)
+        if seam is not None:
+            baseobj["adt_seam"] = seam
+
         applyMod(baseobj, "Boolean")
         delobj(boolobj)
+
+        bounds = updatedBounds(before, cutter, type)
+        if bounds is not None:
+            setCachedBounds(baseobj, bounds)
         return baseobj
 
     def meshTowall(obj, inout="out", thick=0.1):
@@ -428,49 +1064,57 @@ if 1:  # 生成函数
 
     def offsetShell(baseobj, minthick, maxthick, maxoffset):  # 生成offset的外壳模型
         """Solidify"""
+        thickness = randomValue(minthick, maxthick)
+        return solidifyShell(baseobj, thickness, randomValue(0, maxoffset))
+
+    def solidifyShell(baseobj, thickness, offset):
+        """以给定厚度和偏移生成外壳（参数可先做场地检查）"""
 
         mod = baseobj.modifiers.new(name="Solidify", type="SOLIDIFY")
         mod.solidify_mode = "NON_MANIFOLD"
         mod.nonmanifold_thickness_mode = "CONSTRAINTS"
-        mod.thickness = randomValue(minthick, maxthick)
-        mod.offset = randomValue(0, maxoffset)
+        mod.thickness = thickness
+        mod.offset = offset
 
         return applyMod(baseobj, "Solidify")
 
-    def crateBoxWithDir(point, updir, stretchdir, width, height, depth, isCenter=False):
-
-        bpy.ops.mesh.primitive_cube_add(size=1, enter_editmode=False, align="WORLD")
-        box = bpy.context.active_object
-
-        if isCenter:
-            box.scale = (width, depth * 2, height)
-
-        else:
-            origin_offset = Vector((0, -0.5, 0))
-
-            for vertex in box.data.vertices:
-                vertex.co -= origin_offset
+    def expandBounds(bounds, distance):
+        """OutPut:各方向外扩distance的包围盒（cachedBounds布局）"""
+        return [value - distance for value in bounds[:3]] + [value + distance for value in bounds[3:]]
 
-            box.scale = (width, depth, height)
+    def crateBoxWithDir(point, updir, stretchdir, width, height, depth, isCenter=False):
+        """由(右, 伸展, 上)旋转矩阵直接生成盒子网格，物体位于point，无旋转和缩放"""
 
-        bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+        verts = directions.boxVerts(updir, stretchdir, width, height, depth, isCenter)
+        return linkMesh("Cube", meshFromArrays("Cube", verts, directions.BOX_QUADS), point)
 
-        right_vec = updir.cross(stretchdir).normalized()
-        rotation_matrix = Matrix(
-            (
-                (right_vec.x, stretchdir.x, updir.x, 0),
-                (right_vec.y, stretchdir.y, updir.y, 0),
-                (right_vec.z, stretchdir.z, updir.z, 0),
-                (0, 0, 0, 1),
-            )
-        )
+    def boxPoints(point, updir, stretchdir, width, height, depth, isCenter=False):
+        """OutPut:crateBoxWithDir将生成的盒子的世界坐标顶点(8,3)，不创建网格"""
+        return directions.boxVerts(updir, stretchdir, width, height, depth, isCenter) + np.asarray(point)
 
-        box.rotation_euler = rotation_matrix.to_euler()
-        bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
+    def crateLWall(point, updir, dir1, dir2, width, length):
+        """沿dir1、dir2伸出的L形墙棱柱（含交角），各方向及上下都延伸length
 
-        box.location = point
+        dir1与dir2平行时退化为沿dir1两侧延伸的直墙
+        """
+        prism = directions.lWallPrism(updir, dir1, dir2, width, length)
+        if prism is None:
+            return crateBoxWithDir(point, updir, dir1, width, 2 * length, length, True)
+        return linkMesh("Wall", meshFromArrays("Wall", *prism), point)
+
+    def linkMesh(name, mesh, point):
+        """新建物体链接到当前集合并设为激活，OutPut:物体"""
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.collection.objects.link(obj)
+        obj.select_set(True)
+        setActive(obj)
+        obj.location = point
+        return obj
 
-        return box
+    def boundDiagonal(obj):
+        """OutPut:世界包围盒对角线长度"""
+        maxx, maxy, maxz, minx, miny, minz = getBound(obj)
+        return math.sqrt((maxx - minx) ** 2 + (maxy - miny) ** 2 + (maxz - minz) ** 2)
 
 
 if 1:  # 逻辑函数
@@ -482,57 +1126,34 @@ if 1:  # 逻辑函数
         return False
 
     def isIntersect(boxA, boxB):  # 判断是否相交
-        bm1 = bmesh.new()
-        bm1.from_mesh(boxA.data)
-        bm1.transform(boxA.matrix_world)
-
-        bm2 = bmesh.new()
-        bm2.from_mesh(boxB.data)
-        bm2.transform(boxB.matrix_world)
-
-        # 使用BVH树检测相交
-        bvh1 = BVHTree.FromBMesh(bm1)
-        bvh2 = BVHTree.FromBMesh(bm2)
-
-        # 检测相交
-        intersect = bvh1.overlap(bvh2)
-
-        # 清理BMesh
-        bm1.free()
-        bm2.free()
+        """OutPut:是否相交(bool)
 
-        return bool(intersect)
+        先用有向包围盒的分离轴测试快速排除；两者都是盒子时该测试即为精确结果（实心，包含也算相交），
+        否则再用缓存的BVH树检测表面相交，BaseBox在多次采样之间只构建一次
+        """
+        obbA, boxlikeA = cachedOBB(boxA)
+        obbB, boxlikeB = cachedOBB(boxB)
+        if obbA is None or obbB is None:
+            return False
+        if not predicates.intersects(obbA, obbB):
+            return False
+        if boxlikeA and boxlikeB:
+            return True
+        return bool(cachedBVH(boxA).overlap(cachedBVH(boxB)))
 
     def isInside(boxA, boxB):  # 判断是否完全被包围
-        """OutPut:isInside(bool),BiggerObj(string):boxA,boxB"""
-        vola = boxA.dimensions[0] * boxA.dimensions[1] * boxA.dimensions[2]
-        volb = boxB.dimensions[0] * boxB.dimensions[1] * boxB.dimensions[2]
-
-        biggerobj = ""
-        if vola > volb:
-            outer_obj = boxA
-            inner_obj = boxB
-            biggerobj = "boxA"
-        else:
-            outer_obj = boxB
-            inner_obj = boxA
-            biggerobj = "boxB"
-
-        inner_verts = [inner_obj.matrix_world @ v.co for v in inner_obj.data.vertices]
-
-        maxx, maxy, maxz, minx, miny, minz = getBound(outer_obj)
-
-        for co in inner_verts:
-            if (
-                co[0] > maxx
-                or co[0] < minx
-                or co[1] > maxy
-                or co[1] < miny
-                or co[2] > maxz
-                or co[2] < minz
-            ):
-                return False
-        return True, biggerobj
+        """较小的物体是否完全在较大物体的有向包围盒内（旋转物体不再按世界轴包围盒判断）
+
+        OutPut:isInside(bool),BiggerObj(string):boxA,boxB
+        """
+        obbA, _ = cachedOBB(boxA)
+        obbB, _ = cachedOBB(boxB)
+        if obbA is None or obbB is None:
+            return False, ""
+
+        if predicates.volume(obbA) > predicates.volume(obbB):
+            return predicates.contains(obbA, obbB), "boxA"
+        return predicates.contains(obbB, obbA), "boxB"
 
     def isPontinside(point, obj):
 
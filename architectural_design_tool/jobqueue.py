@@ -0,0 +1,227 @@
+"""Auto任务队列：在保存路径下用SQLite记录每个计划模型的种子和状态，中断后可续跑
+
+表:
+    run       运行信息（种子、参数快照等）键值对
+    jobs      每个模型一行：序号、种子、规则链、状态、尝试次数、耗时、说明
+    results   已完成但尚未写入数据集分片（或.blend）的模型：局部坐标顶点、三角面、元数据
+    fingerprints  去重开启时已加入指纹索引的模型指纹，续跑时重建索引
+
+每个模型开始和结束时各提交一次，进程崩溃最多损失正在生成的那一个模型：
+续跑时 RUNNING 状态的模型记为 FAILED，其余 PENDING 模型按序继续。
+"""
+
+import json
+import os
+import sqlite3
+import uuid
+
+import numpy as np
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+DONE = "DONE"
+SKIPPED = "SKIPPED"
+FAILED = "FAILED"
+
+STATUSES = (PENDING, RUNNING, DONE, SKIPPED, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS jobs (
+    idx INTEGER PRIMARY KEY,
+    seed INTEGER NOT NULL,
+    chain BLOB NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    seconds REAL,
+    message TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    idx INTEGER PRIMARY KEY,
+    verts BLOB NOT NULL,
+    faces BLOB NOT NULL,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    idx INTEGER PRIMARY KEY,
+    fp BLOB NOT NULL
+);
+"""
+
+
+def queuePath(savepath, prefix=""):
+    return os.path.join(savepath, f"{prefix}jobs.sqlite")
+
+
+def modelSeed(seed, index):
+    """OutPut:第index个模型的独立种子（由运行种子派生，与其他模型无关）"""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1, np.uint32)[0])
+
+
+class JobQueue:
+    """一次Auto运行的持久化任务队列"""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def create(cls, path, plan, seed, params=None):
+        """新建（覆盖已有的）队列，所有模型为PENDING"""
+        queue = cls(path)
+        with queue.db:
+            queue.db.execute("DELETE FROM run")
+            queue.db.execute("DELETE FROM jobs")
+            queue.db.execute("DELETE FROM results")
+            queue.db.execute("DELETE FROM fingerprints")
+            queue.db.executemany(
+                "INSERT INTO run (key, value) VALUES (?, ?)",
+                [
+                    ("run", json.dumps(uuid.uuid4().hex)),
+                    ("seed", json.dumps(int(seed))),
+                    ("params", json.dumps(params or {})),
+                ],
+            )
+            queue.db.executemany(
+                "INSERT INTO jobs (idx, seed, chain, status) VALUES (?, ?, ?, ?)",
+                (
+                    (i, modelSeed(seed, i), np.asarray(row, dtype=np.uint8).tobytes(), PENDING)
+                    for i, row in enumerate(plan)
+                ),
+            )
+        return queue
+
+    @classmethod
+    def open(cls, path):
+        """打开已有队列，不存在时抛出FileNotFoundError"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"没有可续跑的任务队列: {path}")
+        return cls(path)
+
+    def _value(self, key, default=None):
+        row = self.db.execute("SELECT value FROM run WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    @property
+    def run(self):
+        """本次运行的标识，写入数据集元数据以区分同一目录中的多次运行"""
+        return self._value("run")
+
+    @property
+    def seed(self):
+        return self._value("seed")
+
+    @property
+    def params(self):
+        return self._value("params", {})
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def plan(self):
+        """OutPut:(模型数, 链长) uint8 规则计划（含去重重新抽取后的链）"""
+        rows = self.db.execute("SELECT chain FROM jobs ORDER BY idx").fetchall()
+        if not rows:
+            return np.empty((0, 0), dtype=np.uint8)
+        return np.stack([np.frombuffer(chain, dtype=np.uint8) for (chain,) in rows])
+
+    def seedOf(self, index):
+        return self.db.execute("SELECT seed FROM jobs WHERE idx = ?", (index,)).fetchone()[0]
+
+    def pending(self):
+        """OutPut:尚未生成的模型序号（升序）"""
+        rows = self.db.execute("SELECT idx FROM jobs WHERE status = ? ORDER BY idx", (PENDING,))
+        return [idx for (idx,) in rows]
+
+    def counts(self):
+        """OutPut:{状态: 模型数}"""
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, count in self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def failed(self):
+        """OutPut:[(序号, 种子, 说明)]"""
+        rows = self.db.execute(
+            "SELECT idx, seed, message FROM jobs WHERE status = ? ORDER BY idx", (FAILED,)
+        )
+        return rows.fetchall()
+
+    def recover(self):
+        """上次运行中断时正在生成的模型记为失败，OutPut:这些模型的序号"""
+        interrupted = [
+            idx for (idx,) in self.db.execute("SELECT idx FROM jobs WHERE status = ?", (RUNNING,))
+        ]
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, message = ? WHERE status = ?",
+                (FAILED, "进程中断", RUNNING),
+            )
+        return interrupted
+
+    def start(self, index):
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1 WHERE idx = ?",
+                (RUNNING, index),
+            )
+
+    def finish(self, index, status, chain, result=None, seconds=None, message=None, fp=None):
+        """记录模型结束状态，result为(局部顶点, 三角面, 元数据)时保存直到写入分片，
+        fp为该模型加入去重索引的指纹
+        """
+        with self.db:
+            if fp is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO fingerprints (idx, fp) VALUES (?, ?)",
+                    (index, np.ascontiguousarray(fp, dtype=np.float64).tobytes()),
+                )
+            self.db.execute(
+                "UPDATE jobs SET status = ?, chain = ?, seconds = ?, message = ? WHERE idx = ?",
+                (status, np.asarray(chain, dtype=np.uint8).tobytes(), seconds, message, index),
+            )
+            if result is not None:
+                verts, faces, meta = result
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results (idx, verts, faces, meta) VALUES (?, ?, ?, ?)",
+                    (
+                        index,
+                        np.ascontiguousarray(verts, dtype=np.float32).tobytes(),
+                        np.ascontiguousarray(faces, dtype=np.int32).tobytes(),
+                        json.dumps(meta or {}, ensure_ascii=False),
+                    ),
+                )
+
+    def results(self):
+        """OutPut:[(序号, verts(N,3 float32), faces(M,3 int32), 元数据)]，按序号排列"""
+        rows = self.db.execute("SELECT idx, verts, faces, meta FROM results ORDER BY idx")
+        return [
+            (
+                idx,
+                np.frombuffer(verts, dtype=np.float32).reshape(-1, 3),
+                np.frombuffer(faces, dtype=np.int32).reshape(-1, 3),
+                json.loads(meta),
+            )
+            for idx, verts, faces, meta in rows
+        ]
+
+    def fingerprints(self):
+        """OutPut:[(序号, 指纹float64数组)]，按序号排列"""
+        rows = self.db.execute("SELECT idx, fp FROM fingerprints ORDER BY idx")
+        return [(idx, np.frombuffer(fp, dtype=np.float64)) for idx, fp in rows]
+
+    def dropResults(self, indices=None):
+        """删除已持久化到数据集分片（或.blend）的模型，indices为None时全部删除"""
+        with self.db:
+            if indices is None:
+                self.db.execute("DELETE FROM results")
+            else:
+                self.db.executemany(
+                    "DELETE FROM results WHERE idx = ?", ((int(i),) for i in indices)
+                )
+
+    def close(self):
+        self.db.close()
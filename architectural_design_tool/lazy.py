@@ -0,0 +1,34 @@
+"""延迟导入：首次访问属性时才导入模块
+
+注册插件时只加载类定义，functions/pipeline 等依赖 bmesh、numpy 的模块
+在第一个算子运行时才导入，缩短 blender -b worker 的启动时间。
+"""
+
+import importlib
+
+
+class LazyModule:
+    """模块代理，首次访问属性时导入 name（相对名相对 package 解析）"""
+
+    def __init__(self, name, package=None):
+        if not package:
+            name = name.lstrip(".")
+        self._name = name
+        self._package = package
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name, self._package)
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
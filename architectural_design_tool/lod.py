@@ -0,0 +1,88 @@
+"""细节层次(LOD)代理网格：顶点聚类简化和包围盒代理，纯NumPy实现
+
+LOD级别:
+    FULL   原始网格
+    PROXY  顶点聚类简化网格
+    BOX    包围盒
+"""
+
+import itertools
+
+import numpy as np
+
+LEVELS = ("FULL", "PROXY", "BOX")
+
+# 包围盒8个角点按 (x, y, z) 二进制位编号，12个三角面朝外
+BOX_TRIS = np.array(
+    [
+        (0, 3, 2), (0, 1, 3),  # -x
+        (4, 7, 5), (4, 6, 7),  # +x
+        (0, 5, 1), (0, 4, 5),  # -y
+        (2, 7, 6), (2, 3, 7),  # +y
+        (0, 6, 4), (0, 2, 6),  # -z
+        (1, 7, 3), (1, 5, 7),  # +z
+    ],
+    dtype=np.int32,
+)
+
+
+def clusterDecimate(verts, tris, resolution=8):
+    """顶点聚类简化：把包围盒最长边分成resolution格，同一格内的顶点合并为其均值
+
+    OutPut:verts(K,3 float32), tris(T,3 int32)，去掉退化和重复的三角面
+    """
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+    if not len(verts):
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32)
+
+    lo = verts.min(axis=0)
+    size = float((verts.max(axis=0) - lo).max())
+    cell = size / max(1, resolution) if size > 0 else 1.0
+
+    keys = np.minimum(np.floor((verts - lo) / cell), max(1, resolution) - 1).astype(np.int64)
+    uniq, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    counts = np.bincount(inverse, minlength=len(uniq)).astype(np.float64)
+    merged = np.zeros((len(uniq), 3))
+    np.add.at(merged, inverse, verts)
+    merged /= counts[:, None]
+
+    mapped = inverse[tris]
+    valid = (
+        (mapped[:, 0] != mapped[:, 1])
+        & (mapped[:, 1] != mapped[:, 2])
+        & (mapped[:, 0] != mapped[:, 2])
+    )
+    mapped = mapped[valid]
+    if len(mapped):
+        first = np.unique(np.sort(mapped, axis=1), axis=0, return_index=True)[1]
+        mapped = mapped[np.sort(first)]
+
+    return merged.astype(np.float32), mapped.astype(np.int32)
+
+
+def boxProxy(verts):
+    """OutPut:包围盒代理 verts(8,3 float32), tris(12,3 int32)"""
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    if not len(verts):
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32)
+
+    lo = verts.min(axis=0)
+    hi = verts.max(axis=0)
+    corners = np.array(
+        [
+            (hi[0] if bx else lo[0], hi[1] if by else lo[1], hi[2] if bz else lo[2])
+            for bx, by, bz in itertools.product((0, 1), repeat=3)
+        ],
+        dtype=np.float32,
+    )
+    return corners, BOX_TRIS.copy()
+
+
+def chooseLevel(selected, distance, near, default="PROXY"):
+    """OutPut:LOD级别，选中或距离不超过near时显示原始网格"""
+    if selected or distance <= near:
+        return "FULL"
+    return default
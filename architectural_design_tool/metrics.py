@@ -0,0 +1,113 @@
+"""模型度量：由三角网格数组一次向量化计算体积、表面积、占地、高度和紧凑度
+
+    volume       有向体积
+    area         表面积
+    footprint    XY包围盒面积（占地）
+    height       Z方向高度
+    compactness  36πV²/A³，球为1，越扁平、越细碎越接近0
+
+每个三角面只做一次叉积：|e1×e2|/2 为面积，v0·(e1×e2)/6 为有向体积贡献
+（v0·((v1-v0)×(v2-v0)) = v0·(v1×v2)，见fingerprint.tetraVolumes）。measureShard 对整个数据集分片按模型汇总，
+不逐个模型循环。
+"""
+
+import numpy as np
+
+from . import fingerprint
+
+KEYS = ("volume", "area", "footprint", "height", "compactness")
+
+
+def _triangleTerms(verts, tris):
+    """OutPut:(每个三角面的面积, 有向体积贡献)"""
+    _, crosses, areas = fingerprint.triangleData(verts, tris)
+    return areas, fingerprint.tetraVolumes(verts, tris, crosses)
+
+
+def compactness(volume, area):
+    """OutPut:36πV²/A³，面积为0时为0"""
+    volume = np.asarray(volume, dtype=np.float64)
+    area = np.asarray(area, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(area > 0, 36 * np.pi * volume**2 / area**3, 0.0)
+
+
+def measure(verts, tris):
+    """OutPut:{volume, area, footprint, height, compactness}"""
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+    if not len(tris):
+        return dict.fromkeys(KEYS, 0.0)
+
+    areas, volumes = _triangleTerms(verts, tris)
+    area = float(areas.sum())
+    volume = float(volumes.sum())
+    size = verts.max(axis=0) - verts.min(axis=0)
+    return {
+        "volume": volume,
+        "area": area,
+        "footprint": float(size[0] * size[1]),
+        "height": float(size[2]),
+        "compactness": float(compactness(volume, area)),
+    }
+
+
+def measureShard(verts, faces, offsets):
+    """按数据集分片布局（见dataset.py）一次计算分片内所有模型的度量
+
+    OutPut:{度量名: (模型数,) float64 数组}
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    count = len(offsets) - 1
+    vert_counts = np.diff(offsets[:, 0])
+    face_counts = np.diff(offsets[:, 1])
+
+    # 面的顶点序号相对各自模型，加上模型的顶点起始位置
+    owner = np.repeat(np.arange(count), face_counts)
+    tris = faces + offsets[:-1, 0][owner, None]
+    areas, volumes = _triangleTerms(verts, tris)
+    area = np.bincount(owner, areas, minlength=count)
+    volume = np.bincount(owner, volumes, minlength=count)
+
+    size = np.zeros((count, 3))
+    nonempty = vert_counts > 0
+    if nonempty.any():
+        starts = offsets[:-1, 0][nonempty]
+        size[nonempty] = np.maximum.reduceat(verts, starts, axis=0) - np.minimum.reduceat(
+            verts, starts, axis=0
+        )
+    return {
+        "volume": volume,
+        "area": area,
+        "footprint": size[:, 0] * size[:, 1],
+        "height": size[:, 2],
+        "compactness": compactness(volume, area),
+    }
+
+
+def summarize(values):
+    """OutPut:{度量名: {min, mean, max}}，values为measure()结果的列表"""
+    if not values:
+        return {}
+    table = np.array([[value[key] for key in KEYS] for value in values], dtype=np.float64)
+    return {
+        key: {
+            "min": float(table[:, k].min()),
+            "mean": float(table[:, k].mean()),
+            "max": float(table[:, k].max()),
+        }
+        for k, key in enumerate(KEYS)
+    }
+
+
+def rejection(values, max_footprint=0.0, max_height=0.0, min_compactness=0.0):
+    """Auto筛选条件，上限为0时不限制，OutPut:不满足的原因，满足时为None"""
+    if max_footprint > 0 and values["footprint"] > max_footprint:
+        return f"占地{values['footprint']:.3g}超出{max_footprint:g}"
+    if max_height > 0 and values["height"] > max_height:
+        return f"高度{values['height']:.3g}超出{max_height:g}"
+    if values["compactness"] < min_compactness:
+        return f"紧凑度{values['compactness']:.3g}低于{min_compactness:g}"
+    return None
@@ -1,5 +1,98 @@
+import json
+import os
+import random
+import subprocess
+import time
 import bpy
-from . import functions as fun
+from .lazy import LazyModule
+
+# 依赖bmesh、numpy的模块在算子首次运行时才导入
+dataset = LazyModule(".dataset", __package__)
+fun = LazyModule(".functions", __package__)
+lod = LazyModule(".lod", __package__)
+pipeline = LazyModule(".pipeline", __package__)
+pool = LazyModule(".pool", __package__)
+sitecheck = LazyModule(".sitecheck", __package__)
+sweep = LazyModule(".sweep", __package__)
+transport = LazyModule(".transport", __package__)
+
+# 并行候选使用的常驻worker进程池，首次使用时创建
+_candidatePool = None
+
+
+def candidatePool(props):
+    """OutPut:常驻worker进程池，进程数变化时重建"""
+    global _candidatePool
+    if _candidatePool is not None and _candidatePool.size != props.pool_workers:
+        closePool()
+    if _candidatePool is None:
+        _candidatePool = pool.WorkerPool(pool.workerCommand(bpy.app.binary_path), props.pool_workers)
+    # 看门狗时限同时作为单个候选的时限，超时的worker被重启
+    _candidatePool.request_timeout = props.watchdog_seconds if props.watchdog_isenable else None
+    return _candidatePool
+
+
+def closePool():
+    global _candidatePool
+    if _candidatePool is not None:
+        _candidatePool.close()
+        _candidatePool = None
+
+
+def runCandidates(operator, context, rule, needs_base):
+    """把rule的多个候选种子交给进程池并行评估，用第一个成功的结果替换BaseBox"""
+    props = context.scene.adt_props
+
+    base = None
+    if needs_base:
+        baseBox = context.scene.objects.get("BaseBox")
+        if baseBox is None:
+            operator.report({"ERROR"}, "找不到BaseBox")
+            return {"CANCELLED"}
+        # 当前BaseBox经共享内存交给worker，比赛结束后删除
+        base = fun.shareMesh(baseBox)
+
+    seeds = [random.getrandbits(32) for i in range(props.pool_candidates)]
+    start = time.perf_counter()
+    try:
+        reply = candidatePool(props).race(
+            rule,
+            seeds,
+            sweep.propsToDict(props),
+            base.descriptor if base is not None else None,
+            props.pool_timeout,
+        )
+    except OSError as e:
+        operator.report({"ERROR"}, f"启动后台进程失败: {str(e)}")
+        return {"CANCELLED"}
+    finally:
+        if base is not None:
+            base.close()
+            base.unlink()
+    elapsed = time.perf_counter() - start
+
+    if reply is None:
+        operator.report({"WARNING"}, f"{len(seeds)}个候选均未成功（{elapsed:.1f}s）")
+        return {"CANCELLED"}
+
+    old = context.scene.objects.get("BaseBox")
+    if old is not None:
+        fun.delobj(old)
+
+    block = transport.receive(reply["mesh"])
+    try:
+        mesh = fun.meshFromShared("BaseBox", block)
+        bounds = transport.meshBounds(block["verts"])
+    finally:
+        block.close()
+        block.unlink()
+    baseBox = fun.linkMesh("BaseBox", mesh, (0, 0, 0))
+    baseBox.name = "BaseBox"
+    # 结果为世界坐标且物体位于原点，包围盒直接由共享顶点得出
+    fun.setCachedBounds(baseBox, bounds)
+
+    operator.report({"INFO"}, f"{rule}: 种子{reply['seed']}（{elapsed:.2f}s）")
+    return {"FINISHED"}
 
 
 class Setbase(bpy.types.Operator):
@@ -16,85 +109,352 @@ class Setbase(bpy.types.Operator):
         return {"FINISHED"}
 
 
+def openSession(operator, props, resume):
+    """OutPut:AutoSession，续跑时找不到任务队列则报告错误并返回None"""
+    try:
+        return pipeline.AutoSession(props, resume=resume)
+    except (FileNotFoundError, ValueError) as e:
+        operator.report({"ERROR"}, f"无法续跑: {str(e)}")
+        return None
+
+
+class SetSite(bpy.types.Operator):
+    """设置激活物体为场地：记录其水平轮廓（单个面时为该面，否则为XY凸包）和最低点高度"""
+
+    bl_idname = "ronge_adt.set_site"
+    bl_label = "SetSite"
+
+    def execute(self, context):
+        props = context.scene.adt_props
+        obj = context.active_object
+        if obj is None or obj.type != "MESH" or not len(obj.data.vertices):
+            self.report({"ERROR"}, "请选择一个网格物体作为场地")
+            return {"CANCELLED"}
+
+        verts, tris = fun.getMeshArrays(obj)
+        loop = list(obj.data.polygons[0].vertices) if len(obj.data.polygons) == 1 else None
+        polygon = sitecheck.footprint(verts, loop)
+        if len(polygon) < 3:
+            self.report({"ERROR"}, "场地轮廓少于3个顶点")
+            return {"CANCELLED"}
+
+        props.site_polygon = sitecheck.encodePolygon(polygon)
+        props.site_base = float(verts[:, 2].min())
+        props.site_isenable = True
+        self.report({"INFO"}, f"场地轮廓: {len(polygon)}个顶点，面积{sitecheck.signedArea(polygon):.2f}")
+        return {"FINISHED"}
+
+
 class Auto(bpy.types.Operator):
     """开始自动生成"""
 
     bl_idname = "ronge_adt.auto"
     bl_label = "Auto"
 
+    # 从保存路径下的任务队列续跑未完成的模型
+    resume: bpy.props.BoolProperty(default=False, options={"SKIP_SAVE"})  # pyright: ignore[reportInvalidTypeForm]
+
+    def execute(self, context):
+        props = context.scene.adt_props
+
+        session = openSession(self, props, self.resume)
+        if session is None:
+            return {"CANCELLED"}
+        try:
+            report = session.run()
+        except Exception as e:
+            # 出错时仍写出已生成的结果并关闭任务队列
+            report = session.finish()
+            self.report({"ERROR"}, f"第{session.index}个模型出错，已停止: {str(e)}")
+            for line in report:
+                print(line)
+            return {"CANCELLED"}
+        for line in report:
+            print(line)
+            self.report({"INFO"}, line)
+        return {"FINISHED"}
+
+
+class AutoModal(bpy.types.Operator):
+    """分块自动生成，界面保持响应，按Esc取消并保留已生成结果"""
+
+    bl_idname = "ronge_adt.auto_modal"
+    bl_label = "Auto Modal"
+
+    resume: bpy.props.BoolProperty(default=False, options={"SKIP_SAVE"})  # pyright: ignore[reportInvalidTypeForm]
+
+    def execute(self, context):
+        return bpy.ops.ronge_adt.auto(resume=self.resume)
+
+    def invoke(self, context, event):
+        props = context.scene.adt_props
+        wm = context.window_manager
+
+        self.session = openSession(self, props, self.resume)
+        if self.session is None:
+            return {"CANCELLED"}
+        self.start = time.perf_counter()
+        self.timer = wm.event_timer_add(0.001, window=context.window)
+        wm.progress_begin(0, self.session.total)
+        wm.modal_handler_add(self)
+
+        props.auto_isrunning = True
+        props.auto_progress = 0
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type == "ESC":
+            return self.stop(context, cancelled=True)
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+
+        props = context.scene.adt_props
+        session = self.session
+
+        # 每个定时器事件内连续生成，直到超过单块时长
+        deadline = time.perf_counter() + props.auto_chunktime
+        try:
+            while not session.done and time.perf_counter() < deadline:
+                session.step()
+        except Exception as e:
+            # 移除定时器和进度条，写出已生成的结果并关闭任务队列，否则界面一直显示运行中
+            self.stop(context, cancelled=True)
+            self.report({"ERROR"}, f"第{session.index}个模型出错，已停止: {str(e)}")
+            return {"CANCELLED"}
+
+        text = session.progressText(time.perf_counter() - self.start)
+        props.auto_progress = session.index / max(session.total, 1)
+        props.auto_progress_text = text
+        context.window_manager.progress_update(session.index)
+        if context.workspace:
+            context.workspace.status_text_set(text)
+        for area in context.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+
+        if session.done:
+            return self.stop(context, cancelled=False)
+        return {"RUNNING_MODAL"}
+
+    def stop(self, context, cancelled):
+        props = context.scene.adt_props
+        wm = context.window_manager
+
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        if context.workspace:
+            context.workspace.status_text_set(None)
+        props.auto_isrunning = False
+
+        for line in self.session.finish():
+            print(line)
+            self.report({"INFO"}, line)
+
+        elapsed = time.perf_counter() - self.start
+        if cancelled:
+            self.report(
+                {"WARNING"},
+                f"已取消，保留{self.session.index}/{self.session.total}个模型（{elapsed:.1f}s）",
+            )
+        else:
+            self.report({"INFO"}, f"完成{self.session.total}个模型（{elapsed:.1f}s）")
+        return {"FINISHED"}
+
+
+class Sweep(bpy.types.Operator):
+    """按参数网格或列表批量运行Auto"""
+
+    bl_idname = "ronge_adt.sweep"
+    bl_label = "Sweep"
+
+    def execute(self, context):
+        props = context.scene.adt_props
+        path = bpy.path.abspath(props.sweep_path)
+
+        try:
+            configs = sweep.loadSweep(path)
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, f"读取扫描配置失败: {str(e)}")
+            return {"CANCELLED"}
+
+        unknown = sweep.unknownKeys(props, configs)
+        if unknown:
+            self.report({"ERROR"}, f"未知参数: {', '.join(unknown)}")
+            return {"CANCELLED"}
+        if not configs:
+            self.report({"WARNING"}, "扫描配置为空")
+            return {"CANCELLED"}
+
+        output_dir = bpy.path.abspath(props.auto_savepath) or os.path.dirname(path)
+
+        if props.sweep_workers > 1:
+            manifest = self.fanOut(props, configs, path, output_dir)
+            if manifest is None:
+                return {"CANCELLED"}
+        else:
+            manifest = sweep.newManifest(path)
+            manifest["configs"] = pipeline.runConfigs(props, enumerate(configs))
+
+        manifest_path = os.path.join(output_dir, "sweep_manifest.json")
+        sweep.saveManifest(manifest, manifest_path)
+        self.report({"INFO"}, f"完成{len(configs)}个配置，清单: {manifest_path}")
+        return {"FINISHED"}
+
+    def fanOut(self, props, configs, path, output_dir):
+        """把配置分给多个后台Blender进程，等待并合并清单"""
+        shards = sweep.splitShards(configs, props.sweep_workers)
+        job_path = os.path.join(output_dir, "sweep_job.json")
+        with open(job_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"source": path, "base_props": sweep.propsToDict(props), "shards": shards},
+                f,
+                ensure_ascii=False,
+            )
+
+        worker_path = os.path.join(os.path.dirname(__file__), "worker.py")
+        processes = [
+            subprocess.Popen(
+                [
+                    bpy.app.binary_path,
+                    "-b",
+                    "--factory-startup",
+                    "--python",
+                    worker_path,
+                    "--",
+                    "sweep",
+                    job_path,
+                    str(shard),
+                    output_dir,
+                ]
+            )
+            for shard in range(len(shards))
+        ]
+
+        parts = []
+        for shard, process in enumerate(processes):
+            if process.wait() != 0:
+                self.report({"WARNING"}, f"worker {shard} 退出码 {process.returncode}")
+            part_path = os.path.join(output_dir, f"sweep_manifest_{shard}.json")
+            if os.path.exists(part_path):
+                with open(part_path, "r", encoding="utf-8") as f:
+                    parts.append(json.load(f))
+
+        if not parts:
+            self.report({"ERROR"}, "所有worker均失败")
+            return None
+        return sweep.mergeManifests(path, parts)
+
+
+class LoadResults(bpy.types.Operator):
+    """从数据集按需载入网格窗口内的结果，移出窗口的结果被删除"""
+
+    bl_idname = "ronge_adt.load_results"
+    bl_label = "Load Results"
+
+    collection_name = "ADT_Results"
+
     def execute(self, context):
         props = context.scene.adt_props
+        path = bpy.path.abspath(props.browse_path)
+
+        try:
+            reader = dataset.DatasetReader(path)
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, f"读取数据集失败: {str(e)}")
+            return {"CANCELLED"}
+
+        collection = bpy.data.collections.get(self.collection_name)
+        if collection is None:
+            collection = bpy.data.collections.new(self.collection_name)
+            context.scene.collection.children.link(collection)
 
-        for i in range(props.auto_count):
-
-            offset1 = 2
-            offset2 = 3
-            addname = ""
-            # 基形生成
-            first = fun.randomInt()
-            if first == 1:
-                bpy.ops.ronge_adt.merge()
-                addname += "_merge"
-                fun.onePass(i, -1, offset1, offset2, addname)
-            elif first == 2:
-                bpy.ops.ronge_adt.branch()
-                addname += "_branch"
-                fun.onePass(i, -1, offset1, offset2, addname)
-            elif first == 3:
-                bpy.ops.ronge_adt.extract()
-                addname += "_extract"
-                fun.onePass(i, -1, offset1, offset2, addname)
+        ids, xs, ys = dataset.windowIndices(
+            props.browse_centerx, props.browse_centery, props.browse_radius, len(reader)
+        )
+        wanted = set(ids.tolist())
+
+        # 已载入且仍在窗口内的保留，其余删除
+        loaded = {}
+        for obj in list(collection.objects):
+            index = obj.get("adt_result")
+            if index in wanted and obj.get("adt_dataset") == path:
+                loaded[index] = obj
             else:
-                bpy.ops.ronge_adt.merge()
-                addname += "_merge"
-                fun.onePass(i, -1, offset1, offset2, addname)
-
-            # 形变和切割
-            todolist = []
-            for j in range(props.auto_deformation_count):
-                todolist.append(1)
-            for j in range(props.auto_culling_count):
-                todolist.append(2)
-            if props.auto_isorder:
-                fun.shuffleList(todolist)
-            for j in range(len(todolist)):
-                if todolist[j] == 1:
-                    dothing = fun.randomInt()
-                    if dothing == 1:
-                        bpy.ops.ronge_adt.offset()
-                        addname += "_offset"
-                        fun.onePass(i, j, offset1, offset2, addname)
-                    elif dothing == 2:
-                        bpy.ops.ronge_adt.twist()
-                        addname += "_twist"
-                        fun.onePass(i, j, offset1, offset2, addname)
-                    elif dothing == 3:
-                        bpy.ops.ronge_adt.shift()
-                        addname += "_shift"
-                        fun.onePass(i, j, offset1, offset2, addname)
-                    else:
-                        continue
-                elif todolist[j] == 2:
-                    dothing = fun.randomInt()
-                    if dothing == 1:
-                        bpy.ops.ronge_adt.carve()
-                        addname += "_carve"
-                        fun.onePass(i, j, offset1, offset2, addname)
-                    elif dothing == 2:
-                        bpy.ops.ronge_adt.frature()
-                        addname += "_frature"
-                        fun.onePass(i, j, offset1, offset2, addname)
-                    elif dothing == 3:
-                        bpy.ops.ronge_adt.expland()
-                        addname += "_expland"
-                        fun.onePass(i, j, offset1, offset2, addname)
-                    else:
-                        continue
-                else:
-                    continue
-
-            fun.clean()
-        fun.delobj(bpy.context.scene.objects["BaseBox"])
+                mesh = obj.data
+                fun.delobj(obj)
+                if mesh is not None and mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+
+        spacing = props.browse_spacing
+        for index, x, y in zip(ids.tolist(), xs.tolist(), ys.tolist()):
+            if index in loaded:
+                continue
+            name = reader.meta(index).get("name", str(index))
+            obj = bpy.data.objects.new(name, fun.meshFromArrays(name, *reader.model(index)))
+            obj.location = (x * spacing, y * spacing, 0)
+            obj["adt_result"] = index
+            obj["adt_dataset"] = path
+            collection.objects.link(obj)
+
+        self.report(
+            {"INFO"},
+            f"窗口内{len(ids)}个结果（新载入{len(ids) - len(loaded)}个，共{len(reader)}个）",
+        )
+        return {"FINISHED"}
+
+
+def viewCenter(context, scene):
+    for area in context.screen.areas if context.screen else []:
+        if area.type == "VIEW_3D":
+            return area.spaces.active.region_3d.view_location
+    return scene.cursor.location
+
+
+def updateLods(scene, center):
+    """选中或靠近center的模型显示原始网格，其余显示代理，OutPut:{级别: 模型数}"""
+    props = scene.adt_props
+    objs = [obj for obj in scene.objects if "adt_lod" in obj]
+    if not objs:
+        return {}
+
+    counts = dict.fromkeys(lod.LEVELS, 0)
+    for obj in objs:
+        level = lod.chooseLevel(
+            obj.select_get(),
+            (obj.location - center).length,
+            props.lod_distance,
+            props.lod_default,
+        )
+        fun.setLod(obj, level)
+        # 中间阶段副本没有原始网格，仍显示代理
+        if level not in obj["adt_lod"]:
+            level = props.lod_default
+        counts[level] += 1
+    return counts
+
+
+@bpy.app.handlers.persistent
+def autoLod(scene, depsgraph=None):
+    """依赖图更新（选择变化、移动物体等）后自动切换LOD，生成过程中不处理"""
+    props = getattr(scene, "adt_props", None)
+    if props is None or not props.lod_isauto or props.auto_isrunning:
+        return
+    # setLod只在级别变化时替换网格，由此触发的下一次更新不再切换
+    updateLods(scene, viewCenter(bpy.context, scene))
+
+
+class UpdateLod(bpy.types.Operator):
+    """选中或靠近视图中心的模型显示原始网格，其余显示代理"""
+
+    bl_idname = "ronge_adt.update_lod"
+    bl_label = "Update LOD"
+
+    def execute(self, context):
+        counts = updateLods(context.scene, viewCenter(context, context.scene))
+        if not counts:
+            self.report({"INFO"}, "没有生成LOD代理的模型")
+            return {"CANCELLED"}
+        self.report({"INFO"}, ", ".join(f"{level} {count}" for level, count in counts.items()))
         return {"FINISHED"}
 
 
@@ -137,34 +497,34 @@ class Merge(bpy.types.Operator):
                 fun.delobj(obj)
                 break
                 
-        baseBox = fun.randomCube(props.min_size, props.max_size, props.max_area)
+        constraint = sitecheck.fromProps(props)
+        baseBox = fun.randomSiteCube(
+            constraint, props.min_size, props.max_size, props.max_area, props.max_attempts
+        )
+        if baseBox is None:
+            self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成场地内的基形")
+            return {"CANCELLED"}
         baseBox.name = "BaseBox"
 
-        for attempt in range(props.max_attempts):
-            addBox = fun.randomCube(
-                props.min_size * props.add_box_size,
-                props.max_size * props.add_box_size,
-                props.max_area,
-            )
-
-            is_intersecting = fun.isIntersect(baseBox, addBox)
-            is_inside = fun.isInside(baseBox, addBox)
-
-            if is_intersecting and not is_inside:
-                fun.calBool(baseBox, addBox, "add")
-                fun.setActive(baseBox)
-                bpy.ops.object.transform_apply(
-                    location=False, rotation=True, scale=False
-                )
-                break
-            else:
-                fun.delobj(addBox)
+        addBox, attempts = fun.sampleAddBox(
+            "merge",
+            baseBox,
+            props.min_size * props.add_box_size,
+            props.max_size * props.add_box_size,
+            props.max_area,
+            props.max_attempts,
+            props.sample_mode,
+            constraint,
+        )
+        if addBox is None:
+            self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成")
+            return {"CANCELLED"}
 
-                if attempt == props.max_attempts - 1:
-                    self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成")
-                    return {"CANCELLED"}
+        fun.calBool(baseBox, addBox, "add")
+        fun.setActive(baseBox)
+        bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
 
-        print("Merge")
+        print(f"Merge: {attempts}次尝试")
         return {"FINISHED"}
 
 
@@ -182,35 +542,43 @@ class Branch(bpy.types.Operator):
                 fun.delobj(obj)
                 break
 
-        updir = fun.dir2Vec3(fun.randomDir())
-        updir1 = fun.dir2Vec3(fun.randomDir())
-        dir1 = fun.randomVector(updir)
-        dir2 = fun.randomVector(updir)
-        dir3 = fun.randomVector(updir1)
+        # 先采样全部参数，三个盒子都在场地内才创建网格
+        constraint = sitecheck.fromProps(props)
+        for attempt in range(props.max_attempts if constraint is not None else 1):
+            updir = fun.dir2Vec3(fun.randomDir())
+            updir1 = fun.dir2Vec3(fun.randomDir())
+            dir1, dir2 = fun.randomVectors(2, updir)
+            dir3 = fun.randomVector(updir1)
 
-        h = fun.randomValue(
-            props.min_size * props.add_box_size, props.max_size * props.add_box_size
-        )
-        w1 = fun.randomValue(
-            props.min_size * props.add_box_size, props.max_size * props.add_box_size
-        )
-        w2 = fun.randomValue(
-            props.min_size * props.add_box_size, props.max_size * props.add_box_size
-        )
-        w3 = fun.randomValue(
-            props.min_size * props.add_box_size, props.max_size * props.add_box_size
-        )
-        d1 = fun.randomValue(props.min_size, props.max_size)
-        d2 = fun.randomValue(props.min_size, props.max_size)
-        d3 = fun.randomValue(props.min_size, props.max_size)
+            h = fun.randomValue(
+                props.min_size * props.add_box_size, props.max_size * props.add_box_size
+            )
+            w1 = fun.randomValue(
+                props.min_size * props.add_box_size, props.max_size * props.add_box_size
+            )
+            w2 = fun.randomValue(
+                props.min_size * props.add_box_size, props.max_size * props.add_box_size
+            )
+            w3 = fun.randomValue(
+                props.min_size * props.add_box_size, props.max_size * props.add_box_size
+            )
+            d1 = fun.randomValue(props.min_size, props.max_size)
+            d2 = fun.randomValue(props.min_size, props.max_size)
+            d3 = fun.randomValue(props.min_size, props.max_size)
+
+            boxes = [
+                (fun.dir2Vec3(0), updir, dir1, w1, h, d1),
+                (fun.dir2Vec3(0) + updir * 0.00001, updir, dir2, w2, h, d2),
+                (fun.dir2Vec3(0) + updir1 * 0.00002, updir1, dir3, w3, h, d3),
+            ]
+            if constraint is None or all(constraint.fitsPoints(fun.boxPoints(*box)) for box in boxes):
+                break
+        else:
+            fun.recordSiteReject("branch", props.max_attempts)
+            self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成场地内的Branch")
+            return {"CANCELLED"}
 
-        box1 = fun.crateBoxWithDir(fun.dir2Vec3(0), updir, dir1, w1, h, d1)
-        box2 = fun.crateBoxWithDir(
-            fun.dir2Vec3(0) + updir * 0.00001, updir, dir2, w2, h, d2
-        )
-        box3 = fun.crateBoxWithDir(
-            fun.dir2Vec3(0) + updir1 * 0.00002, updir1, dir3, w3, h, d3
-        )
+        box1, box2, box3 = [fun.crateBoxWithDir(*box) for box in boxes]
 
         fun.calBool(box1, box2, "add")
         fun.calBool(box1, box3, "add")
@@ -229,6 +597,12 @@ class Extract(bpy.types.Operator):
     bl_idname = "ronge_adt.extract"
     bl_label = "Extract"
 
+    def invoke(self, context, event):
+        # 界面点击时可由进程池并行评估候选；脚本调用(Auto等)只走execute
+        if context.scene.adt_props.pool_isenable:
+            return runCandidates(self, context, "extract", needs_base=False)
+        return self.execute(context)
+
     def execute(self, context):
         props = context.scene.adt_props
 
@@ -237,47 +611,47 @@ class Extract(bpy.types.Operator):
                 fun.delobj(obj)
                 break
         
-        baseBox = fun.randomCube(props.min_size, props.max_size, props.max_area)
+        constraint = sitecheck.fromProps(props)
+        baseBox = fun.randomSiteCube(
+            constraint, props.min_size, props.max_size, props.max_area, props.max_attempts
+        )
+        if baseBox is None:
+            self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成场地内的基形")
+            return {"CANCELLED"}
         baseBox.name = "BaseBox"
 
-        for attempt in range(props.max_attempts):
-            addBox = fun.randomCube(
-                props.min_size * props.add_box_size,
-                props.max_size * props.add_box_size,
-                props.max_area,
-            )
-
-            is_intersecting = fun.isIntersect(baseBox, addBox)
-            is_inside = fun.isInside(baseBox, addBox)
-
-            if is_intersecting and not is_inside:
-                fun.snapEdge(baseBox, addBox, fun.randomDir())
-                Basebox1 = fun.copyobj(baseBox)
-                addbox1 = fun.copyobj(addBox)
+        addBox, attempts = fun.sampleAddBox(
+            "extract",
+            baseBox,
+            props.min_size * props.add_box_size,
+            props.max_size * props.add_box_size,
+            props.max_area,
+            props.max_attempts,
+            props.sample_mode,
+            constraint,
+        )
+        if addBox is None:
+            self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成")
+            return {"CANCELLED"}
 
-                addedbox = fun.calBool(baseBox, addBox, "add")
+        fun.snapEdge(baseBox, addBox, fun.randomDir())
+        Basebox1 = fun.copyobj(baseBox)
+        addbox1 = fun.copyobj(addBox)
 
-                subbox = fun.calBool(Basebox1, addbox1, "mul")
-                shell = fun.copyobj(subbox)
-                shell = fun.offsetShell(shell, 0.0001, 0.0001, 0.0001)
-                fixedsubbox = fun.calBool(subbox, shell, "add")
+        addedbox = fun.calBool(baseBox, addBox, "add")
 
-                box = fun.calBool(addedbox, fixedsubbox, "sub")
-                fun.optimizeMesh(box)
-                box.name = "BaseBox"
+        subbox = fun.calBool(Basebox1, addbox1, "mul")
+        shell = fun.copyobj(subbox)
+        shell = fun.offsetShell(shell, 0.0001, 0.0001, 0.0001)
+        fixedsubbox = fun.calBool(subbox, shell, "add")
 
-                bpy.ops.object.transform_apply(
-                    location=False, rotation=True, scale=False
-                )
-                break
-            else:
-                fun.delobj(addBox)
+        box = fun.calBool(addedbox, fixedsubbox, "sub")
+        fun.optimizeMesh(box)
+        box.name = "BaseBox"
 
-                if attempt == props.max_attempts - 1:
-                    self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成")
-                    return {"CANCELLED"}
+        bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
 
-        print("Extract")
+        print(f"Extract: {attempts}次尝试")
         return {"FINISHED"}
 
 
@@ -291,16 +665,29 @@ class Offset(bpy.types.Operator):
         props = context.scene.adt_props
             
         baseBox = bpy.context.scene.objects["BaseBox"]
-        fun.setActive(baseBox)
-        shell = fun.copyobj(baseBox)
 
-        offset = fun.randomValue(0 - props.offset_maxoffset, props.offset_maxoffset)
-        fun.offsetShell(shell, props.offset_minthick, props.offset_maxthick, offset)
-
-        if fun.randomBool():
-            fun.calBool(baseBox, shell, "sub")
+        # 差集只会缩小BaseBox；并集最多向外扩展一个壳厚，外扩后的包围盒须在场地内
+        constraint = sitecheck.fromProps(props)
+        for attempt in range(props.max_attempts if constraint is not None else 1):
+            offset = fun.randomValue(0 - props.offset_maxoffset, props.offset_maxoffset)
+            thickness = fun.randomValue(props.offset_minthick, props.offset_maxthick)
+            shift = fun.randomValue(0, offset)
+            subtract = fun.randomBool()
+            if (
+                constraint is None
+                or subtract
+                or constraint.fitsBounds(fun.expandBounds(fun.cachedBounds(baseBox), thickness))
+            ):
+                break
         else:
-            fun.calBool(baseBox, shell, "add")
+            fun.recordSiteReject("offset", props.max_attempts)
+            self.report({"WARNING"}, f"Offset: {props.max_attempts}次采样均超出场地")
+            return {"CANCELLED"}
+
+        fun.setActive(baseBox)
+        shell = fun.copyobj(baseBox)
+        fun.solidifyShell(shell, thickness, shift)
+        fun.calBool(baseBox, shell, "sub" if subtract else "add")
 
         print("Offset")
         return {"FINISHED"}
@@ -318,7 +705,7 @@ class Twist(bpy.types.Operator):
         baseBox = bpy.context.scene.objects["BaseBox"]
         dir = fun.randomDir()
 
-        fun.cutLineWithDir(baseBox, dir)
+        fun.cutLineWithDir(baseBox, dir, props.twist_cutinterval)
         fun.addTwist(baseBox, dir, fun.randomValue(0, props.twist_maxangle))
 
         print("Twist")
@@ -385,34 +772,33 @@ class Carve(bpy.types.Operator):
     bl_idname = "ronge_adt.carve"
     bl_label = "Carve"
 
+    def invoke(self, context, event):
+        if context.scene.adt_props.pool_isenable:
+            return runCandidates(self, context, "carve", needs_base=True)
+        return self.execute(context)
+
     def execute(self, context):
         props = context.scene.adt_props
             
         baseBox = bpy.context.scene.objects["BaseBox"]
 
-        addBox = None
-        for attempt in range(props.max_attempts):
-            addBox = fun.randomCube(
-                props.min_size * props.add_box_size,
-                props.max_size * props.add_box_size,
-                props.max_area,
-            )
-
-            is_intersecting = fun.isIntersect(baseBox, addBox)
-            is_inside = fun.isInside(baseBox, addBox)
+        addBox, attempts = fun.sampleAddBox(
+            "carve",
+            baseBox,
+            props.min_size * props.add_box_size,
+            props.max_size * props.add_box_size,
+            props.max_area,
+            props.max_attempts,
+            props.sample_mode,
+        )
+        if addBox is None:
+            self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成")
+            return {"CANCELLED"}
 
-            if is_intersecting and not is_inside:
-                fun.calBool(baseBox, addBox, "sub")
-                fun.setActive(baseBox)
-                break
-            else:
-                fun.delobj(addBox)
-                fun.setActive(baseBox)
-                if attempt == props.max_attempts - 1:
-                    self.report({"WARNING"}, f"无法在{props.max_attempts}次尝试内生成")
-                    return {"CANCELLED"}
+        fun.calBool(baseBox, addBox, "sub")
+        fun.setActive(baseBox)
 
-        print("Carve")
+        print(f"Carve: {attempts}次尝试")
         return {"FINISHED"}
 
 
@@ -430,38 +816,12 @@ class Frature(bpy.types.Operator):
         width = fun.randomValue(props.frature_minwidth, props.frature_maxwidth)
 
         pos = fun.randomInsidePoint(baseBox)
-        dir1 = fun.randomVector(updir)
-        dir2 = fun.randomVector(updir)
+        dir1, dir2 = fun.randomVectors(2, updir)
 
-        whole_wall1 = fun.crateBoxWithDir(
-            pos + updir * 0.001, updir, dir1, width, 100, 100, True
-        )
-        half_wall1 = fun.crateBoxWithDir(
-            pos + updir * 0.001, updir, dir1, width, 100, 100, False
+        # 一次生成L形墙（两面半墙及交角），长度以BaseBox对角线为界
+        wall = fun.crateLWall(
+            pos + updir * 0.001, updir, dir1, dir2, width, fun.boundDiagonal(baseBox)
         )
-        whole_wall2 = fun.crateBoxWithDir(
-            pos + updir * 0.001, updir, dir2, width, 100, 100, True
-        )
-        half_wall2 = fun.crateBoxWithDir(
-            pos + updir * 0.001, updir, dir2, width, 100, 100, False
-        )
-
-        corner = fun.calBool(whole_wall1, whole_wall2, "mul")
-        shell = fun.copyobj(corner)
-        shell = fun.offsetShell(shell, 0.0001, 0.0001, 0.0001)
-        fixedcorner = fun.calBool(corner, shell, "add")
-
-        shell = fun.copyobj(half_wall1)
-        shell = fun.offsetShell(shell, 0.0001, 0.0001, 0.0001)
-        fixedhalf_wall1 = fun.calBool(half_wall1, shell, "add")
-
-        shell = fun.copyobj(half_wall2)
-        shell = fun.offsetShell(shell, 0.0001, 0.0001, 0.0001)
-        fixedhalf_pwall2 = fun.calBool(half_wall2, shell, "add")
-
-        wall = fun.calBool(fixedhalf_wall1, fixedhalf_pwall2, "add")
-        wall = fun.calBool(wall, fixedcorner, "add")
-
         fun.calBool(baseBox, wall, "sub")
 
         print("Frature")
@@ -0,0 +1,491 @@
+import os
+import random
+import time
+import bpy
+import numpy as np
+from mathutils import Vector
+from . import dataset
+from . import fingerprint
+from . import functions as fun
+from . import jobqueue
+from . import metrics
+from . import planner
+from . import sweep
+from . import validity
+
+
+class ModelAborted(Exception):
+    """模型超出单模型时间或顶点上限，或规则结果重试后仍无效"""
+
+
+class AutoSession:
+    """一次Auto运行的状态，可逐个模型推进（Auto、Sweep共用）"""
+
+    offset1 = 2
+    offset2 = 3
+
+    def __init__(self, props, prefix="", origin=Vector((0, 0, 0)), resume=False):
+        """resume为True时从保存路径下的任务队列续跑（参数、种子、计划均取自队列）"""
+        self.props = props
+        self.prefix = prefix
+        self.origin = origin.copy()
+        self.index = 0
+        self.objects = []
+
+        self.savepath = ""
+        if props.auto_issave and props.auto_savepath:
+            self.savepath = bpy.path.abspath(props.auto_savepath)
+
+        self.queue = None
+        self.interrupted = []
+        if resume:
+            if not self.savepath:
+                raise ValueError("续跑需要设置保存路径")
+            self.queue = jobqueue.JobQueue.open(jobqueue.queuePath(self.savepath, prefix))
+            sweep.applyOverrides(
+                props, {key: value for key, value in self.queue.params.items() if hasattr(props, key)}
+            )
+            self.seed = self.queue.seed
+            self.plan = self.queue.plan()
+            self.interrupted = self.queue.recover()
+            self.order = self.queue.pending()
+        else:
+            self.seed = props.auto_seed or random.getrandbits(32)
+            self.plan = planner.buildPlan(
+                props.auto_count,
+                props.auto_deformation_count,
+                props.auto_culling_count,
+                props.auto_isorder,
+                self.seed,
+            )
+            self.order = list(range(len(self.plan)))
+        self.count = len(self.plan)
+
+        self.fingerprints = fingerprint.FingerprintIndex(props.dedup_tolerance)
+        # 当前模型加入指纹索引的指纹，随模型结果存入任务队列
+        self.modelfp = None
+        if resume and props.dedup_isenable:
+            # 已完成模型的指纹，续跑时不会与之前生成的模型重复
+            for i, fp in self.queue.fingerprints():
+                self.fingerprints.add(fp)
+        self.skipped = 0
+        self.decimated = 0
+        self.peakverts = 0
+        # 被中止的模型 (序号, 种子, 原因)
+        self.failed = []
+        # 规则结果无效后的重试次数
+        self.retried = 0
+        # 每个完成模型的度量 {序号: metrics.measure()}
+        self.metrics = {}
+        self.filtered = 0
+        self.modelstart = 0
+
+        self.writer = None
+        if self.savepath:
+            params = dict(sweep.propsToDict(props), auto_seed=self.seed)
+            if not resume:
+                planner.savePlan(os.path.join(self.savepath, f"{prefix}plan.npy"), self.plan)
+                self.queue = jobqueue.JobQueue.create(
+                    jobqueue.queuePath(self.savepath, prefix), self.plan, self.seed, params
+                )
+
+            if props.auto_saveformat == "DATASET":
+                self.writer = dataset.DatasetWriter(
+                    os.path.join(self.savepath, f"{prefix}dataset"), props.auto_shardsize, params
+                )
+            if resume:
+                self.restoreResults()
+
+        fun.resetSampleStats()
+        fun.resetClipStats()
+
+    @property
+    def total(self):
+        """OutPut:本次需要生成的模型数（续跑时为剩余模型数）"""
+        return len(self.order)
+
+    @property
+    def done(self):
+        return self.index >= self.total
+
+    @property
+    def extent(self):
+        """OutPut:本次运行在场景中占用的(x, y)范围"""
+        return self.offset1 * self.count, self.offset2 * self.plan.shape[1]
+
+    def progressText(self, elapsed):
+        """OutPut:进度描述（完成数/总数、速率、剩余时间）"""
+        rate = self.index / elapsed if elapsed > 0 else 0
+        eta = (self.total - self.index) / rate if rate > 0 else 0
+        return f"{self.index}/{self.total}  {rate:.2f}个/s  剩余{eta:.0f}s"
+
+    def onePass(self, i, j, addname, final=True):
+        """放置当前BaseBox的副本，只有最终模型（final）保留原始网格供LOD切换"""
+        obj = fun.onePass(i, j, self.offset1, self.offset2, addname, self.prefix, self.origin)
+        if self.props.lod_isenable:
+            fun.makeLods(obj, self.props.lod_resolution, self.props.lod_default, keep_full=final)
+        self.objects.append(obj.name)
+
+    def runChain(self, i, row):
+        snap = None
+        try:
+            for j, code in enumerate(row):
+                snap = self.runRule(i, row, j, snap)
+                # 不在场景中展示时不保留各阶段副本
+                if self.props.auto_isarrange:
+                    self.onePass(i, j - 1, planner.chainName(row, j + 1), final=j == len(row) - 1)
+        finally:
+            if snap is not None:
+                fun.dropSnapshot(snap)
+
+    def runRule(self, i, row, j, snap):
+        """执行第j条规则并把结果控制在顶点预算内，结果无效时从snap重试
+
+        有效性检查和快照都在预算简化、看门狗检查之后，检查的是下一条规则实际拿到的网格，
+        snap（上一条规则处理后的有效结果）也就是本条规则的输入
+        OutPut:本条规则处理后结果的快照，供下一条规则回退；未启用检查时为None
+        """
+        rule = getattr(bpy.ops.ronge_adt, planner.RULE_NAMES[row[j]])
+        props = self.props
+        attempts = props.validity_retries + 1 if props.validity_isenable else 1
+
+        for attempt in range(attempts):
+            if attempt:
+                self.retried += 1
+                # 基形规则（j为0）会自行重建BaseBox
+                if snap is not None:
+                    fun.restoreSnapshot(snap)
+            rule()
+            self.limitComplexity(i, row, j)
+            self.checkWatchdog(i, row, j)
+            if not props.validity_isenable:
+                return None
+            reason = self.checkValidity()
+            if reason is None:
+                break
+            print(f"{self.prefix}{i}{planner.chainName(row, j + 1)}: {reason}")
+        else:
+            raise ModelAborted(f"{self.prefix}{i}{planner.chainName(row, j + 1)}: {reason}")
+
+        if snap is not None:
+            fun.dropSnapshot(snap)
+        return fun.snapshot(bpy.context.scene.objects["BaseBox"])
+
+    def checkValidity(self):
+        """OutPut:BaseBox无效的原因，有效时为None"""
+        base = bpy.context.scene.objects.get("BaseBox")
+        if base is None:
+            return "BaseBox不存在"
+        stats = validity.inspect(*fun.getMeshArrays(base))
+        return validity.problem(stats, self.props.validity_minvolume, self.props.validity_manifold)
+
+    def limitComplexity(self, i, row, j):
+        """规则之间把BaseBox控制在顶点预算内，保证下一次布尔运算的输入规模有界
+
+        关闭塌陷或塌陷后仍超出预算时抛出ModelAborted
+        """
+        props = self.props
+        if props.budget_maxverts <= 0:
+            return
+        base = bpy.context.scene.objects.get("BaseBox")
+        if base is None:
+            return
+
+        before, after = fun.limitComplexity(
+            base, props.budget_maxverts, props.budget_angle, collapse=props.budget_iscollapse
+        )
+        if after < before:
+            self.decimated += 1
+        self.peakverts = max(self.peakverts, before)
+        name = f"{self.prefix}{i}{planner.chainName(row, j + 1)}"
+        if after > props.budget_maxverts:
+            # 下一条规则的输入必须在预算内，简化后仍超出时中止该模型
+            raise ModelAborted(f"{name}: 简化后{after}顶点仍超出预算{props.budget_maxverts}")
+        print(f"{name}: {before} -> {after} 顶点")
+
+    def checkWatchdog(self, i, row, j):
+        """规则之间检查单模型时间和顶点上限，超出时抛出ModelAborted
+
+        正在执行的布尔运算无法中断，超时在当前规则结束后才会被发现；
+        后台进程池中卡住的worker由WorkerPool按request_timeout强制重启
+        """
+        props = self.props
+        if not props.watchdog_isenable:
+            return
+        name = f"{self.prefix}{i}{planner.chainName(row, j + 1)}"
+
+        elapsed = time.perf_counter() - self.modelstart
+        if elapsed > props.watchdog_seconds:
+            raise ModelAborted(f"{name}: 用时{elapsed:.1f}s超出{props.watchdog_seconds:g}s")
+
+        if props.watchdog_maxverts > 0:
+            base = bpy.context.scene.objects.get("BaseBox")
+            if base is not None and len(base.data.vertices) > props.watchdog_maxverts:
+                raise ModelAborted(
+                    f"{name}: {len(base.data.vertices)}顶点超出上限{props.watchdog_maxverts}"
+                )
+
+    def baseArrays(self):
+        """OutPut:BaseBox世界坐标(顶点, 三角面)，去重、度量共用一次读取，没有BaseBox时为None"""
+        base = bpy.context.scene.objects.get("BaseBox")
+        if base is None:
+            return None
+        return fun.getMeshArrays(base)
+
+    def isDuplicate(self, arrays):
+        """把当前BaseBox的指纹加入索引，OutPut:是否与已有模型重复"""
+        if not self.props.dedup_isenable or arrays is None:
+            return False
+        fp = fingerprint.fingerprint(*arrays)
+        if self.fingerprints.add(fp):
+            return True
+        self.modelfp = fp
+        return False
+
+    def measure(self, i, arrays):
+        """记录模型度量，OutPut:不满足Auto筛选条件的原因，满足时为None"""
+        if arrays is None:
+            return None
+        values = metrics.measure(*arrays)
+        self.metrics[i] = values
+        props = self.props
+        if not props.filter_isenable:
+            return None
+        return metrics.rejection(
+            values, props.filter_maxfootprint, props.filter_maxheight, props.filter_mincompactness
+        )
+
+    def discard(self, first):
+        """删除从第first个起本模型放置的副本"""
+        for name in self.objects[first:]:
+            obj = bpy.data.objects.get(name)
+            if obj is not None:
+                fun.dropLods(obj)
+                fun.delobj(obj)
+        del self.objects[first:]
+
+    def step(self):
+        """按计划生成一个模型，重复时按dedup_mode跳过或重新生成"""
+        props = self.props
+        i = self.order[self.index]
+        start = self.beginModel(i)
+
+        status = jobqueue.SKIPPED
+        message = None
+        first = len(self.objects)
+        try:
+            for attempt in range(props.dedup_retries + 1):
+                self.runChain(i, self.plan[i])
+                arrays = self.baseArrays()
+                if not self.isDuplicate(arrays):
+                    message = self.measure(i, arrays)
+                    if message is None:
+                        status = jobqueue.DONE
+                    else:
+                        # 不满足筛选条件：丢弃，记为跳过
+                        self.discard(first)
+                        self.metrics.pop(i)
+                        self.filtered += 1
+                    break
+
+                self.discard(first)
+                if props.dedup_mode == "SKIP" or attempt == props.dedup_retries:
+                    self.skipped += 1
+                    break
+
+                # 重新抽取该模型的规则链
+                self.plan[i] = planner.buildPlan(
+                    1,
+                    props.auto_deformation_count,
+                    props.auto_culling_count,
+                    props.auto_isorder,
+                    self.rng,
+                )[0]
+        except ModelAborted as e:
+            # 丢弃该模型，记下种子后继续下一个
+            self.discard(first)
+            status = jobqueue.FAILED
+            message = str(e)
+            self.failed.append((i, jobqueue.modelSeed(self.seed, i), message))
+            print(f"中止 {message}")
+        except Exception as e:
+            # 意外错误：本模型记为失败（任务队列中不再停留在RUNNING），由调用方结束会话
+            self.discard(first)
+            message = f"{type(e).__name__}: {str(e)}"
+            self.failed.append((i, jobqueue.modelSeed(self.seed, i), message))
+            self.endModel(i, jobqueue.FAILED, time.perf_counter() - start, message)
+            self.index += 1
+            raise
+
+        self.endModel(i, status, time.perf_counter() - start, message)
+        fun.clean()
+        self.index += 1
+
+    def beginModel(self, i):
+        """每个模型使用由运行种子派生的独立种子，续跑时结果与连续运行一致，OutPut:开始时间"""
+        seed = jobqueue.modelSeed(self.seed, i)
+        random.seed(seed)
+        self.rng = np.random.default_rng([seed, 1])
+        if self.queue is not None:
+            self.queue.start(i)
+        self.modelfp = None
+        self.modelstart = time.perf_counter()
+        return self.modelstart
+
+    def endModel(self, i, status, seconds, message=None):
+        """记录模型结果：先存入任务队列，再写入数据集缓冲区"""
+        result = self.export(i) if status == jobqueue.DONE else None
+        if self.queue is not None:
+            self.queue.finish(i, status, self.plan[i], result, seconds, message, self.modelfp)
+        if result is not None and self.writer is not None:
+            self.addToWriter(*result)
+
+    def modelName(self, i):
+        return f"{self.prefix}{i}{planner.chainName(self.plan[i])}"
+
+    def export(self, i):
+        """OutPut:当前BaseBox（局部坐标）的(顶点, 三角面, 元数据)，无需保存时为None"""
+        if self.writer is None and self.queue is None:
+            return None
+        base = bpy.context.scene.objects.get("BaseBox")
+        if base is None:
+            return None
+        verts, tris = fun.getMeshArrays(base, world=False)
+        meta = {"index": i, "name": self.modelName(i)}
+        if i in self.metrics:
+            meta["metrics"] = self.metrics[i]
+        if self.queue is not None:
+            meta["run"] = self.queue.run
+        return verts, tris, meta
+
+    def addToWriter(self, verts, tris, meta):
+        """写入数据集缓冲区，分片写出后从任务队列删除这些模型的结果"""
+        indices = [model["index"] for model in self.writer.models] + [meta["index"]]
+        flushed = self.writer.add(verts, tris, self.plan[meta["index"]], meta)
+        if flushed is not None and self.queue is not None:
+            self.queue.dropResults(indices)
+
+    def restoreResults(self):
+        """续跑：把已完成但未写入分片的模型放回数据集缓冲区，.blend格式且排列时放回场景
+
+        未排列时由finish在保存前统一重建
+        """
+        results = self.queue.results()
+        if self.writer is not None:
+            stored = dataset.storedIndices(self.writer.path, self.queue.run)
+            for i, verts, tris, meta in results:
+                if i in stored:
+                    self.queue.dropResults([i])
+                else:
+                    self.addToWriter(verts, tris, meta)
+        elif self.props.auto_isarrange:
+            self.linkResults(results)
+
+    def linkResults(self, results):
+        """把任务队列中的模型结果重建为场景中的物体，位置与onePass放置最终模型的位置相同"""
+        row = self.offset2 * (self.plan.shape[1] - 1)
+        for i, verts, tris, meta in results:
+            mesh = fun.meshFromArrays(meta["name"], verts, tris)
+            location = self.origin + Vector((self.offset1 * i, row, 0))
+            self.objects.append(fun.linkMesh(meta["name"], mesh, location).name)
+
+    def run(self):
+        while not self.done:
+            self.step()
+        return self.finish()
+
+    def finish(self):
+        """删除BaseBox，OutPut:采样统计报告"""
+        base = bpy.context.scene.objects.get("BaseBox")
+        if base is not None:
+            fun.delobj(base)
+
+        counts = planner.describePlan(self.plan[self.order[: self.index]])
+        summary = ", ".join(f"{name} {count}" for name, count in counts.items() if count)
+        report = [f"规则计划(种子{self.seed}): {summary}"]
+        if self.props.budget_maxverts > 0:
+            report.append(f"复杂度预算: 峰值{self.peakverts}顶点，简化{self.decimated}次")
+        if self.props.dedup_isenable:
+            report.append(f"去重: 拒绝{self.fingerprints.rejected}次，跳过{self.skipped}个模型")
+        if self.props.validity_isenable:
+            report.append(f"有效性检查: 重试{self.retried}次")
+        if self.props.filter_isenable:
+            report.append(f"筛选: 丢弃{self.filtered}个模型")
+        summary = metrics.summarize(list(self.metrics.values()))
+        if summary:
+            report.append(
+                "度量均值: "
+                + ", ".join(f"{key} {value['mean']:.3g}" for key, value in summary.items())
+            )
+        if self.failed:
+            seeds = ", ".join(f"{i}(种子{seed})" for i, seed, message in self.failed)
+            report.append(f"中止{len(self.failed)}个模型: {seeds}")
+
+        if self.writer is not None:
+            self.writer.close()
+            shards = len(self.writer.index["shards"])
+            report.append(f"数据集: {self.writer.count}个模型，{shards}个分片 -> {self.writer.path}")
+        elif self.savepath and self.props.auto_saveformat == "BLEND":
+            if not self.props.auto_isarrange:
+                # 未排列时模型不在场景中，从任务队列重建后再保存（含续跑前完成的模型）
+                self.linkResults(self.queue.results())
+            path = os.path.join(self.savepath, f"{self.prefix}auto.blend")
+            bpy.ops.wm.save_as_mainfile(filepath=path, copy=True)
+            report.append(f"已保存: {path}")
+
+        if self.queue is not None:
+            if self.done:
+                # 全部模型已写入分片或.blend
+                self.queue.dropResults()
+            counts = self.queue.counts()
+            report.append(
+                f"任务队列: 完成{counts[jobqueue.DONE]}，跳过{counts[jobqueue.SKIPPED]}，"
+                f"失败{counts[jobqueue.FAILED]}，未运行{counts[jobqueue.PENDING]} -> {self.queue.path}"
+            )
+            if self.interrupted:
+                report.append(f"上次中断时正在生成的模型记为失败: {self.interrupted}")
+            self.queue.close()
+        return report + fun.clipReport() + fun.sampleReport()
+
+
+def runConfigs(props, items, worker=None):
+    """在当前会话中依次运行 (序号, 覆盖参数) 配置，OutPut:清单条目列表
+
+    每个配置的物体名加上 c<序号>_ 前缀，并沿Y方向依次排开
+    """
+    entries = []
+    origin = Vector((0, 0, 0))
+
+    for index, overrides in items:
+        old = sweep.applyOverrides(props, overrides)
+        try:
+            start = time.perf_counter()
+            session = AutoSession(props, f"c{index}_", origin)
+            report = session.run()
+            seconds = time.perf_counter() - start
+
+            origin.y += session.extent[1] + AutoSession.offset2
+        finally:
+            sweep.applyOverrides(props, old)
+
+        entries.append(
+            {
+                "config": index,
+                "tag": session.prefix,
+                "overrides": overrides,
+                "models": session.count,
+                "objects": session.objects,
+                "metrics": {str(i): values for i, values in sorted(session.metrics.items())},
+                "metrics_summary": metrics.summarize(list(session.metrics.values())),
+                "failed": [
+                    {"index": i, "seed": seed, "message": message} for i, seed, message in session.failed
+                ],
+                "seconds": seconds,
+                "sampling": report,
+                "dataset": session.writer.path if session.writer else None,
+                "worker": worker,
+            }
+        )
+        print(f"Sweep c{index}: {session.count}个模型 {seconds:.2f}s")
+
+    return entries
@@ -0,0 +1,84 @@
+"""规则计划：为所有模型预先生成紧凑的整数规则链
+
+计划是 (模型数, 1 + 形变次数 + 剔除次数) 的 uint8 数组，
+第0列为基形规则，其余列为形变/剔除规则，编码见 RULE_NAMES。
+"""
+
+import numpy as np
+
+MERGE, BRANCH, EXTRACT, OFFSET, TWIST, SHIFT, CARVE, FRATURE, EXPLAND = range(9)
+
+RULE_NAMES = (
+    "merge",
+    "branch",
+    "extract",
+    "offset",
+    "twist",
+    "shift",
+    "carve",
+    "frature",
+    "expland",
+)
+
+BASE_RULES = (MERGE, BRANCH, EXTRACT)
+DEFORMATION_RULES = (OFFSET, TWIST, SHIFT)
+CULLING_RULES = (CARVE, FRATURE, EXPLAND)
+
+
+def buildPlan(count, deformation_count, culling_count, isorder, seed=None):
+    """OutPut:(count, 1 + deformation_count + culling_count) uint8 规则计划
+
+    isorder 为True时打乱每个模型的形变/剔除顺序（与原Auto行为一致）
+    """
+    rng = np.random.default_rng(seed)
+    steps = deformation_count + culling_count
+
+    plan = np.empty((count, 1 + steps), dtype=np.uint8)
+    plan[:, 0] = rng.integers(0, len(BASE_RULES), count)
+
+    # 0为形变，1为剔除
+    kinds = np.zeros((count, steps), dtype=np.uint8)
+    kinds[:, deformation_count:] = 1
+    if isorder and steps > 1:
+        kinds = rng.permuted(kinds, axis=1)
+
+    choice = rng.integers(0, 3, (count, steps), dtype=np.uint8)
+    plan[:, 1:] = OFFSET + kinds * 3 + choice
+
+    return plan
+
+
+def chainName(row, length=None):
+    """OutPut:规则链名称后缀，如 _merge_twist_carve（只取前length个规则）"""
+    codes = row if length is None else row[:length]
+    return "".join("_" + RULE_NAMES[code] for code in codes)
+
+
+def describePlan(plan):
+    """OutPut:{规则名: 出现次数}"""
+    counts = np.bincount(plan.ravel(), minlength=len(RULE_NAMES))
+    return {name: int(counts[code]) for code, name in enumerate(RULE_NAMES)}
+
+
+def uniqueChains(plan):
+    """OutPut:(不重复的规则链, 每条链的模型数)"""
+    return np.unique(plan, axis=0, return_counts=True)
+
+
+def shardPlan(plan, count):
+    """按连续区间切分计划，OutPut:[(起始序号, 子计划)]"""
+    shards = []
+    start = 0
+    for part in np.array_split(plan, max(1, count)):
+        if len(part):
+            shards.append((start, part))
+        start += len(part)
+    return shards
+
+
+def savePlan(path, plan):
+    np.save(path, plan)
+
+
+def loadPlan(path):
+    return np.load(path)
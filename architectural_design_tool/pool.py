@@ -0,0 +1,280 @@
+"""常驻后台worker进程池：并行评估同一规则的多个候选，取第一个成功的结果
+
+worker以 `blender -b ... worker.py -- serve` 启动后常驻，从stdin逐行读取JSON请求，
+把结果以 REPLY_PREFIX 开头的一行JSON写到stdout（其余输出忽略）。
+
+    请求: {"id": n, "rule": "extract", "seed": s, "props": {...}, "base": 网格或null}
+    回复: {"id": n, "status": "FINISHED"|"CANCELLED"|"ERROR", "mesh": 网格, "message": ...}
+
+worker启动完成（插件已载入）时先回复一行 READY_REPLY。
+
+网格为共享内存描述符（见 transport.py，布局同 functions.shareMesh，世界坐标）。
+请求中的base由协调进程持有，比赛结束后删除；回复中的mesh由协调进程读取后删除，
+worker在处理下一个请求时才关闭自己的句柄。
+
+worker在执行规则时无法中断：决出结果（或比赛超时）后尚未派发的候选直接取消，
+仍在运行的候选所在worker被强制结束并在原槽位重启，不再占用CPU；
+结束前已到达的结果连同其共享内存一起丢弃。
+设置request_timeout时，单个请求超时的worker（如卡在病态布尔运算中）被强制结束并在原槽位重启，
+时限从worker启动完成与请求派发两者中较晚的时刻算起，不包含Blender的启动时间。
+"""
+
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+
+from . import transport
+
+REPLY_PREFIX = "ADT_REPLY "
+READY_REPLY = {"id": None, "status": "READY"}
+
+
+def workerCommand(binary, worker_path=None):
+    """OutPut:启动一个常驻worker的命令行"""
+    if worker_path is None:
+        worker_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+    return [binary, "-b", "--factory-startup", "--python", worker_path, "--", "serve"]
+
+
+def encodeReply(reply):
+    return REPLY_PREFIX + json.dumps(reply)
+
+
+def decodeReply(line):
+    """OutPut:回复字典，不是回复行时为None"""
+    if not line.startswith(REPLY_PREFIX):
+        return None
+    return json.loads(line[len(REPLY_PREFIX):])
+
+
+class Worker:
+    def __init__(self, process, reader):
+        self.process = process
+        # 读取stdout的线程
+        self.reader = reader
+        # 正在执行的请求id，None为空闲
+        self.busy = None
+        # 当前请求开始计时的时刻（派发时间，启动未完成时为启动完成时间）
+        self.since = None
+        # 是否已回复READY
+        self.ready = False
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+
+class WorkerPool:
+    """size个常驻worker，race() 把候选种子分给空闲worker，返回第一个成功的回复"""
+
+    def __init__(self, command, size=4, request_timeout=None):
+        self.command = list(command)
+        self.size = max(1, size)
+        # 单个请求的最长执行时间（秒），None为不限制
+        self.request_timeout = request_timeout
+        self.restarts = 0
+        self.workers = []
+        # (槽位, 进程, 回复) ，回复为None表示进程已退出
+        self.replies = queue.Queue()
+        self._ids = itertools.count(1)
+
+    @property
+    def started(self):
+        return bool(self.workers)
+
+    def start(self):
+        if not self.workers:
+            self.workers = [None] * self.size
+            for slot in range(self.size):
+                self._spawn(slot)
+        return self
+
+    def _spawn(self, slot):
+        process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        reader = threading.Thread(target=self._read, args=(slot, process), daemon=True)
+        self.workers[slot] = Worker(process, reader)
+        reader.start()
+
+    def _read(self, slot, process):
+        for line in process.stdout:
+            reply = decodeReply(line.rstrip("\n"))
+            if reply is not None:
+                self.replies.put((slot, process, reply))
+        self.replies.put((slot, process, None))
+
+    def _send(self, worker, message):
+        try:
+            worker.process.stdin.write(json.dumps(message) + "\n")
+            worker.process.stdin.flush()
+            return True
+        except (BrokenPipeError, OSError, ValueError):
+            return False
+
+    def _receive(self, block=True, timeout=None):
+        """取一条回复并更新worker状态，OutPut:回复，READY或来自已替换进程时为None
+
+        没有回复时抛出queue.Empty
+        """
+        slot, process, reply = self.replies.get(block, timeout)
+        worker = self.workers[slot]
+        if worker.process is not process:
+            if reply is not None and reply.get("mesh") is not None:
+                transport.release(reply["mesh"])  # 已被强制结束的进程
+            return None
+
+        if reply is None:
+            # worker退出：其候选视为失败，原槽位重启
+            reply = {"id": worker.busy, "status": "ERROR", "message": "worker进程退出"}
+            self._spawn(slot)
+            return reply
+
+        if reply.get("status") == READY_REPLY["status"]:
+            worker.ready = True
+            worker.since = time.perf_counter()
+            return None
+
+        worker.busy = None
+        return reply
+
+    def reap(self, requests=None):
+        """强制结束worker并在原槽位重启，OutPut:被中止的请求id列表
+
+        requests为None时结束执行超过request_timeout的worker，否则结束正在执行requests中请求的worker
+        """
+        if requests is None and self.request_timeout is None:
+            return []
+        now = time.perf_counter()
+        stuck = []
+        for slot, worker in enumerate(self.workers):
+            if worker.busy is None:
+                continue
+            if requests is not None:
+                expired = worker.busy in requests
+            else:
+                expired = worker.ready and now - worker.since > self.request_timeout
+            if expired:
+                stuck.append(worker.busy)
+                worker.process.kill()
+                worker.process.wait()
+                self._spawn(slot)
+                self.restarts += 1
+        return stuck
+
+    def nextDeadline(self):
+        """OutPut:最早一个正在执行的请求超时的时刻，没有时为None"""
+        if self.request_timeout is None:
+            return None
+        busy = [worker.since for worker in self.workers if worker.busy is not None and worker.ready]
+        return min(busy) + self.request_timeout if busy else None
+
+    def drain(self):
+        """处理已到达的回复，释放上次比赛遗留的worker及其结果"""
+        self.reap()
+        while True:
+            try:
+                reply = self._receive(block=False)
+            except queue.Empty:
+                return
+            if reply is not None and reply.get("mesh") is not None:
+                transport.release(reply["mesh"])
+
+    def race(self, rule, seeds, props=None, base=None, timeout=None):
+        """依次派发候选种子，OutPut:第一个status为FINISHED的回复（含seed），
+        全部失败或超时为None
+        """
+        self.start()
+        self.drain()
+        pending = list(seeds)
+        inflight = {}  # 请求id -> 种子
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        while True:
+            for worker in self.workers:
+                if pending and worker.busy is None and worker.alive:
+                    request_id = next(self._ids)
+                    seed = pending.pop(0)
+                    message = {
+                        "id": request_id,
+                        "rule": rule,
+                        "seed": seed,
+                        "props": props or {},
+                        "base": base,
+                    }
+                    if self._send(worker, message):
+                        worker.busy = request_id
+                        if worker.ready:
+                            worker.since = time.perf_counter()
+                        inflight[request_id] = seed
+                    else:
+                        pending.insert(0, seed)
+
+            # 没有进行中的候选：全部失败，或只剩上次比赛遗留的worker在忙
+            if not inflight and (not pending or not any(w.busy for w in self.workers)):
+                return None
+
+            wait = None
+            if deadline is not None:
+                wait = deadline - time.perf_counter()
+                if wait <= 0:
+                    self.reap(inflight)
+                    return None
+            # 最多等到下一个请求超时，超时的worker重启后其槽位继续派发
+            stuck = self.nextDeadline()
+            if stuck is not None:
+                until = max(0, stuck - time.perf_counter())
+                wait = until if wait is None else min(wait, until)
+            try:
+                reply = self._receive(timeout=wait)
+            except queue.Empty:
+                for request_id in self.reap():
+                    inflight.pop(request_id, None)
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.reap(inflight)
+                    return None
+                continue
+
+            if reply is None:
+                continue  # READY或已被替换的旧进程
+            seed = inflight.pop(reply.get("id"), None)
+            if seed is not None and reply.get("status") == "FINISHED":
+                reply["seed"] = seed
+                # 其余仍在运行的候选已无用，结束其worker
+                self.reap(inflight)
+                return reply
+            if reply.get("mesh") is not None:
+                transport.release(reply["mesh"])  # 上次比赛遗留的结果
+
+    def close(self):
+        for worker in self.workers:
+            if worker.alive:
+                try:
+                    worker.process.stdin.close()
+                except OSError:
+                    pass
+        for worker in self.workers:
+            try:
+                worker.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+            worker.reader.join(timeout=5)
+        self.workers = []
+
+        # 关闭前才到达的结果不再有人读取，删除其共享内存
+        while True:
+            try:
+                slot, process, reply = self.replies.get(block=False)
+            except queue.Empty:
+                break
+            if reply is not None and reply.get("mesh") is not None:
+                transport.release(reply["mesh"])
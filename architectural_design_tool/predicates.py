@@ -0,0 +1,137 @@
+"""几何谓词：有向包围盒(OBB)的相交与包含
+
+物体的OBB由局部包围盒和世界矩阵得到，表示为 (center, half)：
+    center  (3,) 世界坐标中心
+    half    (3,3) 三个半轴向量（按行），即世界矩阵线性部分乘以局部半边长
+世界矩阵含缩放或切变时半轴不必正交，以下判断对任意平行六面体都成立。
+
+相交用分离轴定理(SAT)：两个平行六面体不相交，当且仅当在
+    A的3个面法线、B的3个面法线、A与B的棱方向两两叉积(9个)
+中存在一个轴，两者在其上的投影区间不重叠。半轴为h_i时在单位轴L上的投影半径为 Σ|h_i·L|。
+包含检查候选的角点在外框半轴坐标系中的坐标是否都在[-1, 1]内。
+
+规则生成的盒子把旋转直接烘焙进顶点（物体本身无旋转），局部包围盒只是世界轴包围盒，
+因此fitOBB从顶点本身求轴：恰为长方体的8个顶点取其三条棱，其余网格取主成分轴与坐标轴中体积较小者。
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+EPS = 1e-9
+
+CORNER_SIGNS = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=np.float64)
+
+
+def obb(bounds, matrix):
+    """bounds为局部包围盒 [minx, miny, minz, maxx, maxy, maxz]，matrix为(4,4)世界矩阵
+
+    OutPut:(center, half)
+    """
+    bounds = np.asarray(bounds, dtype=np.float64)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    lo, hi = bounds[:3], bounds[3:]
+    center = matrix[:3, :3] @ ((lo + hi) / 2) + matrix[:3, 3]
+    half = (matrix[:3, :3] * ((hi - lo) / 2)).T
+    return center, half
+
+
+def pointsOBB(points, axes):
+    """points在axes（按行的单位正交基）方向上的包围盒，OutPut:(center, half)"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    local = points @ axes.T
+    lo, hi = local.min(axis=0), local.max(axis=0)
+    return (lo + hi) / 2 @ axes, axes * ((hi - lo) / 2)[:, None]
+
+
+def boxEdges(points, tol=1e-5):
+    """OutPut:(3,3) 8个点恰为长方体角点时从points[0]出发的三条棱（按行），否则为None
+
+    从一个角点到其余7个角点的向量中，只有三条棱两两正交；再检查每个点都是三条棱的0/1组合且互不相同
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) != 8:
+        return None
+    offsets = points[1:] - points[0]
+    lengths = np.linalg.norm(offsets, axis=1)
+    if lengths.min() <= tol * max(1.0, lengths.max()):
+        return None
+    units = offsets / lengths[:, None]
+    for triple in combinations(range(7), 3):
+        a, b, c = units[list(triple)]
+        if max(abs(a @ b), abs(b @ c), abs(a @ c)) > tol:
+            continue
+        edges = offsets[list(triple)]
+        coords = (points - points[0]) @ edges.T / (lengths[list(triple)] ** 2)
+        bits = np.rint(coords)
+        if np.abs(coords - bits).max() <= tol and ((bits == 0) | (bits == 1)).all():
+            if len(np.unique(bits, axis=0)) == 8:
+                return edges
+    return None
+
+
+def fitOBB(points):
+    """OutPut:(OBB, isBox)，isBox表示points恰为长方体的8个角点，此时OBB就是该长方体"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    edges = boxEdges(points)
+    if edges is not None:
+        return pointsOBB(points, edges / np.linalg.norm(edges, axis=1)[:, None]), True
+
+    best = pointsOBB(points, np.eye(3))
+    if len(points) > 3:
+        _, vectors = np.linalg.eigh(np.cov(points.T))
+        principal = pointsOBB(points, vectors.T)
+        if volume(principal) < volume(best) * (1 - 1e-6):
+            best = principal
+    return best, False
+
+
+def corners(box):
+    """OutPut:(8,3) 世界坐标角点"""
+    center, half = box
+    return center + CORNER_SIGNS @ half
+
+
+def volume(box):
+    return 8.0 * abs(float(np.linalg.det(box[1])))
+
+
+def _axes(a, b):
+    """OutPut:(K,3) 单位化的候选分离轴，去掉退化（长度接近0）的轴"""
+    ha, hb = a[1], b[1]
+    faces_a = np.cross(ha[[1, 2, 0]], ha[[2, 0, 1]])
+    faces_b = np.cross(hb[[1, 2, 0]], hb[[2, 0, 1]])
+    edges = np.cross(ha[:, None], hb[None]).reshape(-1, 3)
+    axes = np.vstack([faces_a, faces_b, edges])
+    length = np.linalg.norm(axes, axis=1)
+    keep = length > EPS * max(1.0, length.max())
+    return axes[keep] / length[keep, None]
+
+
+def intersects(a, b, eps=EPS):
+    """OutPut:两个OBB是否相交（实心，包含关系也算相交，贴合算相交）"""
+    axes = _axes(a, b)
+    if not len(axes):
+        # 两者都退化为线段或点，只比较中心
+        return bool(np.linalg.norm(a[0] - b[0]) <= eps)
+    distance = np.abs(axes @ (b[0] - a[0]))
+    radius_a = np.abs(a[1] @ axes.T).sum(axis=0)
+    radius_b = np.abs(b[1] @ axes.T).sum(axis=0)
+    return not bool((distance > radius_a + radius_b + eps).any())
+
+
+def containsPoints(box, points, eps=EPS):
+    """OutPut:每个点是否在OBB内（含边界）"""
+    center, half = box
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    # 退化（扁平）的外框用伪逆，再检查点是否确实落在外框所在的子空间内
+    inverse = np.linalg.pinv(half)
+    local = (points - center) @ inverse
+    residual = np.linalg.norm(local @ half - (points - center), axis=1)
+    scale = max(1.0, float(np.abs(half).max()))
+    return (np.abs(local).max(axis=1) <= 1 + eps) & (residual <= eps * scale)
+
+
+def contains(outer, inner, eps=EPS):
+    """OutPut:inner是否完全在outer内"""
+    return bool(containsPoints(outer, corners(inner), eps).all())
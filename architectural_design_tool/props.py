@@ -15,6 +15,20 @@ class ADTProps(bpy.types.PropertyGroup):
         name="Save Path", description="保存路径", default="", maxlen=1024, subtype='DIR_PATH'
     ) # pyright: ignore[reportInvalidTypeForm]
     
+    auto_saveformat: bpy.props.EnumProperty(
+        name="Save Format",
+        description="自动保存格式",
+        items=[
+            ("DATASET", "Dataset", "分片列式数据集(.npy，可内存映射)"),
+            ("BLEND", "Blend", "生成结束后保存一个.blend文件"),
+        ],
+        default="DATASET",
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    auto_shardsize: bpy.props.IntProperty(
+        name="Shard Size", description="数据集每个分片的模型数", default=1000, min=1, max=100000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
     auto_isorder: bpy.props.BoolProperty(
         name="Is Order", description="是否按序执行", default=True
         
@@ -31,6 +45,106 @@ class ADTProps(bpy.types.PropertyGroup):
         name="Culling Count", description="剔除执行次数", default=1, min=1, max=10
     ) # pyright: ignore[reportInvalidTypeForm]
     
+    auto_seed: bpy.props.IntProperty(
+        name="Seed", description="规则计划随机种子（0为随机）", default=0, min=0
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    auto_chunktime: bpy.props.FloatProperty(
+        name="Chunk Time", description="分块生成时每块最长时间(秒)", default=0.1, min=0.01, max=5
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    auto_isrunning: bpy.props.BoolProperty(
+        name="Is Running", description="分块生成是否正在运行", default=False
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    auto_progress: bpy.props.FloatProperty(
+        name="Progress", description="分块生成进度", default=0, min=0, max=1, subtype='FACTOR'
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    auto_progress_text: bpy.props.StringProperty(
+        name="Progress Text", description="分块生成进度描述", default=""
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    #LOD
+    lod_isenable: bpy.props.BoolProperty(
+        name="LOD", description="为展示的模型生成简化代理，默认显示代理", default=False
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    lod_resolution: bpy.props.IntProperty(
+        name="LOD Resolution", description="简化代理沿最长边的聚类格数", default=8, min=1, max=128
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    lod_default: bpy.props.EnumProperty(
+        name="LOD Default",
+        description="未选中且较远的模型显示的代理",
+        items=[
+            ("PROXY", "Proxy", "顶点聚类简化网格"),
+            ("BOX", "Box", "包围盒"),
+        ],
+        default="PROXY",
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    lod_distance: bpy.props.FloatProperty(
+        name="LOD Distance", description="距视图中心不超过该距离的模型显示原始网格", default=5, min=0
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    lod_isauto: bpy.props.BoolProperty(
+        name="Auto LOD", description="场景更新（如选择变化）时自动切换LOD，无需点击更新LOD", default=True
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    #去重
+    dedup_isenable: bpy.props.BoolProperty(
+        name="Dedup", description="按几何指纹剔除重复模型", default=False
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    dedup_tolerance: bpy.props.FloatProperty(
+        name="Dedup Tolerance", description="指纹容差（各特征最大差值）", default=0.02, min=0.0001, max=1
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    dedup_mode: bpy.props.EnumProperty(
+        name="Dedup Mode",
+        description="遇到重复模型时的处理方式",
+        items=[
+            ("SKIP", "Skip", "跳过重复模型"),
+            ("REGENERATE", "Regenerate", "重新抽取规则链生成"),
+        ],
+        default="REGENERATE",
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    dedup_retries: bpy.props.IntProperty(
+        name="Dedup Retries", description="重新生成的最大次数", default=3, min=0, max=100
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    #参数扫描
+    sweep_path: bpy.props.StringProperty(
+        name="Sweep Path", description="扫描配置文件(JSON)", default="", maxlen=1024, subtype='FILE_PATH'
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    sweep_workers: bpy.props.IntProperty(
+        name="Sweep Workers", description="后台进程数（1为当前会话内运行）", default=1, min=1, max=64
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    #结果浏览
+    browse_path: bpy.props.StringProperty(
+        name="Browse Path", description="数据集目录", default="", maxlen=1024, subtype='DIR_PATH'
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    browse_centerx: bpy.props.IntProperty(
+        name="Center X", description="窗口中心网格X", default=0
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    browse_centery: bpy.props.IntProperty(
+        name="Center Y", description="窗口中心网格Y", default=0
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    browse_radius: bpy.props.IntProperty(
+        name="Radius", description="窗口半径（格）", default=5, min=0, max=100
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    browse_spacing: bpy.props.FloatProperty(
+        name="Spacing", description="网格间距", default=3, min=0.1
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
     #全局变量
     max_attempts: bpy.props.IntProperty(
         name="Max Attempts", description="最大尝试次数", default=1000, min=1, max=100000
@@ -52,6 +166,121 @@ class ADTProps(bpy.types.PropertyGroup):
         name="Add Box Size", description="附加体比例", default=0.5, min=0, max=11
     ) # pyright: ignore[reportInvalidTypeForm]
     
+    sample_mode: bpy.props.EnumProperty(
+        name="Sample Mode",
+        description="附加体采样方式",
+        items=[
+            ("UNIFORM", "Uniform", "在最大生成位置内均匀采样"),
+            ("CONSTRAINED", "Constrained", "采样位置限定为与BaseBox包围盒相交"),
+            ("ADAPTIVE", "Adaptive", "接受率过低时自动切换为约束采样"),
+        ],
+        default="ADAPTIVE",
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    
+    #复杂度预算
+    budget_maxverts: bpy.props.IntProperty(
+        name="Max Verts", description="规则之间BaseBox的顶点预算（0为不限制）", default=0, min=0, max=10000000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    budget_angle: bpy.props.FloatProperty(
+        name="Dissolve Angle", description="有限融并角度", default=0.0872665, min=0, max=3.1415926, subtype='ANGLE'
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    budget_iscollapse: bpy.props.BoolProperty(
+        name="Collapse Fallback", description="融并后仍超出预算时用Decimate塌陷到预算内（会改变形状），关闭时该模型被中止", default=True
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    
+    #场地约束
+    site_isenable: bpy.props.BoolProperty(
+        name="Site Constraint", description="规则在创建网格前检查采样参数，丢弃超出场地的候选", default=False
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    site_polygon: bpy.props.StringProperty(
+        name="Site Polygon", description="场地水平轮廓（逆时针顶点的JSON，由“设置场地”写入）", default=""
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    site_base: bpy.props.FloatProperty(
+        name="Site Base", description="场地地面高度，限高由此起算", default=0
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    site_maxheight: bpy.props.FloatProperty(
+        name="Max Height", description="限高（0为不限制）", default=0, min=0, max=100000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    site_setback: bpy.props.FloatProperty(
+        name="Setback", description="建筑距场地边界的最小距离", default=0, min=0, max=100000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    
+    #单模型看门狗
+    watchdog_isenable: bpy.props.BoolProperty(
+        name="Watchdog", description="单个模型超出时间或顶点上限时中止并记为失败，继续生成下一个", default=True
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    watchdog_seconds: bpy.props.FloatProperty(
+        name="Model Timeout", description="单个模型的最长生成时间（秒），后台进程池中超时的worker会被重启", default=60, min=0.1, max=86400
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    watchdog_maxverts: bpy.props.IntProperty(
+        name="Model Max Verts", description="规则之间BaseBox的顶点上限，超出时中止该模型（0为不限制）", default=500000, min=0, max=100000000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    
+    #有效性检查
+    validity_isenable: bpy.props.BoolProperty(
+        name="Validity Check", description="每条规则后检查BaseBox（空网格、体积、流形），无效时从上一条规则的结果重试", default=True
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    validity_manifold: bpy.props.BoolProperty(
+        name="Require Manifold", description="要求网格闭合且每条边恰好属于两个面", default=True
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    validity_minvolume: bpy.props.FloatProperty(
+        name="Min Volume", description="体积下限，不大于该值视为退化", default=0.0001, min=0, max=1000000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    validity_retries: bpy.props.IntProperty(
+        name="Validity Retries", description="规则结果无效时的重试次数，用尽后中止该模型", default=2, min=0, max=100
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    
+    #度量筛选
+    filter_isenable: bpy.props.BoolProperty(
+        name="Metric Filter", description="按模型度量筛选，不满足条件的模型丢弃并记为跳过", default=False
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    filter_maxfootprint: bpy.props.FloatProperty(
+        name="Max Footprint", description="XY包围盒面积上限（0为不限制）", default=0, min=0, max=1000000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    filter_maxheight: bpy.props.FloatProperty(
+        name="Max Height", description="高度上限（0为不限制）", default=0, min=0, max=100000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    filter_mincompactness: bpy.props.FloatProperty(
+        name="Min Compactness", description="紧凑度36πV²/A³下限（球为1）", default=0, min=0, max=1
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    
+    #并行候选
+    pool_isenable: bpy.props.BoolProperty(
+        name="Parallel Candidates", description="Extract/Carve由常驻后台进程并行评估多个候选，取第一个成功的结果", default=False
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    pool_workers: bpy.props.IntProperty(
+        name="Pool Workers", description="常驻后台进程数", default=4, min=1, max=64
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    pool_candidates: bpy.props.IntProperty(
+        name="Candidates", description="每次点击预先生成的候选数", default=8, min=1, max=1000
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
+    pool_timeout: bpy.props.FloatProperty(
+        name="Pool Timeout", description="等待结果的最长时间（秒）", default=30, min=0.1, max=3600
+    ) # pyright: ignore[reportInvalidTypeForm]
+    
     
     #offset变量
     offset_minthick: bpy.props.FloatProperty(
@@ -80,7 +309,7 @@ class ADTProps(bpy.types.PropertyGroup):
         name="Max Angle", description="最大旋转角度", default=1.5707963, min=0, max=6.2831852
     ) # pyright: ignore[reportInvalidTypeForm]
     twist_cutinterval: bpy.props.FloatProperty(
-        name="Cut Interval", description="剪切间隔", default=0.05, min=0, max=1
+        name="Cut Interval", description="剪切间隔", default=0.05, min=0.001, max=1
     ) # pyright: ignore[reportInvalidTypeForm]
     
     #Frature变量
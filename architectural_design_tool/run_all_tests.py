@@ -25,6 +25,25 @@ try:
     import test_functions
     import test_operators
     import test_props_ui
+    import test_sweep
+    import test_planner
+    import test_fingerprint
+    import test_weld
+    import test_dataset
+    import test_lod
+    import test_directions
+    import test_lazy
+    import test_pool
+    import test_transport
+    import test_jobqueue
+    import test_validity
+    import test_metrics
+    import test_sitecheck
+    import test_predicates
+    import test_pipeline
+    import test_candidates
+    import test_rules
+    import test_automodal
 except ImportError as e:
     print(f"Warning: Could not import test modules: {e}")
     sys.exit(1)
@@ -99,6 +118,25 @@ class MasterTestRunner:
             (test_functions.run_all_tests, "Basic Functions"),
             (test_operators.run_all_operator_tests, "Operators"),
             (test_props_ui.run_all_props_ui_tests, "Properties and UI"),
+            (test_sweep.run_all_sweep_tests, "Sweep"),
+            (test_planner.run_all_planner_tests, "Planner"),
+            (test_fingerprint.run_all_fingerprint_tests, "Fingerprint"),
+            (test_weld.run_all_weld_tests, "Weld"),
+            (test_dataset.run_all_dataset_tests, "Dataset"),
+            (test_lod.run_all_lod_tests, "LOD"),
+            (test_directions.run_all_directions_tests, "Directions"),
+            (test_lazy.run_all_lazy_tests, "Lazy"),
+            (test_pool.run_all_pool_tests, "Pool"),
+            (test_transport.run_all_transport_tests, "Transport"),
+            (test_jobqueue.run_all_jobqueue_tests, "Job Queue"),
+            (test_validity.run_all_validity_tests, "Validity"),
+            (test_metrics.run_all_metrics_tests, "Metrics"),
+            (test_sitecheck.run_all_sitecheck_tests, "Site Check"),
+            (test_predicates.run_all_predicates_tests, "Predicates"),
+            (test_pipeline.run_all_pipeline_tests, "Auto Pipeline"),
+            (test_candidates.run_all_candidates_tests, "Parallel Candidates"),
+            (test_rules.run_all_rules_tests, "Rule Operators"),
+            (test_automodal.run_all_automodal_tests, "Auto Modal"),
         ]
         
         total_tests = 0
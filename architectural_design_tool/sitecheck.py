@@ -0,0 +1,183 @@
+"""场地约束：水平轮廓多边形、退线距离和限高
+
+规则在创建网格之前用采样到的参数解析地检查候选（方体的角点、盒子顶点、
+外扩后的包围盒），超出场地的候选直接丢弃，不做任何布尔运算。
+
+候选取其角点在XY平面上的凸包C，轮廓多边形为P（可为凹多边形），C位于P内且
+与P的边界保持退线距离s，当且仅当：
+    C的顶点都在P内；P的顶点都不在C内；C与P的边两两不相交且距离不小于s
+限高检查候选的最高点不超过 地面高度 + 限高。
+"""
+
+import json
+
+import numpy as np
+
+EPS = 1e-9
+
+
+def signedArea(polygon):
+    """OutPut:多边形有向面积，逆时针为正"""
+    x, y = np.asarray(polygon, dtype=np.float64).T
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def convexHull(points):
+    """OutPut:(K,2) 逆时针凸包顶点（Andrew单调链）"""
+    points = np.unique(np.asarray(points, dtype=np.float64).reshape(-1, 2), axis=0)
+    if len(points) < 3:
+        return points
+
+    def chain(sequence):
+        hull = []
+        for p in sequence:
+            while len(hull) >= 2 and _cross(hull[-2], hull[-1], p) <= EPS:
+                hull.pop()
+            hull.append(p)
+        return hull
+
+    lower = chain(points)
+    upper = chain(points[::-1])
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def footprint(verts, loop=None):
+    """由场地物体的世界坐标顶点得到逆时针轮廓
+
+    loop为单个面的顶点序号（按面的顺序）时使用该面的轮廓（可为凹多边形），否则取XY凸包
+    """
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    if loop is None:
+        return convexHull(verts[:, :2])
+    polygon = verts[list(loop), :2]
+    return polygon if signedArea(polygon) > 0 else polygon[::-1]
+
+
+def pointsInPolygon(points, polygon, boundary=True):
+    """OutPut:每个点是否在多边形内（射线法），boundary决定边界上的点是否算在内"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    a = np.asarray(polygon, dtype=np.float64)
+    b = np.roll(a, -1, axis=0)
+    px, py = points[:, 0, None], points[:, 1, None]
+
+    straddle = (a[:, 1] > py) != (b[:, 1] > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = a[:, 0] + (py - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+    inside = np.count_nonzero(straddle & (px < x), axis=1) % 2 == 1
+
+    on = pointSegmentDistance(points, a, b).min(axis=1) <= EPS
+    return inside | on if boundary else inside & ~on
+
+
+def pointSegmentDistance(points, a, b):
+    """OutPut:(点数, 线段数) 点到线段ab的距离"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 1, 2)
+    ab = b - a
+    length = np.einsum("ij,ij->i", ab, ab)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.einsum("pij,ij->pi", points - a, ab) / length
+    t = np.clip(np.nan_to_num(t), 0, 1)
+    closest = a + t[..., None] * ab
+    return np.linalg.norm(points - closest, axis=-1)
+
+
+def segmentsCross(a0, a1, b0, b1):
+    """OutPut:(A数, B数) 线段两两是否在内部相交（端点接触不算）"""
+    a0, a1 = a0[:, None], a1[:, None]
+    b0, b1 = b0[None], b1[None]
+
+    def orient(o, p, q):
+        return (p[..., 0] - o[..., 0]) * (q[..., 1] - o[..., 1]) - (p[..., 1] - o[..., 1]) * (
+            q[..., 0] - o[..., 0]
+        )
+
+    d1, d2 = orient(a0, a1, b0), orient(a0, a1, b1)
+    d3, d4 = orient(b0, b1, a0), orient(b0, b1, a1)
+    return (d1 * d2 < -EPS) & (d3 * d4 < -EPS)
+
+
+def edges(polygon):
+    """OutPut:(起点, 终点) 多边形各边"""
+    return polygon, np.roll(polygon, -1, axis=0)
+
+
+class Site:
+    """场地：polygon为(N,2)逆时针轮廓（None为不限制水平范围），maxheight为0时不限高"""
+
+    def __init__(self, polygon=None, base=0.0, maxheight=0.0, setback=0.0):
+        self.polygon = None if polygon is None or len(polygon) < 3 else np.asarray(polygon, dtype=np.float64)
+        self.base = base
+        self.maxheight = maxheight
+        self.setback = setback
+        # 场地约束拒绝的候选数
+        self.rejected = 0
+
+    @property
+    def region(self):
+        """OutPut:(minx, miny, maxx, maxy) 可放置范围（轮廓包围盒内缩退线距离），不限制时为None"""
+        if self.polygon is None:
+            return None
+        lo = self.polygon.min(axis=0) + self.setback
+        hi = self.polygon.max(axis=0) - self.setback
+        return lo[0], lo[1], max(lo[0], hi[0]), max(lo[1], hi[1])
+
+    def fitsPoints(self, points):
+        """OutPut:以points（凸体的顶点，世界坐标）为角点的候选是否在场地内"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        ok = self._fits(points)
+        if not ok:
+            self.rejected += 1
+        return ok
+
+    def _fits(self, points):
+        if self.maxheight > 0 and points[:, 2].max() > self.base + self.maxheight + EPS:
+            return False
+        if self.polygon is None:
+            return True
+
+        hull = convexHull(points[:, :2])
+        if not pointsInPolygon(hull, self.polygon).all():
+            return False
+
+        outline = edges(self.polygon)
+        if len(hull) >= 3:
+            # 凹多边形：轮廓的顶点不能伸入候选内部，边不能穿过候选
+            if pointsInPolygon(self.polygon, hull, boundary=False).any():
+                return False
+            if segmentsCross(*edges(hull), *outline).any():
+                return False
+            distance = min(
+                pointSegmentDistance(hull, *outline).min(),
+                pointSegmentDistance(self.polygon, *edges(hull)).min(),
+            )
+        else:
+            distance = pointSegmentDistance(hull, *outline).min()
+        return distance >= self.setback - EPS
+
+    def fitsBounds(self, bounds):
+        """bounds为包围盒 [minx, miny, minz, maxx, maxy, maxz]（与cachedBounds相同）"""
+        lo, hi = np.asarray(bounds[:3], dtype=np.float64), np.asarray(bounds[3:], dtype=np.float64)
+        corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+        return self.fitsPoints(corners)
+
+
+def encodePolygon(polygon):
+    """OutPut:轮廓的JSON字符串（存入ADTProps.site_polygon，可随参数快照传给worker）"""
+    return json.dumps(np.round(np.asarray(polygon, dtype=np.float64), 6).tolist())
+
+
+def decodePolygon(text):
+    if not text:
+        return None
+    return np.array(json.loads(text), dtype=np.float64).reshape(-1, 2)
+
+
+def fromProps(props):
+    """OutPut:ADTProps中启用的场地约束，未启用时为None"""
+    if not props.site_isenable:
+        return None
+    return Site(decodePolygon(props.site_polygon), props.site_base, props.site_maxheight, props.site_setback)
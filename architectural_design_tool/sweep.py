@@ -0,0 +1,103 @@
+"""参数扫描：把网格或列表形式的ADTProps覆盖展开为配置列表
+
+配置文件(JSON)格式:
+    {"base": {...}, "grid": {"min_size": [0.3, 0.5], "twist_maxangle": [0.5, 1.0]}}
+    {"base": {...}, "list": [{"min_size": 0.3}, {"min_size": 0.5, "max_size": 2}]}
+    [{"min_size": 0.3}, {"min_size": 0.5}]
+base 中的覆盖应用到每个配置；grid 按给定顺序做笛卡尔积。
+"""
+
+import itertools
+import json
+from datetime import datetime
+
+
+def loadSweep(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return expandSweep(json.load(f))
+
+
+def expandSweep(config):
+    """OutPut:覆盖字典列表"""
+    if isinstance(config, list):
+        return [dict(item) for item in config]
+
+    base = config.get("base", {})
+    configs = []
+
+    if "grid" in config:
+        keys = list(config["grid"].keys())
+        for values in itertools.product(*(config["grid"][key] for key in keys)):
+            item = dict(base)
+            item.update(zip(keys, values))
+            configs.append(item)
+
+    for overrides in config.get("list", []):
+        item = dict(base)
+        item.update(overrides)
+        configs.append(item)
+
+    if not configs and base:
+        configs.append(dict(base))
+
+    return configs
+
+
+def unknownKeys(props, configs):
+    """OutPut:配置中props不存在的参数名"""
+    unknown = set()
+    for overrides in configs:
+        for key in overrides:
+            if not hasattr(props, key):
+                unknown.add(key)
+    return sorted(unknown)
+
+
+def applyOverrides(props, overrides):
+    """应用参数覆盖，OutPut:原值（用于恢复）"""
+    old = {}
+    for key, value in overrides.items():
+        old[key] = getattr(props, key)
+        setattr(props, key, value)
+    return old
+
+
+def propsToDict(props):
+    """OutPut:ADTProps全部参数的快照（用于传给worker进程）"""
+    values = {}
+    for prop in props.bl_rna.properties:
+        key = prop.identifier
+        if key == "rna_type" or prop.type in {"POINTER", "COLLECTION"}:
+            continue
+        values[key] = getattr(props, key)
+    return values
+
+
+def splitShards(configs, count):
+    """按轮询把 (序号, 配置) 分给 count 个worker"""
+    shards = [[] for i in range(max(1, count))]
+    for index, overrides in enumerate(configs):
+        shards[index % len(shards)].append((index, overrides))
+    return [shard for shard in shards if shard]
+
+
+def newManifest(source):
+    return {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "configs": [],
+    }
+
+
+def mergeManifests(source, parts):
+    """合并多个worker的清单，按配置序号排序"""
+    manifest = newManifest(source)
+    for part in parts:
+        manifest["configs"].extend(part.get("configs", []))
+    manifest["configs"].sort(key=lambda entry: entry["config"])
+    return manifest
+
+
+def saveManifest(manifest, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
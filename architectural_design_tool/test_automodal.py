@@ -0,0 +1,153 @@
+"""
+Architectural Design Tool - Auto Modal Tests
+============================================
+
+Unit tests for the chunked AutoModal operator and Auto's error handling.
+operators is imported through the addon package against a bpy mock whose
+Operator base is a plain class; the AutoSession is a mock driven per test.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from mathutils import Vector, Matrix
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+# Mock the Blender modules before importing operators
+mock_bpy = Mock()
+mock_bpy.types.Operator = object
+mock_bpy.app.handlers.persistent = lambda function: function
+sys.modules['bpy'] = mock_bpy
+sys.modules['bmesh'] = Mock()
+sys.modules['mathutils'] = Mock()
+sys.modules['mathutils'].Vector = Vector
+sys.modules['mathutils'].Matrix = Matrix
+
+from test_support import addonModule
+
+operators = addonModule("operators")
+
+
+def makeSession(total=3, fail_at=None):
+    """AutoSession stand-in that generates total models, raising on model fail_at"""
+    session = Mock()
+    session.total = total
+    session.index = 0
+    session.done = False
+    session.progressText.return_value = ""
+    session.finish.return_value = ["报告"]
+
+    def step():
+        session.index += 1
+        session.done = session.index >= total
+        if session.index - 1 == fail_at:
+            raise RuntimeError("boolean failed")
+
+    session.step.side_effect = step
+    return session
+
+
+class ModalTestCase(unittest.TestCase):
+    """Base case: a context with a window manager and the Auto properties"""
+
+    def setUp(self):
+        self.context = Mock()
+        self.context.screen.areas = []
+        self.props = self.context.scene.adt_props
+        self.props.auto_chunktime = 10
+        self.props.auto_isrunning = False
+        self.timer = Mock(type="TIMER")
+
+    def start(self, session):
+        """Invoke AutoModal with the given session"""
+        operator = operators.AutoModal()
+        operator.resume = False
+        operator.report = Mock()
+        with patch.object(operators, "openSession", return_value=session):
+            self.assertEqual(operator.invoke(self.context, None), {"RUNNING_MODAL"})
+        self.assertTrue(self.props.auto_isrunning)
+        return operator
+
+
+class TestAutoModal(ModalTestCase):
+    """Test running, finishing and failing AutoModal"""
+
+    def test_runs_to_completion(self):
+        """Test that the timer drives the session to the end"""
+        session = makeSession()
+        operator = self.start(session)
+
+        self.assertEqual(operator.modal(self.context, self.timer), {"FINISHED"})
+        self.assertEqual(session.step.call_count, 3)
+        session.finish.assert_called_once()
+        self.assertFalse(self.props.auto_isrunning)
+
+    def test_error_stops_session(self):
+        """Test that an error in a rule tears down the timer, progress bar and session"""
+        session = makeSession(fail_at=1)
+        operator = self.start(session)
+
+        self.assertEqual(operator.modal(self.context, self.timer), {"CANCELLED"})
+        self.assertEqual(session.step.call_count, 2)
+        wm = self.context.window_manager
+        wm.event_timer_remove.assert_called_once_with(operator.timer)
+        wm.progress_end.assert_called_once()
+        session.finish.assert_called_once()
+        self.assertFalse(self.props.auto_isrunning)
+        level, message = operator.report.call_args.args
+        self.assertEqual(level, {"ERROR"})
+        self.assertIn("boolean failed", message)
+
+    def test_escape_keeps_results(self):
+        """Test that Esc cancels and finishes the session"""
+        session = makeSession()
+        operator = self.start(session)
+
+        self.assertEqual(operator.modal(self.context, Mock(type="ESC")), {"FINISHED"})
+        session.step.assert_not_called()
+        session.finish.assert_called_once()
+        self.assertFalse(self.props.auto_isrunning)
+
+
+class TestAuto(ModalTestCase):
+    """Test that Auto finishes its session when a model raises"""
+
+    def test_error_finishes_session(self):
+        """Test that results so far are written and the job queue is closed"""
+        session = makeSession(fail_at=0)
+        session.run.side_effect = lambda: session.step()
+        operator = operators.Auto()
+        operator.resume = False
+        operator.report = Mock()
+        with patch.object(operators, "openSession", return_value=session):
+            result = operator.execute(self.context)
+
+        self.assertEqual(result, {"CANCELLED"})
+        session.finish.assert_called_once()
+        self.assertEqual(operator.report.call_args.args[0], {"ERROR"})
+
+
+def run_all_automodal_tests():
+    """Run all Auto Modal test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestAutoModal,
+        TestAuto,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_automodal_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
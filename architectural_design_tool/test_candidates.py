@@ -0,0 +1,222 @@
+"""
+Architectural Design Tool - Parallel Candidate Tests
+====================================================
+
+Unit tests for runCandidates, which races a rule's candidate seeds on the
+worker pool and replaces BaseBox with the winner. operators is imported
+through the addon package against a bpy mock whose Operator base is a
+plain class, so the operator classes stay real; the pool, functions and
+transport modules are replaced per test.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import Mock, MagicMock, patch
+from mathutils import Vector, Matrix
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+# Mock the Blender modules before importing operators
+mock_bpy = Mock()
+mock_bpy.types.Operator = object
+mock_bpy.app.handlers.persistent = lambda function: function
+sys.modules['bpy'] = mock_bpy
+sys.modules['bmesh'] = Mock()
+sys.modules['mathutils'] = Mock()
+sys.modules['mathutils'].Vector = Vector
+sys.modules['mathutils'].Matrix = Matrix
+
+from test_support import addonModule
+
+operators = addonModule("operators")
+
+
+def makeProps(**overrides):
+    """Scene properties used by parallel candidates"""
+    props = Mock()
+    values = dict(
+        pool_isenable=True,
+        pool_workers=4,
+        pool_candidates=6,
+        pool_timeout=30,
+        watchdog_isenable=False,
+        watchdog_seconds=60,
+    )
+    values.update(overrides)
+    for key, value in values.items():
+        setattr(props, key, value)
+    return props
+
+
+class CandidateTestCase(unittest.TestCase):
+    """Base case: a scene holding BaseBox and mocked pool, functions and transport"""
+
+    def setUp(self):
+        self.base = Mock()
+        self.base.name = "BaseBox"
+        self.objects = {"BaseBox": self.base}
+        self.context = Mock()
+        self.context.scene.adt_props = makeProps()
+        self.context.scene.objects = MagicMock()
+        self.context.scene.objects.get.side_effect = self.objects.get
+        self.operator = Mock()
+
+        self.fun = Mock()
+        self.pool = Mock()
+        self.pool.race.return_value = {"id": 3, "status": "FINISHED", "seed": 42, "mesh": {"name": "reply"}}
+        self.block = MagicMock()
+        self.transport = Mock()
+        self.transport.receive.return_value = self.block
+        for name, value in (
+            ("fun", self.fun),
+            ("transport", self.transport),
+            ("sweep", Mock()),
+            ("candidatePool", Mock(return_value=self.pool)),
+        ):
+            patcher = patch.object(operators, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_candidates(self, rule="carve", needs_base=True):
+        return operators.runCandidates(self.operator, self.context, rule, needs_base)
+
+
+class TestRunCandidates(CandidateTestCase):
+    """Test racing candidates and installing the winner"""
+
+    def test_winner_replaces_basebox(self):
+        """Test that the winning mesh becomes the new BaseBox"""
+        result = self.run_candidates()
+
+        self.assertEqual(result, {"FINISHED"})
+        rule, seeds, props, base, timeout = self.pool.race.call_args.args
+        self.assertEqual(rule, "carve")
+        self.assertEqual(len(seeds), self.context.scene.adt_props.pool_candidates)
+        self.assertEqual(base, self.fun.shareMesh.return_value.descriptor)
+        self.assertEqual(timeout, self.context.scene.adt_props.pool_timeout)
+
+        self.fun.delobj.assert_called_once_with(self.base)
+        self.transport.receive.assert_called_once_with({"name": "reply"})
+        self.fun.meshFromShared.assert_called_once_with("BaseBox", self.block)
+        self.fun.linkMesh.assert_called_once_with("BaseBox", self.fun.meshFromShared.return_value, (0, 0, 0))
+        self.fun.setCachedBounds.assert_called_once_with(
+            self.fun.linkMesh.return_value, self.transport.meshBounds.return_value
+        )
+        self.block.unlink.assert_called_once()
+        self.assertIn("种子42", self.operator.report.call_args.args[1])
+
+    def test_shared_base_is_freed(self):
+        """Test that the BaseBox shared with the workers is deleted after the race"""
+        shared = self.fun.shareMesh.return_value
+        self.run_candidates()
+        shared.close.assert_called_once()
+        shared.unlink.assert_called_once()
+
+    def test_rule_without_base(self):
+        """Test that rules creating BaseBox from scratch share no mesh"""
+        self.objects.clear()
+        result = self.run_candidates("merge", needs_base=False)
+
+        self.assertEqual(result, {"FINISHED"})
+        self.fun.shareMesh.assert_not_called()
+        self.assertIsNone(self.pool.race.call_args.args[3])
+        self.fun.delobj.assert_not_called()
+
+    def test_no_winner_keeps_basebox(self):
+        """Test that BaseBox is untouched when every candidate fails"""
+        self.pool.race.return_value = None
+        result = self.run_candidates()
+
+        self.assertEqual(result, {"CANCELLED"})
+        self.fun.delobj.assert_not_called()
+        self.fun.linkMesh.assert_not_called()
+        self.assertEqual(self.operator.report.call_args.args[0], {"WARNING"})
+        self.fun.shareMesh.return_value.unlink.assert_called_once()
+
+    def test_missing_basebox(self):
+        """Test that rules needing BaseBox fail without racing"""
+        self.objects.clear()
+        result = self.run_candidates()
+
+        self.assertEqual(result, {"CANCELLED"})
+        self.pool.race.assert_not_called()
+        self.assertEqual(self.operator.report.call_args.args[0], {"ERROR"})
+
+    def test_worker_start_failure(self):
+        """Test that a pool that cannot start cancels the operator and frees the base"""
+        self.pool.race.side_effect = OSError("blender not found")
+        result = self.run_candidates()
+
+        self.assertEqual(result, {"CANCELLED"})
+        self.assertIn("blender not found", self.operator.report.call_args.args[1])
+        self.fun.shareMesh.return_value.unlink.assert_called_once()
+
+
+class TestCarveInvoke(CandidateTestCase):
+    """Test that a click on Carve is dispatched by the pool setting"""
+
+    def setUp(self):
+        super().setUp()
+        self.operator = operators.Carve()
+
+    def test_invoke_without_pool_runs_locally(self):
+        """Test that a click runs execute when parallel candidates are off"""
+        self.context.scene.adt_props.pool_isenable = False
+        with patch.object(operators.Carve, 'execute', return_value={"FINISHED"}) as mock_execute, \
+             patch.object(operators, 'runCandidates') as mock_run:
+            result = self.operator.invoke(self.context, None)
+
+        self.assertEqual(result, {"FINISHED"})
+        mock_execute.assert_called_once_with(self.context)
+        mock_run.assert_not_called()
+
+    def test_invoke_with_pool_races_candidates(self):
+        """Test that a click is handed to the worker pool when enabled"""
+        with patch.object(operators, 'runCandidates', return_value={"FINISHED"}) as mock_run:
+            result = self.operator.invoke(self.context, None)
+
+        self.assertEqual(result, {"FINISHED"})
+        mock_run.assert_called_once_with(self.operator, self.context, "carve", needs_base=True)
+
+
+class TestCandidatePool(unittest.TestCase):
+    """Test the shared pool's per-request timeout"""
+
+    def tearDown(self):
+        operators._candidatePool = None
+
+    def test_request_timeout_follows_watchdog(self):
+        """Test that the watchdog limit also bounds each candidate"""
+        with patch.object(operators, "pool") as mock_pool:
+            mock_pool.WorkerPool.return_value.size = 4
+            pool = operators.candidatePool(makeProps(watchdog_isenable=True, watchdog_seconds=5))
+            self.assertEqual(pool.request_timeout, 5)
+            pool = operators.candidatePool(makeProps())
+            self.assertIsNone(pool.request_timeout)
+            mock_pool.WorkerPool.assert_called_once()
+
+
+def run_all_candidates_tests():
+    """Run all parallel candidate test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestRunCandidates,
+        TestCarveInvoke,
+        TestCandidatePool,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_candidates_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
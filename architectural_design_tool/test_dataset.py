@@ -0,0 +1,192 @@
+"""
+Architectural Design Tool - Dataset Tests
+=========================================
+
+Unit tests for the sharded columnar dataset written by Auto.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import json
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+from test_support import addonModule
+
+dataset = addonModule("dataset")
+
+
+def makeModel(seed):
+    """Return a random small mesh (verts, faces)"""
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(4, 12))
+    verts = rng.random((count, 3))
+    faces = rng.integers(0, count, (count * 2, 3))
+    return verts, faces
+
+
+class TestDatasetWriter(unittest.TestCase):
+    """Test buffered shard writing"""
+    
+    def test_flushes_full_shards(self):
+        """Test that a shard is written every shard_size models"""
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = dataset.DatasetWriter(tmp, shard_size=3, params={"min_size": 0.5})
+            for i in range(7):
+                writer.add(*makeModel(i), [0, 3, 6], {"index": i})
+                if i == 2:
+                    self.assertEqual(len(writer.index["shards"]), 1)
+            writer.close()
+            
+            index = dataset.loadIndex(tmp)
+            self.assertEqual([s["models"] for s in index["shards"]], [3, 3, 1])
+            self.assertEqual(index["params"], {"min_size": 0.5})
+            self.assertEqual(writer.count, 7)
+    
+    def test_appends_to_existing_dataset(self):
+        """Test that a second writer continues the shard numbering"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with dataset.DatasetWriter(tmp, shard_size=2) as writer:
+                writer.add(*makeModel(0), [0])
+            with dataset.DatasetWriter(tmp, shard_size=2) as writer:
+                writer.add(*makeModel(1), [1])
+            
+            names = [s["name"] for s in dataset.loadIndex(tmp)["shards"]]
+            self.assertEqual(names, ["shard_00000", "shard_00001"])
+    
+    def test_appended_runs_keep_their_params(self):
+        """Test that a second run with other params does not inherit the first run's params"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with dataset.DatasetWriter(tmp, shard_size=2, params={"min_size": 0.5}) as writer:
+                writer.add(*makeModel(0), [0])
+            with dataset.DatasetWriter(tmp, shard_size=2, params={"min_size": 2.0}) as writer:
+                writer.add(*makeModel(1), [1])
+            # Resuming with the first run's params reuses its entry
+            with dataset.DatasetWriter(tmp, shard_size=2, params={"min_size": 0.5}) as writer:
+                writer.add(*makeModel(2), [2])
+            
+            index = dataset.loadIndex(tmp)
+            self.assertEqual(index["runs"], [{"min_size": 0.5}, {"min_size": 2.0}])
+            self.assertEqual([s["params"] for s in index["shards"]], [0, 1, 0])
+            
+            reader = dataset.DatasetReader(tmp)
+            self.assertEqual(reader.modelParams(0), {"min_size": 0.5})
+            self.assertEqual(reader.modelParams(1), {"min_size": 2.0})
+            self.assertEqual(reader.modelParams(2), {"min_size": 0.5})
+            self.assertEqual(reader.params, {"min_size": 0.5})
+    
+    def test_version_1_index_is_upgraded_on_append(self):
+        """Test appending to a dataset written before params were recorded per shard"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with dataset.DatasetWriter(tmp, shard_size=1, params={"min_size": 0.5}) as writer:
+                writer.add(*makeModel(0), [0])
+            index = dataset.loadIndex(tmp)
+            del index["runs"], index["shards"][0]["params"]
+            index["version"] = 1
+            with open(os.path.join(tmp, dataset.INDEX_NAME), "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            
+            self.assertEqual(dataset.DatasetReader(tmp).modelParams(0), {"min_size": 0.5})
+            with dataset.DatasetWriter(tmp, shard_size=1, params={"min_size": 1.0}) as writer:
+                writer.add(*makeModel(1), [1])
+            
+            reader = dataset.DatasetReader(tmp)
+            self.assertEqual(reader.modelParams(0), {"min_size": 0.5})
+            self.assertEqual(reader.modelParams(1), {"min_size": 1.0})
+
+
+class TestDatasetReader(unittest.TestCase):
+    """Test memory-mapped reading"""
+    
+    def test_round_trip(self):
+        """Test that models, chains and metadata read back unchanged"""
+        models = [makeModel(i) for i in range(5)]
+        chains = [[0, 3], [1, 4, 6], [2], [0, 5, 7], [1]]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            with dataset.DatasetWriter(tmp, shard_size=2) as writer:
+                for i, (verts, faces) in enumerate(models):
+                    writer.add(verts, faces, chains[i], {"name": f"m{i}"})
+            
+            reader = dataset.DatasetReader(tmp)
+            self.assertEqual(len(reader), 5)
+            for i, (verts, faces) in enumerate(models):
+                got_verts, got_faces = reader.model(i)
+                np.testing.assert_allclose(got_verts, verts.astype(np.float32))
+                np.testing.assert_array_equal(got_faces, faces)
+                np.testing.assert_array_equal(reader.chain(i), chains[i])
+                self.assertEqual(reader.meta(i)["name"], f"m{i}")
+    
+    def test_arrays_are_memory_mapped(self):
+        """Test that shard arrays are mapped rather than loaded"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with dataset.DatasetWriter(tmp) as writer:
+                writer.add(*makeModel(0), [0])
+            
+            reader = dataset.DatasetReader(tmp)
+            verts, faces = reader.model(0)
+            self.assertIsInstance(reader.shard(0)["verts"], np.memmap)
+            self.assertIsInstance(verts.base, np.memmap)
+            del verts, faces, reader
+    
+    def test_out_of_range(self):
+        """Test that invalid model indices raise IndexError"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with dataset.DatasetWriter(tmp) as writer:
+                writer.add(*makeModel(0), [0])
+            
+            reader = dataset.DatasetReader(tmp)
+            with self.assertRaises(IndexError):
+                reader.model(1)
+
+
+class TestBrowseWindow(unittest.TestCase):
+    """Test the setBoxPos grid window used when browsing results"""
+    
+    def test_spiralIndex_inverts_layout(self):
+        """Test the inverse of the 2D spiral layout on the first rings"""
+        # First ring of setBoxPos: bottom, right, top, left edges
+        ring = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0)]
+        xs, ys = zip(*ring)
+        
+        self.assertEqual(int(dataset.spiralIndex(0, 0)), 0)
+        np.testing.assert_array_equal(dataset.spiralIndex(xs, ys), np.arange(1, 9))
+        self.assertEqual(int(dataset.spiralIndex(-2, -2)), 9)
+    
+    def test_window_is_clipped_to_count(self):
+        """Test that the window keeps only existing models"""
+        ids, xs, ys = dataset.windowIndices(0, 0, 1, 5)
+        
+        self.assertEqual(sorted(ids.tolist()), [0, 1, 2, 3, 4])
+        np.testing.assert_array_equal(dataset.spiralIndex(xs, ys), ids)
+        
+        ids, xs, ys = dataset.windowIndices(10, 10, 2, 1000)
+        self.assertEqual(len(ids), 25)
+
+
+def run_all_dataset_tests():
+    """Run all dataset test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestDatasetWriter,
+        TestDatasetReader,
+        TestBrowseWindow,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_dataset_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
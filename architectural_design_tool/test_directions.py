@@ -0,0 +1,174 @@
+"""
+Architectural Design Tool - Directions Tests
+============================================
+
+Unit tests for the precomputed direction tables and batched sampling.
+"""
+
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import directions
+
+
+class TestDirectionTables(unittest.TestCase):
+    """Test direction codes and vector tables"""
+    
+    def test_codes_round_trip(self):
+        """Test that names and codes map onto the same vectors"""
+        for code, name in enumerate(directions.NAMES):
+            if name:
+                self.assertEqual(directions.code(name), code)
+            self.assertEqual(directions.code(code), code)
+        self.assertEqual(directions.code("invalid"), directions.NONE)
+        np.testing.assert_array_equal(directions.VECTORS[directions.code("-y")], [0, -1, 0])
+        np.testing.assert_array_equal(directions.VECTORS[directions.NONE], [0, 0, 0])
+    
+    def test_projectors_remove_axis(self):
+        """Test that each projector removes the component along its axis"""
+        for code in range(1, 7):
+            projected = directions.PROJECTORS[code] @ np.array([1.0, 2.0, 3.0])
+            self.assertAlmostEqual(projected @ directions.VECTORS[code], 0.0)
+
+
+class TestRandomVectors(unittest.TestCase):
+    """Test batched constrained sampling"""
+    
+    def test_unit_and_perpendicular(self):
+        """Test that samples are unit length and perpendicular to the constraint"""
+        for perp in ("+z", directions.PX, [1.0, 1.0, 0.0]):
+            with self.subTest(perp=perp):
+                vectors = directions.randomVectors(1000, perp, rng=0)
+                axis = np.asarray(
+                    directions.VECTORS[directions.code(perp)] if not isinstance(perp, list) else perp
+                )
+                axis = axis / np.linalg.norm(axis)
+                
+                self.assertEqual(vectors.shape, (1000, 3))
+                np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0)
+                np.testing.assert_allclose(vectors @ axis, 0.0, atol=1e-12)
+    
+    def test_seed_is_reproducible(self):
+        """Test that the same seed gives the same samples"""
+        np.testing.assert_array_equal(
+            directions.randomVectors(5, None, rng=3), directions.randomVectors(5, None, rng=3)
+        )
+
+
+class TestBoxVerts(unittest.TestCase):
+    """Test the matrix-based box builder"""
+    
+    def test_basis_is_rotation(self):
+        """Test that the basis is orthonormal and right-handed"""
+        matrix = directions.basisMatrix([0, 0, 1], [1, 1, 0.3])
+        
+        np.testing.assert_allclose(matrix.T @ matrix, np.eye(3), atol=1e-12)
+        self.assertAlmostEqual(np.linalg.det(matrix), 1.0)
+        np.testing.assert_allclose(matrix[:, 2], [0, 0, 1])
+    
+    def test_box_extents(self):
+        """Test box size along the right, stretch and up axes"""
+        verts = directions.boxVerts([0, 0, 1], [0, 1, 0], 2, 3, 4)
+        np.testing.assert_allclose(verts.min(axis=0), [-1, 0, -1.5])
+        np.testing.assert_allclose(verts.max(axis=0), [1, 4, 1.5])
+        
+        verts = directions.boxVerts([0, 0, 1], [0, 1, 0], 2, 3, 4, isCenter=True)
+        np.testing.assert_allclose(verts.min(axis=0), [-1, -4, -1.5])
+        np.testing.assert_allclose(verts.max(axis=0), [1, 4, 1.5])
+    
+    def test_quads_face_outward(self):
+        """Test that every box face winds outward"""
+        verts = directions.boxVerts([0, 1, 0], [1, 0, 1], 1, 2, 3, isCenter=True)
+        center = verts.mean(axis=0)
+        for quad in directions.BOX_QUADS:
+            a, b, c = verts[quad[:3]]
+            normal = np.cross(b - a, c - a)
+            self.assertGreater(normal @ (verts[quad].mean(axis=0) - center), 0)
+
+
+class TestLWall(unittest.TestCase):
+    """Test the analytic L-shaped wall outline and prism"""
+
+    @staticmethod
+    def _inside(poly, points):
+        # Even-odd point in polygon test
+        x, y = points[:, 0], points[:, 1]
+        inside = np.zeros(len(points), dtype=bool)
+        for (x0, y0), (x1, y1) in zip(poly, np.roll(poly, -1, axis=0)):
+            crosses = (y0 > y) != (y1 > y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                xcross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+            inside ^= crosses & (x < xcross)
+        return inside
+
+    def test_outline_matches_two_half_walls(self):
+        """Outline covers exactly the union of the two half walls"""
+        rng = np.random.default_rng(3)
+        width, length = 0.3, 2.0
+        for angle in (0.7, 1.5707963, 2.4, -1.1, 3.5):
+            d2 = np.array([np.cos(angle), np.sin(angle)])
+            r2 = np.array([-d2[1], d2[0]])
+            outline = directions.lWallOutline((1, 0), d2, width, length)
+            self.assertEqual(outline.shape, (8, 2))
+
+            points = rng.uniform(-3, 3, (4000, 2))
+            # Stay within the wall length, the ends lie slightly further out
+            points = points[np.linalg.norm(points, axis=1) < length]
+            wall1 = (points[:, 0] >= 0) & (np.abs(points[:, 1]) <= width / 2)
+            wall2 = (points @ d2 >= 0) & (np.abs(points @ r2) <= width / 2)
+            corner = (np.abs(points[:, 1]) <= width / 2) & (np.abs(points @ r2) <= width / 2)
+            expected = wall1 | wall2 | corner
+            np.testing.assert_array_equal(self._inside(outline, points), expected)
+
+    def test_parallel_directions(self):
+        """Parallel directions have no L outline"""
+        self.assertIsNone(directions.lWallOutline((1, 0), (1, 0), 0.2, 1.0))
+        self.assertIsNone(directions.lWallPrism((0, 0, 1), (1, 0, 0), (-1, 0, 0), 0.2, 1.0))
+
+    def test_prism_is_closed_and_outward(self):
+        """Every edge is shared by two faces and the volume is positive"""
+        verts, loops, starts = directions.lWallPrism((0, 0, 1), (1, 0, 0), (0.3, 1, 0), 0.2, 2.0)
+        self.assertEqual(verts.shape, (16, 3))
+        faces = np.split(loops, starts[1:])
+        self.assertEqual(len(faces), 10)
+
+        edges = set()
+        volume = 0.0
+        for face in faces:
+            for a, b in zip(face, np.roll(face, -1)):
+                edges.add((int(a), int(b)))
+            for k in range(1, len(face) - 1):
+                volume += np.dot(verts[face[0]], np.cross(verts[face[k]], verts[face[k + 1]])) / 6
+        self.assertTrue(all((b, a) in edges for a, b in edges))
+        self.assertGreater(volume, 0)
+        np.testing.assert_allclose(np.abs(verts[:, 2]), 2.0)
+
+
+def run_all_directions_tests():
+    """Run all direction test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestDirectionTables,
+        TestRandomVectors,
+        TestBoxVerts,
+        TestLWall,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_directions_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,131 @@
+"""
+Architectural Design Tool - Fingerprint Tests
+=============================================
+
+Unit tests for the rotation/translation-invariant geometric fingerprint and
+the in-memory dedup index.
+"""
+
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import fingerprint
+
+
+def makeBox(sx, sy, sz):
+    """Closed, outward-facing triangulated box"""
+    verts = np.array(
+        [[x, y, z] for x in (0, sx) for y in (0, sy) for z in (0, sz)], dtype=np.float64
+    )
+    tris = np.array([
+        (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5),
+        (0, 4, 5), (0, 5, 1), (2, 3, 7), (2, 7, 6),
+        (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),
+    ], dtype=np.int32)
+    return verts, tris
+
+
+def rotation(axis, angle):
+    """Rotation matrix around a unit axis"""
+    x, y, z = axis
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([
+        [c + x * x * (1 - c), x * y * (1 - c) - z * s, x * z * (1 - c) + y * s],
+        [y * x * (1 - c) + z * s, c + y * y * (1 - c), y * z * (1 - c) - x * s],
+        [z * x * (1 - c) - y * s, z * y * (1 - c) + x * s, c + z * z * (1 - c)],
+    ])
+
+
+class TestFingerprint(unittest.TestCase):
+    """Test fingerprint invariance and sensitivity"""
+    
+    def test_volume(self):
+        """Test signed volume of a closed box"""
+        verts, tris = makeBox(1, 2, 3)
+        self.assertAlmostEqual(fingerprint.signedVolume(verts, tris), 6.0)
+    
+    def test_rigid_motion_invariance(self):
+        """Test that rotation and translation do not change the fingerprint"""
+        verts, tris = makeBox(1, 2, 3)
+        axis = np.array([1.0, 2.0, 0.5])
+        moved = verts @ rotation(axis / np.linalg.norm(axis), 0.9).T + [4, -2, 7]
+        
+        a = fingerprint.fingerprint(verts, tris)
+        b = fingerprint.fingerprint(moved, tris)
+        np.testing.assert_allclose(a, b, atol=1e-9)
+    
+    def test_symmetric_shape_is_stable(self):
+        """Test that a cube fingerprint does not depend on its orientation"""
+        verts, tris = makeBox(1, 1, 1)
+        rotated = verts @ rotation((0, 0, 1), 0.3).T
+        
+        a = fingerprint.fingerprint(verts, tris)
+        b = fingerprint.fingerprint(rotated, tris)
+        np.testing.assert_allclose(a, b, atol=1e-9)
+    
+    def test_different_shapes_differ(self):
+        """Test that a different proportion changes the fingerprint"""
+        a = fingerprint.fingerprint(*makeBox(1, 2, 3))
+        b = fingerprint.fingerprint(*makeBox(1, 2, 3.5))
+        self.assertGreater(np.abs(a - b).max(), 0.02)
+    
+    def test_empty_mesh(self):
+        """Test that empty meshes have no fingerprint"""
+        verts = np.empty((0, 3))
+        tris = np.empty((0, 3), dtype=np.int32)
+        self.assertIsNone(fingerprint.fingerprint(verts, tris))
+
+
+class TestFingerprintIndex(unittest.TestCase):
+    """Test the streaming dedup index"""
+    
+    def test_rejects_duplicates_within_tolerance(self):
+        """Test near-identical shapes are rejected and counted"""
+        index = fingerprint.FingerprintIndex(tolerance=0.02)
+        verts, tris = makeBox(1, 2, 3)
+        
+        self.assertFalse(index.add(fingerprint.fingerprint(verts, tris)))
+        self.assertTrue(index.add(fingerprint.fingerprint(verts * 1.001 + 3, tris)))
+        self.assertEqual(index.count, 1)
+        self.assertEqual(index.rejected, 1)
+    
+    def test_keeps_distinct_shapes(self):
+        """Test distinct shapes are all kept"""
+        index = fingerprint.FingerprintIndex(tolerance=0.02)
+        for size in (1.0, 1.5, 2.0, 3.0):
+            self.assertFalse(index.add(fingerprint.fingerprint(*makeBox(1, 1, size))))
+        self.assertEqual(index.count, 4)
+    
+    def test_none_is_ignored(self):
+        """Test that missing fingerprints are never duplicates"""
+        index = fingerprint.FingerprintIndex()
+        self.assertFalse(index.add(None))
+        self.assertEqual(index.count, 0)
+
+
+def run_all_fingerprint_tests():
+    """Run all fingerprint test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestFingerprint,
+        TestFingerprintIndex,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_fingerprint_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -13,6 +13,7 @@ import unittest
 import sys
 import os
 import math
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from mathutils import Vector, Matrix
 
@@ -38,7 +39,33 @@ sys.modules['mathutils'] = mock_mathutils
 sys.modules['mathutils.bvhtree'] = mock_mathutils.bvhtree
 
 # Now import our functions after mocking
-import functions as fun
+from test_support import addonModule
+
+fun = addonModule("functions")
+predicates = addonModule("predicates")
+directions = addonModule("directions")
+
+
+class FakeVertices(list):
+    """Vertex collection supporting foreach_get like bpy_prop_collection"""
+    
+    def foreach_get(self, attr, out):
+        out[:] = [value for vertex in self for value in getattr(vertex, attr)]
+
+
+class FakeMesh(dict):
+    """Mesh data with ID properties (adt_rev) and foreach_get vertices"""
+    
+    def __init__(self, coords=(), polygons=()):
+        super().__init__()
+        self.vertices = FakeVertices(Mock(co=Vector(co)) for co in coords)
+        self.polygons = list(polygons)
+
+
+def boxObject(point, updir, stretchdir, width, height, depth, isCenter=False):
+    """Object holding the mesh crateBoxWithDir builds: the direction baked into the vertices"""
+    verts = fun.boxPoints(point, updir, stretchdir, width, height, depth, isCenter).astype(np.float32)
+    return Mock(data=FakeMesh(verts, directions.BOX_QUADS), matrix_world=Matrix.Identity(4))
 
 
 class TestBasicFunctions(unittest.TestCase):
@@ -97,6 +124,8 @@ class TestBasicFunctions(unittest.TestCase):
             ("-z", Vector((0, 0, -1))),
             ("invalid", Vector((0, 0, 0))),
             ("", Vector((0, 0, 0))),
+            (0, Vector((0, 0, 0))),
+            (3, Vector((0, 0, 1))),
         ]
         
         for direction, expected in test_cases:
@@ -225,29 +254,21 @@ class TestGeometricFunctions(unittest.TestCase):
         self.mock_obj.location = Vector((0, 0, 0))
     
     def test_getBound_with_mock_data(self):
-        """Test boundary box calculation with mock vertex data"""
-        # Create mock vertices at known positions
-        mock_vertices = [
-            Mock(co=Vector((-1, -1, -1))),
-            Mock(co=Vector((1, 1, 1))),
-            Mock(co=Vector((0, 0, 0))),
-        ]
-        self.mock_obj.data.vertices = mock_vertices
-        
-        maxx, maxy, maxz, minx, miny, minz = fun.getBound(self.mock_obj)
+        """Test boundary box order returned from the bounds cache"""
+        with patch.object(fun, 'cachedBounds', return_value=[-1, -2, -3, 1, 2, 3]):
+            maxx, maxy, maxz, minx, miny, minz = fun.getBound(self.mock_obj)
         
         self.assertEqual(maxx, 1)
-        self.assertEqual(maxy, 1)
-        self.assertEqual(maxz, 1)
+        self.assertEqual(maxy, 2)
+        self.assertEqual(maxz, 3)
         self.assertEqual(minx, -1)
-        self.assertEqual(miny, -1)
-        self.assertEqual(minz, -1)
+        self.assertEqual(miny, -2)
+        self.assertEqual(minz, -3)
     
     def test_getBound_empty_mesh(self):
         """Test boundary calculation with empty mesh"""
-        self.mock_obj.data.vertices = []
-        
-        maxx, maxy, maxz, minx, miny, minz = fun.getBound(self.mock_obj)
+        with patch.object(fun, 'cachedBounds', return_value=None):
+            maxx, maxy, maxz, minx, miny, minz = fun.getBound(self.mock_obj)
         
         # Should return default values for empty mesh
         self.assertEqual(maxx, -float('inf'))
@@ -260,22 +281,14 @@ class TestGeometricFunctions(unittest.TestCase):
     def test_centerPos(self):
         """Test center position calculation"""
         # Set up mock vertices around a center
-        mock_vertices = [
-            Mock(co=Vector((-2, -2, -2))),
-            Mock(co=Vector((2, 2, 2))),
-        ]
-        self.mock_obj.data.vertices = mock_vertices
+        self.mock_obj.data = FakeMesh([(-2, -2, -2), (2, 2, 2)])
         
         center = fun.centerPos(self.mock_obj)
         expected = Vector((0, 0, 0))
         self.assertEqual(center, expected)
         
         # Test with asymmetric vertices
-        mock_vertices = [
-            Mock(co=Vector((0, 0, 0))),
-            Mock(co=Vector((2, 2, 2))),
-        ]
-        self.mock_obj.data.vertices = mock_vertices
+        self.mock_obj.data = FakeMesh([(0, 0, 0), (2, 2, 2)])
         
         center = fun.centerPos(self.mock_obj)
         expected = Vector((1, 1, 1))
@@ -284,11 +297,7 @@ class TestGeometricFunctions(unittest.TestCase):
     def test_randomInsidePoint(self):
         """Test random point generation inside bounds"""
         # Set up bounding box
-        mock_vertices = [
-            Mock(co=Vector((-1, -2, -3))),
-            Mock(co=Vector((1, 2, 3))),
-        ]
-        self.mock_obj.data.vertices = mock_vertices
+        self.mock_obj.data = FakeMesh([(-1, -2, -3), (1, 2, 3)])
         
         # Generate multiple random points
         for _ in range(10):
@@ -356,62 +365,95 @@ class TestLogicalFunctions(unittest.TestCase):
         self.assertFalse(fun.isExists("Anything"))
         self.assertFalse(fun.isExists(""))
     
-    @patch('functions.BVHTree')
-    def test_isIntersect(self, mock_bvhtree):
-        """Test intersection detection"""
+    @patch.object(fun, 'cachedBVH')
+    def test_isIntersect(self, mock_cached_bvh):
+        """Test that overlapping non-box meshes fall back to the BVH test"""
         # Mock BVHTree overlap to return intersection
         mock_bvhtree_instance = Mock()
         mock_bvhtree_instance.overlap.return_value = [True]  # Non-empty list indicates intersection
-        mock_bvhtree.FromBMesh.return_value = mock_bvhtree_instance
-        
-        result = fun.isIntersect(self.mock_obj_a, self.mock_obj_b)
-        self.assertTrue(result)
-        
-        # Mock no intersection
-        mock_bvhtree_instance.overlap.return_value = []  # Empty list indicates no intersection
-        result = fun.isIntersect(self.mock_obj_a, self.mock_obj_b)
-        self.assertFalse(result)
+        mock_cached_bvh.return_value = mock_bvhtree_instance
+        
+        boxes = {
+            id(self.mock_obj_a): (predicates.obb([-1, -1, -1, 1, 1, 1], np.eye(4)), False),
+            id(self.mock_obj_b): (predicates.obb([0, 0, 0, 2, 2, 2], np.eye(4)), False),
+        }
+        with patch.object(fun, 'cachedOBB', side_effect=lambda obj: boxes[id(obj)]):
+            result = fun.isIntersect(self.mock_obj_a, self.mock_obj_b)
+            self.assertTrue(result)
+            
+            # Mock no intersection
+            mock_bvhtree_instance.overlap.return_value = []  # Empty list indicates no intersection
+            result = fun.isIntersect(self.mock_obj_a, self.mock_obj_b)
+            self.assertFalse(result)
+    
+    @patch.object(fun, 'cachedBVH')
+    def test_isIntersect_obb(self, mock_cached_bvh):
+        """Test that separated OBBs and pairs of boxes never build a BVH"""
+        fun.clearMeshCache()
+        diagonal = [1, 1, 0]
+        box_a = boxObject([0, 0, 0], [0, 0, 1], [0, 1, 0], 2, 2, 1, True)
+        # Long box along the diagonal: its world AABB overlaps box A, its faces do not
+        box_b = boxObject([3, 0, 0], [0, 0, 1], diagonal, 0.5, 2, 3, True)
+        self.assertTrue(fun.cachedOBB(box_b)[1])
+        self.assertFalse(fun.isIntersect(box_a, box_b))
+        
+        box_c = boxObject([1.6, 0, 0], [0, 0, 1], diagonal, 0.5, 2, 3, True)
+        self.assertTrue(fun.isIntersect(box_a, box_c))
+        mock_cached_bvh.assert_not_called()
+    
+    def test_worldOBB_follows_baked_direction(self):
+        """Test that a box built along a tilted direction gets its own axes, not the world AABB"""
+        fun.clearMeshCache()
+        updir = [0.2, -0.3, 1]
+        stretchdir = [1, 2, 0.5]
+        box = boxObject([1, 2, 3], updir, stretchdir, 0.5, 1, 4)
+        obb, isBox = fun.worldOBB(box)
+        
+        self.assertTrue(isBox)
+        self.assertAlmostEqual(predicates.volume(obb), 0.5 * 1 * 4, places=4)
+        expected = fun.boxPoints([1, 2, 3], updir, stretchdir, 0.5, 1, 4)
+        np.testing.assert_allclose(
+            np.sort(predicates.corners(obb), axis=0), np.sort(expected, axis=0), atol=1e-5
+        )
+    
+    def test_worldOBB_not_a_box(self):
+        """Test that eight vertices off a box's corners are not treated as an exact box"""
+        fun.clearMeshCache()
+        verts = fun.boxPoints([0, 0, 0], [0, 0, 1], [1, 1, 0], 1, 1, 2)
+        verts[7] += (0.3, 0, 0)
+        obj = Mock(data=FakeMesh(verts, directions.BOX_QUADS), matrix_world=Matrix.Identity(4))
+        obb, isBox = fun.worldOBB(obj)
+        
+        self.assertFalse(isBox)
+        self.assertTrue(predicates.containsPoints(obb, verts, eps=1e-6).all())
     
     def test_isInside_volume_comparison(self):
         """Test inside detection based on volume comparison"""
-        # Set up mock vertices for both objects
-        # Object A is larger (volume 8)
-        vertices_a = [Mock(co=Vector((-1, -1, -1))), Mock(co=Vector((1, 1, 1)))]
-        self.mock_obj_a.data.vertices = vertices_a
-        
-        # Object B is smaller (volume 1) and should be inside A
-        vertices_b = [Mock(co=Vector((-0.5, -0.5, -0.5))), Mock(co=Vector((0.5, 0.5, 0.5)))]
-        self.mock_obj_b.data.vertices = vertices_b
-        
-        # Mock matrix_world for coordinate transformation
-        self.mock_obj_a.matrix_world = Matrix.Identity(4)
-        self.mock_obj_b.matrix_world = Matrix.Identity(4)
-        
-        # Mock getBound to return realistic bounds
-        with patch('functions.getBound') as mock_get_bound:
-            # Object A bounds (larger)
-            mock_get_bound.return_value = (1, 1, 1, -1, -1, -1)
-            
-            # Test if B is inside A
-            vertices_b_transformed = [
-                self.mock_obj_b.matrix_world @ v.co for v in vertices_b
-            ]
-            
-            # Check that all vertices of B are within A's bounds
-            maxx, maxy, maxz, minx, miny, minz = (1, 1, 1, -1, -1, -1)
-            for co in vertices_b_transformed:
-                self.assertTrue(-1 <= co[0] <= 1)
-                self.assertTrue(-1 <= co[1] <= 1)
-                self.assertTrue(-1 <= co[2] <= 1)
+        # Object A is larger (volume 8), object B (volume 1) is inside A
+        boxes = {
+            id(self.mock_obj_a): (predicates.obb([-1, -1, -1, 1, 1, 1], np.eye(4)), True),
+            id(self.mock_obj_b): (predicates.obb([-0.5, -0.5, -0.5, 0.5, 0.5, 0.5], np.eye(4)), True),
+        }
+        with patch.object(fun, 'cachedOBB', side_effect=lambda obj: boxes[id(obj)]):
+            self.assertEqual(fun.isInside(self.mock_obj_a, self.mock_obj_b), (True, "boxA"))
+            self.assertEqual(fun.isInside(self.mock_obj_b, self.mock_obj_a), (True, "boxB"))
+    
+    def test_isInside_baked_direction(self):
+        """Test that a box built along the diagonal only contains what fits inside it"""
+        fun.clearMeshCache()
+        outer = boxObject([0, 0, 0], [0, 0, 1], [1, 1, 0], 2, 2, 2, True)
+        # Fits in the world AABB of the outer box but sticks out of its diagonal faces
+        inner = boxObject([1.5, 0, 0], [0, 0, 1], [0, 1, 0], 0.4, 0.4, 0.2, True)
+        self.assertEqual(fun.isInside(outer, inner), (False, "boxA"))
+        
+        inner = boxObject([0, 0, 0], [0, 0, 1], [1, 1, 0], 1, 1, 1, True)
+        self.assertEqual(fun.isInside(outer, inner), (True, "boxA"))
     
     def test_isPointinside(self):
         """Test point inside object detection"""
         # Set up mock object bounds
-        mock_vertices = [
-            Mock(co=Vector((-1, -2, -3))),
-            Mock(co=Vector((1, 2, 3))),
-        ]
-        self.mock_obj_a.data.vertices = mock_vertices
+        self.mock_obj_a.data = FakeMesh([(-1, -2, -3), (1, 2, 3)])
+        self.mock_obj_a.matrix_world = Matrix.Identity(4)
         
         # Test point inside bounds
         inside_point = Vector((0, 0, 0))
@@ -426,6 +468,105 @@ class TestLogicalFunctions(unittest.TestCase):
         self.assertFalse(fun.isPontoutside(outside_point, self.mock_obj_a))
 
 
+class TestSampling(unittest.TestCase):
+    """Test rejection sampling and its statistics"""
+    
+    def setUp(self):
+        """Reset sampler statistics"""
+        fun.resetSampleStats()
+        self.base = Mock()
+        self.base.data = FakeMesh([(-1, -1, -1), (1, 1, 1)])
+        self.base.matrix_world = Matrix.Identity(4)
+    
+    def test_sample_rate_without_records(self):
+        """Test that unseen rules report a neutral acceptance rate"""
+        self.assertEqual(fun.sampleRate("merge"), 1.0)
+        self.assertEqual(fun.sampleReport(), [])
+    
+    def test_record_and_report(self):
+        """Test acceptance rate bookkeeping per proposal"""
+        fun.recordSample("carve", "uniform", 3, False)
+        fun.recordSample("carve", "uniform", 1, True)
+        fun.recordSample("carve", "constrained", 1, True)
+        fun.recordFailure("carve")
+        
+        self.assertAlmostEqual(fun.sampleRate("carve", "uniform"), 0.25)
+        self.assertAlmostEqual(fun.sampleRate("carve", "constrained"), 1.0)
+        self.assertAlmostEqual(fun.sampleRate("carve"), 0.4)
+        
+        report = fun.sampleReport()
+        self.assertEqual(len(report), 1)
+        self.assertTrue(report[0].startswith("carve"))
+    
+    def test_sampleAddBox_rejects_contained(self):
+        """Test that contained candidates are rejected until the budget runs out"""
+        with patch.object(fun, 'randomCube') as mock_cube, \
+             patch.object(fun, 'isIntersect', return_value=True), \
+             patch.object(fun, 'isInside', return_value=(True, "boxA")), \
+             patch.object(fun, 'delobj') as mock_del, \
+             patch.object(fun, 'setActive'):
+            box, attempts = fun.sampleAddBox("merge", self.base, 0.1, 0.2, 1, 5, "UNIFORM")
+        
+        self.assertIsNone(box)
+        self.assertEqual(attempts, 5)
+        self.assertEqual(mock_cube.call_count, 5)
+        self.assertEqual(mock_del.call_count, 5)
+        self.assertEqual(fun.sampleStats["merge"]["failed"], 1)
+    
+    def test_sampleAddBox_adaptive_switches(self):
+        """Test that ADAPTIVE switches to the constrained proposal after repeated misses"""
+        candidates = [False] * fun.ADAPTIVE_SWITCH_ATTEMPTS + [True]
+        with patch.object(fun, 'randomCube') as mock_cube, \
+             patch.object(fun, 'randomCubeNear') as mock_near, \
+             patch.object(fun, 'isIntersect', side_effect=candidates), \
+             patch.object(fun, 'isInside', return_value=(False, "boxA")), \
+             patch.object(fun, 'delobj'), \
+             patch.object(fun, 'setActive'):
+            box, attempts = fun.sampleAddBox("extract", self.base, 0.1, 0.2, 1, 100, "ADAPTIVE")
+        
+        self.assertIs(box, mock_near.return_value)
+        self.assertEqual(attempts, fun.ADAPTIVE_SWITCH_ATTEMPTS + 1)
+        self.assertEqual(mock_cube.call_count, fun.ADAPTIVE_SWITCH_ATTEMPTS)
+        self.assertEqual(fun.sampleStats["extract"]["constrained"], [1, 1])
+    
+    def test_sampleAddBox_adaptive_recovers(self):
+        """Test that ADAPTIVE retries the uniform proposal and returns to it once it is accepted again"""
+        # An earlier BaseBox on which uniform proposals almost never hit
+        fun.recordSample("extract", "uniform", 200, False)
+        self.assertLess(fun.recentRate("extract"), fun.ADAPTIVE_MIN_RATE)
+        
+        with patch.object(fun, 'randomCube') as mock_cube, \
+             patch.object(fun, 'randomCubeNear') as mock_near, \
+             patch.object(fun, 'isIntersect', return_value=True), \
+             patch.object(fun, 'isInside', return_value=(False, "boxA")), \
+             patch.object(fun, 'delobj'), \
+             patch.object(fun, 'setActive'):
+            for _ in range(fun.ADAPTIVE_PROBE_INTERVAL - 1):
+                box, attempts = fun.sampleAddBox("extract", self.base, 0.1, 0.2, 1, 100, "ADAPTIVE")
+                self.assertIs(box, mock_near.return_value)
+            mock_cube.assert_not_called()
+            
+            # The periodic uniform probe is accepted, so later samples stay uniform
+            for _ in range(3):
+                box, attempts = fun.sampleAddBox("extract", self.base, 0.1, 0.2, 1, 100, "ADAPTIVE")
+                self.assertIs(box, mock_cube.return_value)
+        
+        self.assertGreaterEqual(fun.recentRate("extract"), fun.ADAPTIVE_MIN_RATE)
+        # The cumulative rate in the report is still dominated by the old misses
+        self.assertLess(fun.sampleRate("extract", "uniform"), fun.ADAPTIVE_MIN_RATE)
+    
+    def test_randomCubeNear_straddles_bounds(self):
+        """Test that constrained proposals always overlap the base bounds"""
+        for _ in range(20):
+            fun.randomCubeNear(self.base, 0.2, 0.4)
+            kwargs = mock_bpy.ops.mesh.primitive_cube_add.call_args[1]
+            pos = kwargs["location"]
+            size = kwargs["scale"]
+            for i in range(3):
+                self.assertLessEqual(pos[i] - size[i] / 2, 1)
+                self.assertGreaterEqual(pos[i] + size[i] / 2, -1)
+
+
 class TestObjectManipulation(unittest.TestCase):
     """Test object manipulation functions"""
     
@@ -449,7 +590,7 @@ class TestObjectManipulation(unittest.TestCase):
         # Verify that the active object was set
         mock_bpy.context.view_layer.objects.active = self.mock_obj
     
-    @patch('functions.copyobj')
+    @patch.object(fun, 'copyobj')
     def test_copyobj(self, mock_copy):
         """Test object copying"""
         mock_copy.return_value = Mock()
@@ -463,10 +604,153 @@ class TestObjectManipulation(unittest.TestCase):
         fun.delobj(self.mock_obj)
         mock_bpy.data.objects.remove.assert_called_once_with(self.mock_obj)
     
+    def test_cutLineWithDir_zero_interval(self):
+        """Test that a zero cut interval is clamped instead of dividing by zero"""
+        obj = MagicMock()
+        obj.matrix_world = Matrix.Identity(4)
+        mock_bmesh.ops.bisect_plane.reset_mock()
+        with patch.object(fun, 'getBound', return_value=(0.1, 1, 1, 0, 0, 0)), \
+                patch.object(mock_bmesh, 'new', return_value=MagicMock()):
+            fun.cutLineWithDir(obj, "+x", 0)
+        
+        expected = int(0.1 / fun.MIN_CUT_INTERVAL)
+        self.assertAlmostEqual(mock_bmesh.ops.bisect_plane.call_count, expected, delta=1)
+    
+    def test_limitComplexity_within_budget(self):
+        """Test that meshes inside the vertex budget are left untouched"""
+        self.mock_obj.data.vertices = [Mock()] * 10
+        mock_bmesh.new.reset_mock()
+        
+        self.assertEqual(fun.limitComplexity(self.mock_obj, 100), (10, 10))
+        self.assertEqual(fun.limitComplexity(self.mock_obj, 0), (10, 10))
+        mock_bmesh.new.assert_not_called()
+    
+    def test_limitComplexity_collapses_by_default(self):
+        """Test that Decimate brings the mesh into the budget unless the collapse fallback is off"""
+        obj = MagicMock()
+        obj.data.vertices = [Mock()] * 10
+        with patch.object(mock_bmesh, 'new', return_value=MagicMock()), \
+                patch.object(fun, 'applyMod') as mock_apply:
+            self.assertEqual(fun.limitComplexity(obj, 5, collapse=False), (10, 10))
+            obj.modifiers.new.assert_not_called()
+            
+            # Decimate only approximately reaches the ratio: 10 -> 6 -> 5
+            remaining = iter((6, 5))
+            mock_apply.side_effect = lambda o, name: setattr(o.data, "vertices", [Mock()] * next(remaining))
+            self.assertEqual(fun.limitComplexity(obj, 5), (10, 5))
+            self.assertEqual(obj.modifiers.new.call_count, 2)
+            obj.modifiers.new.assert_called_with(name="Decimate", type="DECIMATE")
+            self.assertAlmostEqual(obj.modifiers.new.return_value.ratio, 5 / 6)
+            mock_apply.assert_called_with(obj, "Decimate")
+    
+    def test_optimizeMesh_accepts_list_without_mode_switch(self):
+        """Test that optimizeMesh welds every object in object mode"""
+        objs = [MagicMock(), MagicMock()]
+        objs[0].get.return_value = None
+        objs[1].get.return_value = [0, 0, 0, 1, 1, 1]
+        
+        with patch.object(fun, 'weldMesh') as mock_weld, \
+             patch.object(fun, 'dirtyVertices', side_effect=[None, [4, 5]]):
+            result = fun.optimizeMesh(objs, 0.01)
+        
+        self.assertIs(result, objs)
+        mock_weld.assert_any_call(objs[0], 0.01, None, None)
+        mock_weld.assert_any_call(objs[1], 0.01, [0, 0, 0, 1, 1, 1], [4, 5])
+        objs[1].__delitem__.assert_called_once_with("adt_seam")
+        mock_bpy.ops.object.mode_set.assert_not_called()
+    
+    def test_unionBounds(self):
+        """Test bounding box union used for the boolean seam region"""
+        self.assertIsNone(fun.unionBounds(None, None))
+        self.assertEqual(fun.unionBounds(None, [0, 0, 0, 1, 1, 1]), [0, 0, 0, 1, 1, 1])
+        self.assertEqual(
+            fun.unionBounds([0, 0, 0, 1, 1, 1], [-1, 0.5, 0, 0.5, 2, 1]),
+            [-1, 0, 0, 1, 2, 1],
+        )
+    
+    def test_updatedBounds(self):
+        """Test incremental bounds update after a boolean"""
+        base = [0, 0, 0, 4, 4, 4]
+        
+        self.assertEqual(fun.updatedBounds(base, [3, 1, 1, 6, 2, 2], "add"), [0, 0, 0, 6, 4, 4])
+        # A corner cut strictly inside the bounds keeps them
+        self.assertEqual(fun.updatedBounds(base, [1, 1, 1, 2, 2, 2], "sub"), base)
+        # A cut reaching the +x side needs a recompute
+        self.assertIsNone(fun.updatedBounds(base, [3, 1, 1, 5, 2, 2], "sub"))
+        self.assertIsNone(fun.updatedBounds(base, [1, 1, 1, 2, 2, 2], "mul"))
+    
+    def test_clipPlanes_only_oversized_sides(self):
+        """Test that only the sides reaching past the margin get a clip plane"""
+        base = [0, 0, 0, 1, 1, 1]
+        self.assertEqual(fun.clipPlanes([0.2, 0.2, 0.2, 0.8, 0.8, 0.8], base, 0.1), [])
+        
+        planes = fun.clipPlanes([-50, 0.2, 0.2, 50, 0.8, 1.05], base, 0.1)
+        self.assertEqual(
+            planes,
+            [((-0.1, 0.0, 0.0), (-1.0, 0.0, 0.0)), ((1.1, 0.0, 0.0), (1.0, 0.0, 0.0))],
+        )
+    
+    def test_clipMargin_scales_with_base(self):
+        """Test that the clip margin follows the base size"""
+        self.assertAlmostEqual(
+            fun.clipMargin([0, 0, 0, 2, 1, 1]), 2 * fun.CLIP_MARGIN_RATIO + fun.CLIP_MARGIN_MIN
+        )
+    
+    def test_calBool_clips_only_sub_and_mul(self):
+        """Test that union cutters are never clipped"""
+        base = MagicMock()
+        base.get.return_value = None
+        cutter = MagicMock()
+        cutter.get.return_value = None
+        with patch.object(fun, 'cachedBounds', return_value=[0, 0, 0, 1, 1, 1]), \
+             patch.object(fun, 'clipCutter', return_value=[0, 0, 0, 1, 1, 1]) as mock_clip, \
+             patch.object(fun, 'markDirty'), patch.object(fun, 'applyMod'), \
+             patch.object(fun, 'delobj'), patch.object(fun, 'setCachedBounds'):
+            fun.calBool(base, cutter, "add")
+            mock_clip.assert_not_called()
+            fun.calBool(base, cutter, "sub")
+            fun.calBool(base, cutter, "mul")
+            self.assertEqual(mock_clip.call_count, 2)
+    
+    def test_cachedBounds_reuses_until_touched(self):
+        """Test that bounds are computed once per mesh revision and placement"""
+        obj = Mock()
+        obj.data = FakeMesh()
+        obj.matrix_world = Matrix.Identity(4)
+        fun.clearMeshCache()
+        
+        with patch.object(fun, 'worldBounds', return_value=[0, 0, 0, 1, 1, 1]) as mock_bounds:
+            fun.cachedBounds(obj)
+            fun.cachedBounds(obj)
+            self.assertEqual(mock_bounds.call_count, 1)
+            
+            fun.touchMesh(obj)
+            fun.cachedBounds(obj)
+            self.assertEqual(mock_bounds.call_count, 2)
+            
+            obj.matrix_world = Matrix.Translation((1, 0, 0))
+            fun.cachedBounds(obj)
+            self.assertEqual(mock_bounds.call_count, 3)
+    
+    def test_revisions_from_other_sessions_do_not_collide(self):
+        """Test that a revision saved by another process never matches a fresh one"""
+        fresh = Mock(data=FakeMesh(), matrix_world=Matrix.Identity(4))
+        rev = fun.touchMesh(fresh)
+        
+        # A mesh loaded from a .blend written by an earlier session with the same counter value
+        loaded = Mock(data=FakeMesh(), matrix_world=Matrix.Identity(4))
+        loaded.data["adt_rev"] = "0" * 12 + ":" + rev.split(":")[1]
+        self.assertNotEqual(loaded.data["adt_rev"], rev)
+        
+        fun.clearMeshCache()
+        with patch.object(fun, 'worldBounds', side_effect=[[0, 0, 0, 1, 1, 1], [0, 0, 0, 5, 5, 5]]):
+            self.assertEqual(fun.cachedBounds(fresh), [0, 0, 0, 1, 1, 1])
+            self.assertEqual(fun.cachedBounds(loaded), [0, 0, 0, 5, 5, 5])
+    
     def test_snapGround(self):
         """Test snapping object to ground"""
         # Mock getBound to return bounds where object is above ground
-        with patch('functions.getBound') as mock_get_bound:
+        with patch.object(fun, 'getBound') as mock_get_bound:
             mock_get_bound.return_value = (1, 1, 2, -1, -1, 0.5)  # minz = 0.5
             
             # Initial location
@@ -480,7 +764,7 @@ class TestObjectManipulation(unittest.TestCase):
     
     def test_snapGround_already_on_ground(self):
         """Test snapping when object is already on ground"""
-        with patch('functions.getBound') as mock_get_bound:
+        with patch.object(fun, 'getBound') as mock_get_bound:
             mock_get_bound.return_value = (1, 1, 0, -1, -1, -1)  # minz = -1
             
             # Initial location
@@ -584,6 +868,7 @@ def run_all_tests():
         TestSetBoxPos,
         TestGeometricFunctions,
         TestLogicalFunctions,
+        TestSampling,
         TestObjectManipulation,
         TestEdgeCases,
         TestPerformance,
@@ -0,0 +1,199 @@
+"""
+Architectural Design Tool - Job Queue Tests
+===========================================
+
+Unit tests for the SQLite job queue that lets an interrupted Auto run
+resume from the last finished model.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import jobqueue
+from test_support import addonModule
+
+dataset = addonModule("dataset")
+DatasetWriter, storedIndices = dataset.DatasetWriter, dataset.storedIndices
+
+
+def model(i):
+    verts = np.full((3, 3), i, dtype=np.float32)
+    faces = np.array([[0, 1, 2]], dtype=np.int32)
+    return verts, faces, {"index": i, "name": f"{i}_merge"}
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test job states, seeds and stored results"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = jobqueue.queuePath(self.tmp.name, "c0_")
+        self.plan = np.array([[0, 3, 6], [1, 4, 6], [2, 3, 7]], dtype=np.uint8)
+        self.queue = jobqueue.JobQueue.create(self.path, self.plan, 42, {"auto_count": 3})
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def reopen(self):
+        self.queue.close()
+        self.queue = jobqueue.JobQueue.open(self.path)
+
+    def test_queue_path(self):
+        """Test that the queue lives in the save folder with the run prefix"""
+        self.assertEqual(os.path.basename(self.path), "c0_jobs.sqlite")
+
+    def test_create_and_reopen(self):
+        """Test that seed, params and plan survive reopening"""
+        run = self.queue.run
+        self.reopen()
+        self.assertEqual(self.queue.seed, 42)
+        self.assertEqual(self.queue.params, {"auto_count": 3})
+        self.assertEqual(self.queue.run, run)
+        self.assertEqual(len(self.queue), 3)
+        np.testing.assert_array_equal(self.queue.plan(), self.plan)
+        self.assertEqual(self.queue.pending(), [0, 1, 2])
+
+    def test_create_replaces_previous_run(self):
+        """Test that a new run starts from an empty queue"""
+        self.queue.start(0)
+        self.queue.finish(0, jobqueue.DONE, self.plan[0], model(0))
+        run = self.queue.run
+        self.queue.close()
+
+        self.queue = jobqueue.JobQueue.create(self.path, self.plan[:2], 7)
+        self.assertNotEqual(self.queue.run, run)
+        self.assertEqual(self.queue.pending(), [0, 1])
+        self.assertEqual(self.queue.results(), [])
+
+    def test_open_missing(self):
+        """Test that resuming without a queue fails clearly"""
+        with self.assertRaises(FileNotFoundError):
+            jobqueue.JobQueue.open(os.path.join(self.tmp.name, "jobs.sqlite"))
+
+    def test_model_seeds(self):
+        """Test that every model gets its own reproducible seed"""
+        seeds = [jobqueue.modelSeed(42, i) for i in range(3)]
+        self.assertEqual(len(set(seeds)), 3)
+        self.assertEqual(seeds, [jobqueue.modelSeed(42, i) for i in range(3)])
+        self.assertNotEqual(seeds[0], jobqueue.modelSeed(43, 0))
+        self.assertEqual([self.queue.seedOf(i) for i in range(3)], seeds)
+
+    def test_finish_updates_status_and_chain(self):
+        """Test that finished models leave the pending list with their final chain"""
+        regenerated = np.array([2, 5, 6], dtype=np.uint8)
+        self.queue.start(1)
+        self.queue.finish(1, jobqueue.DONE, regenerated, model(1), seconds=0.5)
+        self.queue.start(2)
+        self.queue.finish(2, jobqueue.SKIPPED, self.plan[2])
+
+        self.reopen()
+        self.assertEqual(self.queue.pending(), [0])
+        np.testing.assert_array_equal(self.queue.plan()[1], regenerated)
+        counts = self.queue.counts()
+        self.assertEqual(counts[jobqueue.DONE], 1)
+        self.assertEqual(counts[jobqueue.SKIPPED], 1)
+        self.assertEqual(counts[jobqueue.PENDING], 1)
+
+    def test_recover_marks_interrupted_models_failed(self):
+        """Test that a model running at crash time is failed with its seed"""
+        self.queue.start(0)
+        self.queue.finish(0, jobqueue.DONE, self.plan[0])
+        self.queue.start(1)
+
+        self.reopen()
+        self.assertEqual(self.queue.recover(), [1])
+        self.assertEqual(self.queue.pending(), [2])
+        self.assertEqual(self.queue.failed(), [(1, jobqueue.modelSeed(42, 1), "进程中断")])
+        self.assertEqual(self.queue.recover(), [])
+
+    def test_results_roundtrip(self):
+        """Test that unflushed models are kept until dropped"""
+        for i in range(3):
+            self.queue.start(i)
+            self.queue.finish(i, jobqueue.DONE, self.plan[i], model(i))
+
+        self.reopen()
+        results = self.queue.results()
+        self.assertEqual([i for i, *_ in results], [0, 1, 2])
+        index, verts, faces, meta = results[1]
+        np.testing.assert_array_equal(verts, model(1)[0])
+        np.testing.assert_array_equal(faces, model(1)[1])
+        self.assertEqual(meta, model(1)[2])
+
+        self.queue.dropResults([0, 1])
+        self.assertEqual([i for i, *_ in self.queue.results()], [2])
+        self.queue.dropResults()
+        self.assertEqual(self.queue.results(), [])
+
+    def test_fingerprints_roundtrip(self):
+        """Test that fingerprints of finished models survive reopening and a new run clears them"""
+        fp = np.linspace(0, 1, 5)
+        self.queue.start(0)
+        self.queue.finish(0, jobqueue.DONE, self.plan[0], fp=fp)
+        self.queue.start(1)
+        self.queue.finish(1, jobqueue.SKIPPED, self.plan[1])
+
+        self.reopen()
+        fingerprints = self.queue.fingerprints()
+        self.assertEqual([i for i, _ in fingerprints], [0])
+        np.testing.assert_array_equal(fingerprints[0][1], fp)
+
+        self.queue.close()
+        self.queue = jobqueue.JobQueue.create(self.path, self.plan, 7)
+        self.assertEqual(self.queue.fingerprints(), [])
+
+
+class TestDatasetCheckpoint(unittest.TestCase):
+    """Test the dataset helpers used when resuming"""
+
+    def test_add_reports_flushed_shard(self):
+        """Test that add returns the shard name once a shard is written"""
+        with tempfile.TemporaryDirectory() as path:
+            with DatasetWriter(path, shard_size=2) as writer:
+                self.assertIsNone(writer.add(*model(0)[:2], [0], model(0)[2]))
+                self.assertEqual(writer.add(*model(1)[:2], [0], model(1)[2]), "shard_00000")
+
+    def test_stored_indices_by_run(self):
+        """Test that only models of the given run count as stored"""
+        with tempfile.TemporaryDirectory() as path:
+            self.assertEqual(storedIndices(path), set())
+            with DatasetWriter(path, shard_size=2) as writer:
+                for i, run in ((0, "old"), (1, "old"), (0, "new"), (1, "new"), (2, "new")):
+                    verts, faces, meta = model(i)
+                    writer.add(verts, faces, [0], dict(meta, run=run))
+                    if i == 1 and run == "new":
+                        writer.flush()
+            self.assertEqual(storedIndices(path, "new"), {0, 1, 2})
+            self.assertEqual(storedIndices(path, "old"), {0, 1})
+            self.assertEqual(storedIndices(path, "other"), set())
+
+
+def run_all_jobqueue_tests():
+    """Run all job queue test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestJobQueue,
+        TestDatasetCheckpoint,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_jobqueue_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,65 @@
+"""
+Architectural Design Tool - Lazy Import Tests
+=============================================
+
+Unit tests for the deferred module proxy used by the operators.
+"""
+
+import unittest
+import sys
+import os
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+from lazy import LazyModule
+
+
+class TestLazyModule(unittest.TestCase):
+    """Test deferred importing"""
+    
+    def test_imports_on_first_access(self):
+        """Test that the module is imported only when an attribute is used"""
+        sys.modules.pop("planner", None)
+        module = LazyModule(".planner")
+        
+        self.assertFalse(module.loaded)
+        self.assertNotIn("planner", sys.modules)
+        
+        self.assertEqual(module.RULE_NAMES[0], "merge")
+        self.assertTrue(module.loaded)
+        self.assertIn("planner", sys.modules)
+    
+    def test_missing_attribute(self):
+        """Test that unknown attributes raise AttributeError"""
+        module = LazyModule("planner")
+        with self.assertRaises(AttributeError):
+            module.does_not_exist
+    
+    def test_missing_module(self):
+        """Test that a missing module fails on first use, not at creation"""
+        module = LazyModule(".no_such_module")
+        with self.assertRaises(ImportError):
+            module.anything
+
+
+def run_all_lazy_tests():
+    """Run all lazy import test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestLazyModule,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_lazy_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,266 @@
+"""
+Architectural Design Tool - LOD Tests
+=====================================
+
+Unit tests for the proxy meshes shown for arranged results, and for
+switching between them. functions and operators are imported through the
+addon package with bpy, bmesh and mathutils mocked.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import Mock, patch
+from mathutils import Vector, Matrix
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+# Mock the Blender modules before importing functions and operators
+mock_bpy = Mock()
+mock_bpy.types.Operator = object
+mock_bpy.app.handlers.persistent = lambda function: function
+sys.modules['bpy'] = mock_bpy
+sys.modules['bmesh'] = Mock()
+sys.modules['mathutils'] = Mock()
+sys.modules['mathutils'].Vector = Vector
+sys.modules['mathutils'].Matrix = Matrix
+sys.modules['mathutils.bvhtree'] = Mock()
+
+import lod
+from test_support import addonModule
+
+fun = addonModule("functions")
+operators = addonModule("operators")
+
+
+def gridPlane(count):
+    """Return a subdivided unit square with count x count quads"""
+    xs, ys = np.meshgrid(np.linspace(0, 1, count + 1), np.linspace(0, 1, count + 1), indexing="ij")
+    verts = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)], axis=1)
+    index = np.arange(xs.size).reshape(count + 1, count + 1)
+    a = index[:-1, :-1].ravel()
+    b = index[1:, :-1].ravel()
+    c = index[1:, 1:].ravel()
+    d = index[:-1, 1:].ravel()
+    tris = np.concatenate([np.stack([a, b, c], 1), np.stack([a, c, d], 1)])
+    return verts, tris
+
+
+class TestClusterDecimate(unittest.TestCase):
+    """Test vertex clustering simplification"""
+    
+    def test_reduces_dense_mesh(self):
+        """Test that a dense mesh collapses to about resolution^2 vertices"""
+        verts, tris = gridPlane(40)
+        
+        new_verts, new_tris = lod.clusterDecimate(verts, tris, resolution=4)
+        
+        self.assertLessEqual(len(new_verts), 25)
+        self.assertLess(len(new_tris), len(tris))
+        self.assertEqual(new_verts.dtype, np.float32)
+        self.assertEqual(new_tris.dtype, np.int32)
+        self.assertTrue(np.all(new_tris < len(new_verts)))
+    
+    def test_drops_degenerate_triangles(self):
+        """Test that no triangle references the same cluster twice"""
+        verts, tris = gridPlane(10)
+        
+        new_verts, new_tris = lod.clusterDecimate(verts, tris, resolution=3)
+        
+        self.assertTrue(np.all(new_tris[:, 0] != new_tris[:, 1]))
+        self.assertTrue(np.all(new_tris[:, 1] != new_tris[:, 2]))
+        self.assertTrue(np.all(new_tris[:, 0] != new_tris[:, 2]))
+    
+    def test_empty_mesh(self):
+        """Test that an empty mesh yields empty arrays"""
+        new_verts, new_tris = lod.clusterDecimate(np.empty((0, 3)), np.empty((0, 3)))
+        self.assertEqual(len(new_verts), 0)
+        self.assertEqual(len(new_tris), 0)
+
+
+class TestBoxProxy(unittest.TestCase):
+    """Test bounding-box proxies"""
+    
+    def test_box_matches_bounds_and_faces_outward(self):
+        """Test corner positions and outward triangle winding"""
+        verts = np.array([[-1, 0, 2], [3, 1, 5], [0, 0.5, 3]])
+        
+        corners, tris = lod.boxProxy(verts)
+        
+        np.testing.assert_allclose(corners.min(axis=0), [-1, 0, 2])
+        np.testing.assert_allclose(corners.max(axis=0), [3, 1, 5])
+        center = corners.mean(axis=0)
+        for a, b, c in tris:
+            normal = np.cross(corners[b] - corners[a], corners[c] - corners[a])
+            self.assertGreater(normal @ (corners[[a, b, c]].mean(axis=0) - center), 0)
+    
+    def test_chooseLevel(self):
+        """Test that selected or nearby objects get the full mesh"""
+        self.assertEqual(lod.chooseLevel(True, 100, 5), "FULL")
+        self.assertEqual(lod.chooseLevel(False, 3, 5), "FULL")
+        self.assertEqual(lod.chooseLevel(False, 10, 5, "BOX"), "BOX")
+
+
+class FakeMesh:
+    def __init__(self, name):
+        self.name = name
+        self.use_fake_user = False
+
+
+class FakeObject(dict):
+    """Scene object: custom properties as dict items, mesh in data"""
+
+    def __init__(self, name, data, location=(0, 0, 0), selected=False):
+        super().__init__()
+        self.name = name
+        self.data = data
+        self.location = Vector(location)
+        self.selected = selected
+
+    def select_get(self):
+        return self.selected
+
+
+class LodTestCase(unittest.TestCase):
+    """Base case: bpy.data.meshes backed by a dict of fake meshes"""
+
+    def setUp(self):
+        self.meshes = {}
+        self.bpy = Mock()
+        self.bpy.data.meshes.get.side_effect = self.meshes.get
+        for module in (fun, operators):
+            patcher = patch.object(module, "bpy", self.bpy)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(operators, "fun", fun)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def mesh(self, name):
+        self.meshes[name] = FakeMesh(name)
+        return self.meshes[name]
+
+    def model(self, name, keep_full=True, **kwargs):
+        """Object already split into LOD meshes, showing its proxy"""
+        obj = FakeObject(name, self.mesh(name + "_proxy"), **kwargs)
+        levels = ["PROXY", "BOX"]
+        if keep_full:
+            self.mesh(name)
+            levels.insert(0, "FULL")
+        self.mesh(name + "_box")
+        suffix = {"FULL": "", "PROXY": "_proxy", "BOX": "_box"}
+        obj["adt_lod"] = {level: name + suffix[level] for level in levels}
+        return obj
+
+
+class TestMakeLods(LodTestCase):
+    """Test which meshes are kept for switching"""
+
+    def makeLods(self, keep_full):
+        full = self.mesh("0_merge")
+        obj = FakeObject("0_merge", full)
+        verts, tris = np.eye(3), np.array([[0, 1, 2]])
+        with patch.object(fun, "getMeshArrays", return_value=(verts, tris)), \
+                patch.object(fun, "meshFromArrays", side_effect=lambda name, *arrays: self.mesh(name)):
+            fun.makeLods(obj, 4, "PROXY", keep_full=keep_full)
+        return obj, full
+
+    def test_final_model_keeps_full_mesh(self):
+        """Test that the final model's full mesh is protected from clean()"""
+        obj, full = self.makeLods(keep_full=True)
+        self.assertEqual(set(obj["adt_lod"]), {"FULL", "PROXY", "BOX"})
+        self.assertTrue(full.use_fake_user)
+        self.assertEqual(obj.data.name, "0_merge_proxy")
+        self.assertTrue(fun.setLod(obj, "FULL"))
+        self.assertIs(obj.data, full)
+
+    def test_stage_copy_drops_full_mesh(self):
+        """Test that a stage copy only keeps its proxies"""
+        obj, full = self.makeLods(keep_full=False)
+        self.assertEqual(set(obj["adt_lod"]), {"PROXY", "BOX"})
+        self.assertFalse(full.use_fake_user)
+        self.assertFalse(fun.setLod(obj, "FULL"))
+        self.assertEqual(obj.data.name, "0_merge_proxy")
+        self.assertTrue(fun.setLod(obj, "BOX"))
+
+
+class TestAutoLod(LodTestCase):
+    """Test the depsgraph handler that switches LODs without UpdateLod"""
+
+    def setUp(self):
+        super().setUp()
+        self.scene = Mock()
+        self.scene.adt_props.lod_isauto = True
+        self.scene.adt_props.auto_isrunning = False
+        self.scene.adt_props.lod_distance = 5
+        self.scene.adt_props.lod_default = "PROXY"
+        self.scene.cursor.location = Vector((0, 0, 0))
+        self.bpy.context.screen = None
+
+    def test_selection_shows_full_mesh(self):
+        """Test that selecting a model swaps in its full mesh and deselecting swaps it back"""
+        far = self.model("0_merge", location=(20, 0, 0), selected=True)
+        other = self.model("1_merge", location=(30, 0, 0))
+        self.scene.objects = [far, other, FakeObject("Camera", None)]
+
+        operators.autoLod(self.scene)
+        self.assertEqual(far.data.name, "0_merge")
+        self.assertEqual(other.data.name, "1_merge_proxy")
+
+        far.selected = False
+        operators.autoLod(self.scene)
+        self.assertEqual(far.data.name, "0_merge_proxy")
+
+    def test_nearby_model_shows_full_mesh(self):
+        """Test that models close to the view center get their full mesh"""
+        near = self.model("0_merge", location=(2, 0, 0))
+        self.scene.objects = [near]
+        operators.autoLod(self.scene)
+        self.assertEqual(near.data.name, "0_merge")
+
+    def test_stage_copy_stays_proxy(self):
+        """Test that a selected stage copy without a full mesh keeps its proxy"""
+        copy = self.model("0_merge", keep_full=False, selected=True)
+        self.scene.objects = [copy]
+        counts = operators.updateLods(self.scene, Vector((0, 0, 0)))
+        self.assertEqual(copy.data.name, "0_merge_proxy")
+        self.assertEqual(counts["PROXY"], 1)
+        self.assertEqual(counts["FULL"], 0)
+
+    def test_idle_when_disabled_or_generating(self):
+        """Test that the handler leaves meshes alone when off or while Auto runs"""
+        obj = self.model("0_merge", selected=True)
+        self.scene.objects = [obj]
+        self.scene.adt_props.lod_isauto = False
+        operators.autoLod(self.scene)
+        self.scene.adt_props.lod_isauto = True
+        self.scene.adt_props.auto_isrunning = True
+        operators.autoLod(self.scene)
+        self.assertEqual(obj.data.name, "0_merge_proxy")
+
+
+def run_all_lod_tests():
+    """Run all LOD test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestClusterDecimate,
+        TestBoxProxy,
+        TestMakeLods,
+        TestAutoLod,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_lod_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
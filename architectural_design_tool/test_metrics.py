@@ -0,0 +1,146 @@
+"""
+Architectural Design Tool - Metrics Tests
+=========================================
+
+Unit tests for the vectorized per-model volume, surface area, footprint,
+height and compactness metrics.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+from test_support import addonModule
+
+metrics = addonModule("metrics")
+
+dataset = addonModule("dataset")
+DatasetReader, DatasetWriter = dataset.DatasetReader, dataset.DatasetWriter
+from test_validity import cube
+
+
+def sphere(rings=32, segments=64):
+    """Closed UV sphere of radius 1"""
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    verts = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1).reshape(-1, 3)
+    verts = np.vstack([[[0, 0, 1]], verts, [[0, 0, -1]]])
+    bottom = len(verts) - 1
+
+    def ring(i, j):
+        return 1 + i * segments + j % segments
+
+    tris = [(0, ring(0, j), ring(0, j + 1)) for j in range(segments)]
+    for i in range(rings - 2):
+        for j in range(segments):
+            a, b, c, d = ring(i, j), ring(i + 1, j), ring(i + 1, j + 1), ring(i, j + 1)
+            tris += [(a, b, c), (a, c, d)]
+    tris += [(bottom, ring(rings - 2, j + 1), ring(rings - 2, j)) for j in range(segments)]
+    return verts, np.array(tris, dtype=np.int32)
+
+
+class TestMeasure(unittest.TestCase):
+    """Test metrics of single models"""
+
+    def test_box(self):
+        """Test a 2 x 3 x 4 box"""
+        verts, tris = cube()
+        verts = verts * [2, 3, 4] + [1, -1, 5]
+        values = metrics.measure(verts, tris)
+        self.assertAlmostEqual(values["volume"], 24)
+        self.assertAlmostEqual(values["area"], 2 * (6 + 8 + 12))
+        self.assertAlmostEqual(values["footprint"], 6)
+        self.assertAlmostEqual(values["height"], 4)
+        self.assertAlmostEqual(values["compactness"], 36 * np.pi * 24**2 / 52**3)
+
+    def test_sphere_is_most_compact(self):
+        """Test that a sphere approaches compactness 1 and a cube is pi/6"""
+        self.assertAlmostEqual(metrics.measure(*sphere())["compactness"], 1.0, places=2)
+        self.assertAlmostEqual(metrics.measure(*cube())["compactness"], np.pi / 6)
+
+    def test_empty(self):
+        """Test that an empty model measures zero"""
+        values = metrics.measure(np.empty((0, 3)), np.empty((0, 3), dtype=np.int32))
+        self.assertEqual(values, dict.fromkeys(metrics.KEYS, 0.0))
+
+
+class TestShard(unittest.TestCase):
+    """Test measuring a whole dataset shard at once"""
+
+    def models(self):
+        verts, tris = cube()
+        return [
+            (verts * 2, tris),
+            (np.empty((0, 3)), np.empty((0, 3), dtype=np.int32)),
+            sphere(8, 12),
+            (verts * [1, 1, 5] + 3, tris),
+        ]
+
+    def test_matches_single_models(self):
+        """Test that shard metrics equal per-model metrics, empty models included"""
+        with tempfile.TemporaryDirectory() as path:
+            with DatasetWriter(path, shard_size=10) as writer:
+                for i, (verts, tris) in enumerate(self.models()):
+                    writer.add(verts, tris, [0], {"index": i})
+
+            reader = DatasetReader(path)
+            shard = reader.shard(0)
+            values = metrics.measureShard(shard["verts"], shard["faces"], shard["offsets"])
+            for i, (verts, tris) in enumerate(self.models()):
+                expected = metrics.measure(np.float32(verts), tris)
+                for key in metrics.KEYS:
+                    self.assertAlmostEqual(values[key][i], expected[key], places=4, msg=(i, key))
+            del shard, reader
+
+
+class TestFilters(unittest.TestCase):
+    """Test summaries and Auto filter predicates"""
+
+    def test_summarize(self):
+        """Test min, mean and max over models"""
+        values = [metrics.measure(*cube()), metrics.measure(cube()[0] * 3, cube()[1])]
+        summary = metrics.summarize(values)
+        self.assertAlmostEqual(summary["volume"]["min"], 1)
+        self.assertAlmostEqual(summary["volume"]["max"], 27)
+        self.assertAlmostEqual(summary["volume"]["mean"], 14)
+        self.assertEqual(metrics.summarize([]), {})
+
+    def test_rejection(self):
+        """Test that zero limits are ignored and exceeded limits give a reason"""
+        values = metrics.measure(cube()[0] * [4, 4, 2], cube()[1])
+        self.assertIsNone(metrics.rejection(values))
+        self.assertIn("占地", metrics.rejection(values, max_footprint=10))
+        self.assertIn("高度", metrics.rejection(values, max_height=1))
+        self.assertIn("紧凑度", metrics.rejection(values, min_compactness=0.9))
+        self.assertIsNone(metrics.rejection(values, 20, 3, 0.1))
+
+
+def run_all_metrics_tests():
+    """Run all metrics test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestMeasure,
+        TestShard,
+        TestFilters,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_metrics_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
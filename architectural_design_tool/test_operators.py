@@ -43,11 +43,38 @@ mock_props.auto_count = 5
 mock_props.auto_deformation_count = 1
 mock_props.auto_culling_count = 1
 mock_props.auto_isorder = True
+mock_props.auto_seed = 7
+mock_props.auto_issave = False
+mock_props.auto_isarrange = True
+mock_props.auto_saveformat = "DATASET"
+mock_props.auto_shardsize = 1000
+mock_props.lod_isenable = False
 mock_props.max_attempts = 1000
 mock_props.min_size = 0.5
 mock_props.max_size = 1.0
 mock_props.max_area = 2.0
 mock_props.add_box_size = 0.5
+mock_props.sample_mode = "ADAPTIVE"
+mock_props.dedup_isenable = False
+mock_props.dedup_tolerance = 0.02
+mock_props.dedup_mode = "REGENERATE"
+mock_props.dedup_retries = 3
+mock_props.budget_maxverts = 0
+mock_props.budget_angle = 0.0872665
+mock_props.budget_iscollapse = False
+mock_props.watchdog_isenable = True
+mock_props.watchdog_seconds = 60
+mock_props.watchdog_maxverts = 0
+mock_props.validity_isenable = False
+mock_props.site_isenable = False
+mock_props.filter_isenable = False
+mock_props.filter_maxfootprint = 0
+mock_props.filter_maxheight = 0
+mock_props.filter_mincompactness = 0
+mock_props.pool_isenable = False
+mock_props.pool_workers = 4
+mock_props.pool_candidates = 8
+mock_props.pool_timeout = 30
 
 # Mock all Blender modules
 sys.modules['bpy'] = mock_bpy
@@ -75,6 +102,7 @@ mock_functions.randomValue.return_value = 0.5
 mock_functions.randomBool.return_value = True
 mock_functions.randomDir.return_value = "+x"
 mock_functions.randomVector.return_value = Vector((1, 0, 0))
+mock_functions.randomVectors.return_value = [Vector((1, 0, 0)), Vector((0, 1, 0))]
 mock_functions.centerPos.return_value = Vector((0, 0, 0))
 mock_functions.snapEdge.return_value = None
 mock_functions.offsetShell.return_value = Mock()
@@ -82,10 +110,21 @@ mock_functions.crateBoxWithDir.return_value = Mock()
 mock_functions.meshTowall.return_value = Mock()
 mock_functions.optimizeMesh.return_value = Mock()
 mock_functions.copyobj.return_value = Mock()
+mock_functions.sampleAddBox.return_value = (mock_functions.randomCube.return_value, 1)
+mock_functions.sampleReport.return_value = []
+mock_functions.clipReport.return_value = []
+# A 2 x 1 x 3 box standing in for the BaseBox arrays
+mock_functions.getMeshArrays.return_value = (
+    [[x, y, z] for x in (0, 2) for y in (0, 1) for z in (0, 3)],
+    [[0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+     [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]],
+)
 
 # Import operators after mocking
 try:
     import operators
+    import pipeline
+    import planner
     from operators import Setbase, Auto, Merge, Branch, Extract, Offset, Shift, Twist, Carve, Frature, Expland
 except ImportError as e:
     print(f"Warning: Could not import operators: {e}")
@@ -141,64 +180,57 @@ class TestAutoOperator(unittest.TestCase):
         mock_bpy.data.objects.__contains__ = Mock(return_value=True)
         mock_bpy.data.objects.__getitem__ = Mock(return_value=self.mock_basebox)
     
-    @patch('operators.fun', mock_functions)
+    def plan(self, base_rule):
+        """Build a fixed plan: base_rule, then offset and carve for every model"""
+        import numpy as np
+        row = [base_rule, planner.OFFSET, planner.CARVE]
+        return np.array([row] * mock_props.auto_count, dtype=np.uint8)
+    
+    @patch('pipeline.fun', mock_functions)
     def test_execute_with_default_parameters(self):
         """Test execute method with default parameters"""
+        mock_functions.onePass.reset_mock()
+        
         result = self.operator.execute(self.context)
         
         # Should return FINISHED
         self.assertEqual(result, {"FINISHED"})
         
-        # Should call fun.randomInt for base shape selection
-        self.assertTrue(mock_functions.randomInt.called)
-        
-        # Should call onePass for each iteration
-        expected_calls = mock_props.auto_count
+        # Should call onePass once per rule of every model
+        steps = 1 + mock_props.auto_deformation_count + mock_props.auto_culling_count
+        expected_calls = mock_props.auto_count * steps
         self.assertEqual(mock_functions.onePass.call_count, expected_calls)
     
-    @patch('operators.fun', mock_functions)
+    @patch('pipeline.fun', mock_functions)
     def test_execute_with_merge_operation(self):
-        """Test execute when randomInt selects merge (1)"""
-        mock_functions.randomInt.return_value = 1
-        
-        self.operator.execute(self.context)
+        """Test execute when the plan selects merge"""
+        with patch('pipeline.planner.buildPlan', return_value=self.plan(planner.MERGE)):
+            self.operator.execute(self.context)
         
         # Should call merge operator
         mock_bpy.ops.ronge_adt.merge.assert_called()
         
-        # Should call onePass with merge addname
-        mock_functions.onePass.assert_called()
+        # Should name the first copy after the merge rule
+        self.assertEqual(mock_functions.onePass.call_args_list[-3][0][4], "_merge")
     
-    @patch('operators.fun', mock_functions)
+    @patch('pipeline.fun', mock_functions)
     def test_execute_with_branch_operation(self):
-        """Test execute when randomInt selects branch (2)"""
-        mock_functions.randomInt.return_value = 2
-        
-        self.operator.execute(self.context)
+        """Test execute when the plan selects branch"""
+        with patch('pipeline.planner.buildPlan', return_value=self.plan(planner.BRANCH)):
+            self.operator.execute(self.context)
         
         # Should call branch operator
         mock_bpy.ops.ronge_adt.branch.assert_called()
     
-    @patch('operators.fun', mock_functions)
+    @patch('pipeline.fun', mock_functions)
     def test_execute_with_extract_operation(self):
-        """Test execute when randomInt selects extract (3)"""
-        mock_functions.randomInt.return_value = 3
-        
-        self.operator.execute(self.context)
+        """Test execute when the plan selects extract"""
+        with patch('pipeline.planner.buildPlan', return_value=self.plan(planner.EXTRACT)):
+            self.operator.execute(self.context)
         
         # Should call extract operator
         mock_bpy.ops.ronge_adt.extract.assert_called()
     
-    @patch('operators.fun', mock_functions)
-    def test_execute_handles_default_fallback(self):
-        """Test execute fallback to merge for other randomInt values"""
-        mock_functions.randomInt.return_value = 4
-        
-        self.operator.execute(self.context)
-        
-        # Should fall back to merge operator
-        mock_bpy.ops.ronge_adt.merge.assert_called()
-    
     def test_bl_idname_and_label(self):
         """Test operator identification"""
         self.assertEqual(Auto.bl_idname, "ronge_adt.auto")
@@ -218,23 +250,24 @@ class TestMergeOperator(unittest.TestCase):
     @patch('operators.fun', mock_functions)
     def test_execute_with_successful_intersection(self):
         """Test execute when intersection is found"""
-        mock_functions.isIntersect.return_value = True
-        mock_functions.isInside.return_value = (False, "")
+        mock_functions.sampleAddBox.return_value = (mock_functions.randomCube.return_value, 1)
         
         result = self.operator.execute(self.context)
         
         self.assertEqual(result, {"FINISHED"})
-        mock_functions.randomCube.assert_called()
+        mock_functions.randomSiteCube.assert_called()
         mock_functions.calBool.assert_called()
+        self.assertEqual(mock_functions.sampleAddBox.call_args[0][0], "merge")
     
     @patch('operators.fun', mock_functions)
     def test_execute_handles_max_attempts(self):
         """Test execute when max attempts are reached"""
-        mock_functions.isIntersect.return_value = False
+        mock_functions.sampleAddBox.return_value = (None, mock_props.max_attempts)
         
         result = self.operator.execute(self.context)
         
         self.assertEqual(result, {"CANCELLED"})
+        mock_functions.sampleAddBox.return_value = (mock_functions.randomCube.return_value, 1)
     
     def test_bl_idname_and_label(self):
         """Test operator identification"""
@@ -310,7 +343,7 @@ class TestOffsetOperator(unittest.TestCase):
         result = self.operator.execute(self.context)
         
         self.assertEqual(result, {"FINISHED"})
-        mock_functions.offsetShell.assert_called()
+        mock_functions.solidifyShell.assert_called()
     
     def test_bl_idname_and_label(self):
         """Test operator identification"""
@@ -383,34 +416,31 @@ class TestCarveOperator(unittest.TestCase):
     @patch('operators.fun', mock_functions)
     def test_execute_with_successful_intersection(self):
         """Test execute when intersection is found"""
-        mock_functions.isIntersect.return_value = True
-        mock_functions.isInside.return_value = (False, "")
+        mock_functions.sampleAddBox.return_value = (mock_functions.randomCube.return_value, 1)
         
         result = self.operator.execute(self.context)
         
         self.assertEqual(result, {"FINISHED"})
-        mock_functions.randomCube.assert_called()
         mock_functions.calBool.assert_called_with(self.mock_basebox, mock_functions.randomCube.return_value, "sub")
     
     @patch('operators.fun', mock_functions)
     def test_execute_handles_max_attempts(self):
         """Test execute when max attempts are reached"""
-        mock_functions.isIntersect.return_value = False
+        mock_functions.sampleAddBox.return_value = (None, mock_props.max_attempts)
         
         result = self.operator.execute(self.context)
         
         self.assertEqual(result, {"CANCELLED"})
+        mock_functions.sampleAddBox.return_value = (mock_functions.randomCube.return_value, 1)
     
     @patch('operators.fun', mock_functions)
-    def test_execute_skips_when_inside(self):
-        """Test execute when cube is inside basebox"""
-        mock_functions.isIntersect.return_value = True
-        mock_functions.isInside.return_value = (True, "boxA")
-        
-        result = self.operator.execute(self.context)
+    def test_execute_uses_sample_mode(self):
+        """Test execute passes the configured proposal mode to the sampler"""
+        self.operator.execute(self.context)
         
-        # Should delete the cube and continue
-        mock_functions.delobj.assert_called()
+        args = mock_functions.sampleAddBox.call_args[0]
+        self.assertEqual(args[0], "carve")
+        self.assertEqual(args[-1], mock_props.sample_mode)
     
     def test_bl_idname_and_label(self):
         """Test operator identification"""
@@ -434,10 +464,9 @@ class TestFratureOperator(unittest.TestCase):
         result = self.operator.execute(self.context)
         
         self.assertEqual(result, {"FINISHED"})
-        mock_functions.centerPos.assert_called()
-        mock_functions.randomVector.assert_called()
-        mock_functions.meshTowall.assert_called()
-        mock_functions.calBool.assert_called()
+        # The L-shaped wall and its single boolean are checked in test_rules.py
+        mock_functions.randomVectors.assert_called()
+        mock_functions.crateLWall.assert_called()
     
     def test_bl_idname_and_label(self):
         """Test operator identification"""
@@ -479,21 +508,24 @@ class TestOperatorIntegration(unittest.TestCase):
         """Set up test fixtures"""
         self.context = mock_bpy.context
     
-    @patch('operators.fun', mock_functions)
+    @patch('pipeline.fun', mock_functions)
     def test_auto_workflow_calls_operators(self):
         """Test that Auto operator workflow calls appropriate operators"""
         auto_op = Auto()
-        
-        # Configure mock to return merge
-        mock_functions.randomInt.return_value = 1
+        mock_functions.onePass.reset_mock()
         
         result = auto_op.execute(self.context)
         
-        # Should call merge operator
-        mock_bpy.ops.ronge_adt.merge.assert_called()
+        # Should call one base rule operator
+        self.assertTrue(
+            mock_bpy.ops.ronge_adt.merge.called
+            or mock_bpy.ops.ronge_adt.branch.called
+            or mock_bpy.ops.ronge_adt.extract.called
+        )
         
-        # Should call onePass for each iteration
-        expected_calls = mock_props.auto_count
+        # Should call onePass for each rule of each model
+        steps = 1 + mock_props.auto_deformation_count + mock_props.auto_culling_count
+        expected_calls = mock_props.auto_count * steps
         self.assertEqual(mock_functions.onePass.call_count, expected_calls)
     
     def test_all_operators_have_proper_identification(self):
@@ -0,0 +1,420 @@
+"""
+Architectural Design Tool - Auto Pipeline Tests
+===============================================
+
+Unit tests for AutoSession, the model-by-model driver shared by Auto,
+AutoModal and Sweep. pipeline is imported through the addon package with
+bpy, bmesh and mathutils mocked; rules are mocked bpy operators and the
+functions module is replaced per test.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import Mock, MagicMock, patch
+from mathutils import Vector, Matrix
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+# Mock the Blender modules before importing pipeline
+mock_bpy = Mock()
+sys.modules['bpy'] = mock_bpy
+sys.modules['bmesh'] = Mock()
+sys.modules['mathutils'] = Mock()
+sys.modules['mathutils'].Vector = Vector
+sys.modules['mathutils'].Matrix = Matrix
+sys.modules['mathutils.bvhtree'] = Mock()
+
+from test_support import addonModule
+
+pipeline = addonModule("pipeline")
+planner = addonModule("planner")
+jobqueue = addonModule("jobqueue")
+
+# A 2 x 1 x 3 box standing in for the BaseBox arrays
+BOX = (
+    np.array([[x, y, z] for x in (0, 2) for y in (0, 1) for z in (0, 3)], dtype=np.float64),
+    np.array([[0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+              [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]], dtype=np.int32),
+)
+
+
+def makeProps(**overrides):
+    """Auto properties with every optional stage off"""
+    props = Mock()
+    values = dict(
+        auto_count=5,
+        auto_deformation_count=1,
+        auto_culling_count=1,
+        auto_isorder=True,
+        auto_seed=7,
+        auto_issave=False,
+        auto_savepath="",
+        auto_isarrange=True,
+        auto_saveformat="DATASET",
+        auto_shardsize=1000,
+        lod_isenable=False,
+        dedup_isenable=False,
+        dedup_tolerance=0.02,
+        dedup_mode="REGENERATE",
+        dedup_retries=3,
+        budget_maxverts=0,
+        budget_angle=0.0872665,
+        budget_iscollapse=True,
+        watchdog_isenable=False,
+        watchdog_seconds=60,
+        watchdog_maxverts=0,
+        validity_isenable=False,
+        validity_manifold=True,
+        validity_minvolume=0.0,
+        validity_retries=2,
+        filter_isenable=False,
+        filter_maxfootprint=0,
+        filter_maxheight=0,
+        filter_mincompactness=0,
+    )
+    values.update(overrides)
+    for key, value in values.items():
+        setattr(props, key, value)
+    return props
+
+
+def makeFunctions():
+    """functions module stand-in returning the box arrays"""
+    fun = Mock()
+    fun.getMeshArrays.return_value = BOX
+    fun.limitComplexity.return_value = (100, 100)
+    fun.sampleReport.return_value = []
+    fun.clipReport.return_value = []
+    return fun
+
+
+class SessionTestCase(unittest.TestCase):
+    """Base case: fresh bpy operators, scene and functions per test"""
+
+    def setUp(self):
+        mock_bpy.reset_mock()
+        self.base = Mock()
+        self.base.name = "BaseBox"
+        mock_bpy.context.scene.objects = MagicMock()
+        mock_bpy.context.scene.objects.get.return_value = self.base
+        mock_bpy.context.scene.objects.__getitem__.return_value = self.base
+        mock_bpy.data.objects.get.return_value = None
+
+        self.fun = makeFunctions()
+        # Other test modules may have imported pipeline against their own bpy mock
+        for name, value in (("fun", self.fun), ("bpy", mock_bpy)):
+            patcher = patch.object(pipeline, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def plan(self, props, base_rule=planner.MERGE):
+        """Fixed plan: base_rule, then offset and carve for every model"""
+        row = [base_rule, planner.OFFSET, planner.CARVE]
+        return np.array([row] * props.auto_count, dtype=np.uint8)
+
+    def session(self, props, base_rule=planner.MERGE):
+        with patch.object(pipeline.planner, "buildPlan", return_value=self.plan(props, base_rule)):
+            return pipeline.AutoSession(props)
+
+
+class TestArrange(SessionTestCase):
+    """Test the stage copies placed for every rule"""
+
+    def test_names_follow_rule_chain(self):
+        """Test that copies are named by the accumulated rule chain"""
+        props = makeProps(auto_count=1)
+        self.session(props).run()
+
+        names = [call.args[4] for call in self.fun.onePass.call_args_list]
+        self.assertEqual(names, ["_merge", "_merge_offset", "_merge_offset_carve"])
+
+    def test_without_arrange_keeps_no_copies(self):
+        """Test that no stage copies are placed when arrangement is off"""
+        props = makeProps(auto_isarrange=False)
+        self.session(props).run()
+
+        self.fun.onePass.assert_not_called()
+        self.assertEqual(mock_bpy.ops.ronge_adt.carve.call_count, props.auto_count)
+
+    def test_only_final_model_keeps_full_mesh(self):
+        """Test that stage copies get LOD proxies without keeping their full mesh"""
+        props = makeProps(auto_count=1, lod_isenable=True)
+        self.session(props).run()
+
+        kept = [call.kwargs["keep_full"] for call in self.fun.makeLods.call_args_list]
+        self.assertEqual(kept, [False, False, True])
+
+
+class TestBudget(SessionTestCase):
+    """Test the vertex budget between rules"""
+
+    def test_budget_passes_collapse_option(self):
+        """Test that the Decimate fallback follows the collapse setting"""
+        props = makeProps(budget_maxverts=50, auto_count=1)
+        self.session(props).run()
+        self.assertTrue(self.fun.limitComplexity.call_args.kwargs["collapse"])
+
+        props = makeProps(budget_maxverts=50, budget_iscollapse=False, auto_count=1)
+        self.fun.limitComplexity.return_value = (100, 50)
+        self.session(props).run()
+        self.assertFalse(self.fun.limitComplexity.call_args.kwargs["collapse"])
+
+    def test_unmet_budget_aborts_model(self):
+        """Test that a model still over the budget after simplification is dropped, not passed on"""
+        props = makeProps(budget_maxverts=50, auto_count=2)
+        self.fun.limitComplexity.side_effect = [(100, 80)] + [(100, 50)] * 100
+        self.addCleanup(setattr, self.fun.limitComplexity, "side_effect", None)
+        session = self.session(props)
+        report = session.run()
+
+        self.assertEqual([i for i, seed, message in session.failed], [0])
+        self.assertIn("80顶点仍超出预算50", session.failed[0][2])
+        self.assertEqual(mock_bpy.ops.ronge_adt.offset.call_count, 1)
+        self.assertEqual(sorted(session.metrics), [1])
+        self.assertTrue(any(line.startswith("中止1个模型") for line in report))
+
+    def test_met_budget_is_not_reported(self):
+        """Test that no model is aborted when every rule fits the budget"""
+        props = makeProps(budget_maxverts=50, auto_count=2)
+        self.fun.limitComplexity.return_value = (100, 50)
+        session = self.session(props)
+        report = session.run()
+
+        self.assertEqual(session.failed, [])
+        self.assertFalse(any("仍超出" in line for line in report))
+
+
+class TestWatchdog(SessionTestCase):
+    """Test aborting models over the per-model limits"""
+
+    def test_watchdog_aborts_model_and_continues(self):
+        """Test that a model over its budget is dropped and the run continues"""
+        props = makeProps(watchdog_isenable=True)
+        session = self.session(props)
+        aborted = pipeline.ModelAborted("0_merge: 用时61.0s超出60s")
+        with patch.object(pipeline.AutoSession, "checkWatchdog", side_effect=[aborted] + [None] * 100):
+            report = session.run()
+
+        steps = 1 + props.auto_deformation_count + props.auto_culling_count
+        self.assertEqual(self.fun.onePass.call_count, (props.auto_count - 1) * steps)
+        self.assertEqual([i for i, seed, message in session.failed], [0])
+        self.assertEqual(session.failed[0][1], jobqueue.modelSeed(session.seed, 0))
+        self.assertNotIn(0, session.metrics)
+        self.assertEqual(sorted(session.metrics), [1, 2, 3, 4])
+        self.assertTrue(any(line.startswith("中止1个模型") for line in report))
+
+    def test_vertex_limit(self):
+        """Test that a BaseBox over the vertex limit aborts the model"""
+        props = makeProps(watchdog_isenable=True, watchdog_maxverts=10)
+        session = self.session(props)
+        session.modelstart = float("inf")
+        self.base.data.vertices = [None] * 11
+        with self.assertRaises(pipeline.ModelAborted):
+            session.checkWatchdog(0, session.plan[0], 0)
+        self.base.data.vertices = [None] * 10
+        session.checkWatchdog(0, session.plan[0], 0)
+
+
+class TestErrors(SessionTestCase):
+    """Test unexpected errors raised while generating a model"""
+
+    def test_error_fails_model_and_propagates(self):
+        """Test that the model is recorded as failed before the error reaches the caller"""
+        props = makeProps()
+        session = self.session(props)
+        session.queue = Mock()
+        offset = mock_bpy.ops.ronge_adt.offset
+        offset.side_effect = RuntimeError("boolean failed")
+        self.addCleanup(setattr, offset, "side_effect", None)
+        with self.assertRaises(RuntimeError):
+            session.step()
+
+        self.assertEqual(session.index, 1)
+        self.assertEqual([i for i, seed, message in session.failed], [0])
+        self.assertIn("boolean failed", session.failed[0][2])
+        session.queue.start.assert_called_once_with(0)
+        self.assertEqual(session.queue.finish.call_args.args[:2], (0, jobqueue.FAILED))
+        # The copy placed by the base rule is removed
+        self.assertEqual(session.objects, [])
+
+
+class TestResume(SessionTestCase):
+    """Test continuing a run from its job queue"""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        mock_bpy.path.abspath.side_effect = lambda path: path
+        self.addCleanup(setattr, mock_bpy.path.abspath, "side_effect", None)
+        # Mock properties have no bl_rna to snapshot
+        patcher = patch.object(pipeline.sweep, "propsToDict", return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resume_keeps_earlier_fingerprints(self):
+        """Test that models generated before the interruption still count as duplicates"""
+        props = makeProps(
+            auto_count=3, auto_issave=True, auto_savepath=self.tmp.name, auto_saveformat="BLEND",
+            dedup_isenable=True, dedup_mode="SKIP",
+        )
+        first = self.session(props)
+        first.step()
+        first.queue.close()  # interrupted after the first model
+
+        session = pipeline.AutoSession(props, resume=True)
+        self.assertEqual(session.fingerprints.count, 1)
+        # Every model is the same box, so the remaining two are duplicates
+        session.run()
+        queue = jobqueue.JobQueue.open(jobqueue.queuePath(self.tmp.name))
+        self.addCleanup(queue.close)
+        counts = queue.counts()
+        self.assertEqual(counts[jobqueue.DONE], 1)
+        self.assertEqual(counts[jobqueue.SKIPPED], 2)
+        self.assertEqual(session.skipped, 2)
+
+    def test_resume_blend_without_arrange(self):
+        """Test that .blend output holds every model even when nothing was arranged in the scene"""
+        props = makeProps(
+            auto_count=3, auto_issave=True, auto_savepath=self.tmp.name, auto_saveformat="BLEND",
+            auto_isarrange=False,
+        )
+        first = self.session(props)
+        first.step()
+        first.queue.close()  # interrupted after the first model
+        self.fun.linkMesh.reset_mock()
+
+        session = pipeline.AutoSession(props, resume=True)
+        self.fun.linkMesh.assert_not_called()
+        save = mock_bpy.ops.wm.save_as_mainfile
+        save.reset_mock()
+        session.run()
+
+        names = [call.args[0] for call in self.fun.linkMesh.call_args_list]
+        self.assertEqual(names, [session.modelName(i) for i in range(3)])
+        self.assertEqual(len(session.objects), 3)
+        save.assert_called_once()
+        self.assertTrue(save.call_args.kwargs["filepath"].endswith("auto.blend"))
+
+
+class TestFilter(SessionTestCase):
+    """Test the Auto metric filter"""
+
+    def test_filter_discards_large_footprint(self):
+        """Test that models exceeding the footprint filter are dropped and skipped"""
+        props = makeProps(filter_isenable=True, filter_maxfootprint=1.5)
+        session = self.session(props)
+        with patch.object(pipeline.AutoSession, "discard") as discard:
+            report = session.run()
+
+        self.assertEqual(discard.call_count, props.auto_count)
+        self.assertEqual(session.filtered, props.auto_count)
+        self.assertEqual(session.metrics, {})
+        self.assertIn(f"筛选: 丢弃{props.auto_count}个模型", report)
+
+    def test_filter_keeps_models_within_limits(self):
+        """Test that passing models keep their metrics and are exported as done"""
+        props = makeProps(filter_isenable=True, filter_maxfootprint=2.5, filter_maxheight=3)
+        session = self.session(props)
+        with patch.object(pipeline.AutoSession, "endModel") as end:
+            session.run()
+
+        self.assertEqual(session.filtered, 0)
+        self.assertAlmostEqual(session.metrics[0]["footprint"], 2)
+        self.assertEqual({call.args[1] for call in end.call_args_list}, {jobqueue.DONE})
+
+    def test_filtered_model_is_recorded_as_skipped(self):
+        """Test the job queue status of a filtered model"""
+        props = makeProps(filter_isenable=True, filter_maxheight=1, auto_count=1)
+        session = self.session(props)
+        with patch.object(pipeline.AutoSession, "endModel") as end:
+            session.run()
+
+        status, message = end.call_args.args[1], end.call_args.args[3]
+        self.assertEqual(status, jobqueue.SKIPPED)
+        self.assertIn("高度", message)
+
+
+class TestValidity(SessionTestCase):
+    """Test validity checks and retries from the previous rule's snapshot"""
+
+    def test_invalid_rule_result_is_retried(self):
+        """Test that a rule whose result fails validation runs again"""
+        props = makeProps(validity_isenable=True, validity_retries=2)
+        session = self.session(props)
+        with patch.object(pipeline.AutoSession, "checkValidity", side_effect=["空网格"] + [None] * 100):
+            session.run()
+
+        self.assertEqual(mock_bpy.ops.ronge_adt.merge.call_count, props.auto_count + 1)
+        self.assertEqual(session.retried, 1)
+        self.assertEqual(session.failed, [])
+
+    def test_failed_rule_restores_previous_snapshot(self):
+        """Test that a failing deformation rule is retried from the base rule's snapshot"""
+        props = makeProps(validity_isenable=True, validity_retries=1, auto_count=1)
+        session = self.session(props)
+        # merge valid, offset invalid once, then everything valid
+        with patch.object(pipeline.AutoSession, "checkValidity", side_effect=[None, "空网格"] + [None] * 10):
+            session.run()
+
+        self.fun.restoreSnapshot.assert_called_once_with(self.fun.snapshot.return_value)
+        self.assertEqual(mock_bpy.ops.ronge_adt.offset.call_count, 2)
+        self.assertEqual(self.fun.dropSnapshot.call_count, 3)
+
+    def test_retries_exhausted_abort_model(self):
+        """Test that a rule that stays invalid aborts only its model"""
+        props = makeProps(validity_isenable=True, validity_retries=1, auto_count=2)
+        session = self.session(props)
+        with patch.object(pipeline.AutoSession, "checkValidity", side_effect=["空网格", "空网格"] + [None] * 10):
+            session.run()
+
+        self.assertEqual([i for i, seed, message in session.failed], [0])
+        self.assertIn("空网格", session.failed[0][2])
+        self.assertEqual(sorted(session.metrics), [1])
+
+    def test_snapshot_is_taken_after_budget(self):
+        """Test that the budgeted mesh is validated and snapshotted, not the raw rule result"""
+        props = makeProps(validity_isenable=True, budget_maxverts=50, watchdog_isenable=True, auto_count=1)
+        session = self.session(props)
+        events = []
+        self.fun.limitComplexity.side_effect = lambda *args, **kwargs: events.append("budget") or (100, 50)
+        self.fun.snapshot.side_effect = lambda obj: events.append("snapshot")
+        with patch.object(pipeline.AutoSession, "checkWatchdog", side_effect=lambda *args: events.append("watchdog")), \
+                patch.object(pipeline.AutoSession, "checkValidity", side_effect=lambda: events.append("validity")):
+            session.run()
+
+        self.assertEqual(events, ["budget", "watchdog", "validity", "snapshot"] * 3)
+        self.assertEqual(session.decimated, 3)
+
+
+def run_all_pipeline_tests():
+    """Run all Auto pipeline test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestArrange,
+        TestBudget,
+        TestWatchdog,
+        TestErrors,
+        TestResume,
+        TestFilter,
+        TestValidity,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_pipeline_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,127 @@
+"""
+Architectural Design Tool - Planner Tests
+=========================================
+
+Unit tests for the vectorized rule-chain planner used by Auto.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import planner
+
+
+class TestBuildPlan(unittest.TestCase):
+    """Test plan generation"""
+    
+    def test_shape_and_dtype(self):
+        """Test that the plan has one row per model and a compact dtype"""
+        plan = planner.buildPlan(100, 2, 3, True, seed=1)
+        
+        self.assertEqual(plan.shape, (100, 6))
+        self.assertEqual(plan.dtype, np.uint8)
+    
+    def test_rule_groups_and_counts(self):
+        """Test base column and per-row deformation/culling counts"""
+        plan = planner.buildPlan(200, 2, 3, True, seed=2)
+        
+        self.assertTrue(np.isin(plan[:, 0], planner.BASE_RULES).all())
+        steps = plan[:, 1:]
+        deformation = np.isin(steps, planner.DEFORMATION_RULES).sum(axis=1)
+        culling = np.isin(steps, planner.CULLING_RULES).sum(axis=1)
+        self.assertTrue((deformation == 2).all())
+        self.assertTrue((culling == 3).all())
+    
+    def test_unshuffled_order(self):
+        """Test that deformations come before culling when isorder is False"""
+        plan = planner.buildPlan(50, 2, 2, False, seed=3)
+        
+        self.assertTrue(np.isin(plan[:, 1:3], planner.DEFORMATION_RULES).all())
+        self.assertTrue(np.isin(plan[:, 3:5], planner.CULLING_RULES).all())
+    
+    def test_shuffled_order_varies(self):
+        """Test that isorder shuffles deformation/culling positions"""
+        plan = planner.buildPlan(200, 2, 2, True, seed=4)
+        
+        first_step_culling = np.isin(plan[:, 1], planner.CULLING_RULES)
+        self.assertTrue(first_step_culling.any())
+        self.assertFalse(first_step_culling.all())
+    
+    def test_seed_is_reproducible(self):
+        """Test that the same seed yields the same plan"""
+        a = planner.buildPlan(30, 1, 1, True, seed=5)
+        b = planner.buildPlan(30, 1, 1, True, seed=5)
+        np.testing.assert_array_equal(a, b)
+
+
+class TestPlanHelpers(unittest.TestCase):
+    """Test naming, summary, dedup, sharding and persistence"""
+    
+    def test_chain_name(self):
+        """Test that names are derived from codes"""
+        row = np.array([planner.MERGE, planner.TWIST, planner.CARVE], dtype=np.uint8)
+        
+        self.assertEqual(planner.chainName(row), "_merge_twist_carve")
+        self.assertEqual(planner.chainName(row, 1), "_merge")
+    
+    def test_describe_plan(self):
+        """Test rule histogram"""
+        plan = np.array([[planner.MERGE, planner.OFFSET], [planner.MERGE, planner.SHIFT]], dtype=np.uint8)
+        counts = planner.describePlan(plan)
+        
+        self.assertEqual(counts["merge"], 2)
+        self.assertEqual(counts["offset"], 1)
+        self.assertEqual(counts["expland"], 0)
+    
+    def test_unique_chains(self):
+        """Test deduplication of identical rule chains"""
+        plan = np.array([[0, 3], [0, 3], [1, 4]], dtype=np.uint8)
+        chains, counts = planner.uniqueChains(plan)
+        
+        self.assertEqual(len(chains), 2)
+        self.assertEqual(sorted(counts.tolist()), [1, 2])
+    
+    def test_shard_plan(self):
+        """Test contiguous sharding keeps global model indices"""
+        plan = planner.buildPlan(10, 1, 1, True, seed=6)
+        shards = planner.shardPlan(plan, 3)
+        
+        self.assertEqual([start for start, _ in shards], [0, 4, 7])
+        np.testing.assert_array_equal(np.concatenate([part for _, part in shards]), plan)
+    
+    def test_save_and_load(self):
+        """Test persisting a plan"""
+        plan = planner.buildPlan(10, 1, 2, True, seed=7)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plan.npy")
+            planner.savePlan(path, plan)
+            np.testing.assert_array_equal(planner.loadPlan(path), plan)
+
+
+def run_all_planner_tests():
+    """Run all planner test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestBuildPlan,
+        TestPlanHelpers,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_planner_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
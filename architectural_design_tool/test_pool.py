@@ -0,0 +1,207 @@
+"""
+Architectural Design Tool - Worker Pool Tests
+=============================================
+
+Unit tests for the persistent worker pool used by parallel candidate
+evaluation. A small Python script stands in for `blender -b worker.py -- serve` and
+returns its results through shared memory like the real worker.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+from test_support import addonModule
+
+pool = addonModule("pool")
+transport = addonModule("transport")
+
+
+# Fake worker: succeeds for seeds divisible by 3, sleeps seed/1000 s for
+# seeds >= 100, exits on seed -1 and prints noise lines the pool must skip
+FAKE_WORKER = """
+import json, os, sys, time
+sys.path.insert(0, {addon_dir!r})
+from test_support import addonModule
+pool = addonModule("pool")
+transport = addonModule("transport")
+
+print(pool.encodeReply(pool.READY_REPLY), flush=True)
+held = None
+for line in sys.stdin:
+    request = json.loads(line)
+    if held is not None:
+        held.close()
+        held = None
+    seed = request["seed"]
+    print("Extract: noise line", flush=True)
+    if seed == -1:
+        sys.exit(3)
+    if seed >= 100:
+        time.sleep(seed / 1000)
+    if seed % 3 == 0:
+        held = transport.share(verts=[[seed, 0, 0]], faces=[[0, 0, 0]])
+        reply = {{"id": request["id"], "status": "FINISHED", "pid": os.getpid(),
+                 "mesh": held.descriptor}}
+    else:
+        reply = {{"id": request["id"], "status": "CANCELLED"}}
+    print(pool.encodeReply(reply), flush=True)
+"""
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Test racing candidates across persistent workers"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.script = os.path.join(cls.tmp.name, "fake_worker.py")
+        with open(cls.script, "w", encoding="utf-8") as f:
+            f.write(FAKE_WORKER.format(addon_dir=os.path.abspath(addon_dir)))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.pool = pool.WorkerPool([sys.executable, self.script], size=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def takeMesh(self, reply):
+        """Read and free the winner's shared mesh"""
+        block = transport.receive(reply["mesh"])
+        verts = block["verts"].tolist()
+        block.close()
+        block.unlink()
+        return verts
+
+    def test_first_valid_result_wins(self):
+        """Test that a successful candidate is returned with its seed"""
+        reply = self.pool.race("extract", [1, 2, 4, 6, 7], timeout=10)
+        self.assertIsNotNone(reply)
+        self.assertEqual(reply["seed"], 6)
+        self.assertEqual(self.takeMesh(reply), [[6, 0, 0]])
+
+    def test_all_failed(self):
+        """Test that None is returned when no candidate succeeds"""
+        self.assertIsNone(self.pool.race("extract", [1, 2, 4, 5], timeout=10))
+
+    def test_workers_are_reused(self):
+        """Test that the same processes serve consecutive races"""
+        first = self.pool.race("extract", [3], timeout=10)
+        second = self.pool.race("extract", [9], timeout=10)
+        self.takeMesh(first)
+        self.takeMesh(second)
+        pids = {worker.process.pid for worker in self.pool.workers}
+        self.assertIn(first["pid"], pids)
+        self.assertIn(second["pid"], pids)
+
+    def test_losers_are_cancelled(self):
+        """Test that a slow loser is killed once the race is decided"""
+        self.pool.start()
+        pids = [worker.process.pid for worker in self.pool.workers]
+        reply = self.pool.race("extract", [3, 3000], timeout=10)
+        self.assertEqual(reply["seed"], 3)
+        self.takeMesh(reply)
+
+        # The worker running seed 3000 is restarted at once, the winner's is kept
+        self.assertEqual(self.pool.restarts, 1)
+        self.assertFalse(any(worker.busy for worker in self.pool.workers))
+        current = [worker.process.pid for worker in self.pool.workers]
+        self.assertEqual(len(set(pids) & set(current)), 1)
+
+        # The restarted slot serves the next race
+        start = time.perf_counter()
+        reply = self.pool.race("extract", [1, 1, 1, 12], timeout=10)
+        self.assertLess(time.perf_counter() - start, 2.5)
+        self.assertEqual(reply["seed"], 12)
+        self.takeMesh(reply)
+
+    def test_late_results_are_discarded(self):
+        """Test that a result arriving after its race was decided does not win the next one"""
+        reply = self.pool.race("extract", [3, 6], timeout=10)
+        self.takeMesh(reply)
+        # Whichever worker finished second may have replied before being killed,
+        # its result is dropped together with its shared memory
+        reply = self.pool.race("extract", [1, 9], timeout=10)
+        self.assertEqual(reply["seed"], 9)
+        self.takeMesh(reply)
+
+    def test_crashed_worker_is_restarted(self):
+        """Test that a worker that exits is replaced and its slot reused"""
+        reply = self.pool.race("extract", [-1, -1, 1, 2, 15], timeout=10)
+        self.assertEqual(reply["seed"], 15)
+        self.takeMesh(reply)
+        self.assertEqual(len(self.pool.workers), 2)
+        self.assertTrue(all(worker.alive for worker in self.pool.workers))
+
+    def test_stuck_workers_are_killed(self):
+        """Test that workers exceeding the request timeout are restarted"""
+        self.pool.request_timeout = 0.2
+        self.pool.start()
+        pids = {worker.process.pid for worker in self.pool.workers}
+
+        start = time.perf_counter()
+        reply = self.pool.race("extract", [3000, 3000, 3], timeout=10)
+        self.assertLess(time.perf_counter() - start, 2.5)
+        self.assertEqual(reply["seed"], 3)
+        self.takeMesh(reply)
+
+        self.assertEqual(self.pool.restarts, 2)
+        self.assertTrue(pids.isdisjoint(worker.process.pid for worker in self.pool.workers))
+        self.assertTrue(all(worker.alive for worker in self.pool.workers))
+
+    def test_timeout(self):
+        """Test that a race gives up after the timeout and stops its candidates"""
+        start = time.perf_counter()
+        self.assertIsNone(self.pool.race("extract", [900], timeout=0.2))
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertEqual(self.pool.restarts, 1)
+        self.assertFalse(any(worker.busy for worker in self.pool.workers))
+
+
+class TestEncoding(unittest.TestCase):
+    """Test the line protocol helpers"""
+
+    def test_reply_roundtrip(self):
+        """Test that replies survive encoding and other lines are ignored"""
+        line = pool.encodeReply({"id": 1, "status": "FINISHED"})
+        self.assertEqual(pool.decodeReply(line), {"id": 1, "status": "FINISHED"})
+        self.assertIsNone(pool.decodeReply("Extract: 3次尝试"))
+
+    def test_worker_command(self):
+        """Test the serve command line"""
+        command = pool.workerCommand("blender")
+        self.assertEqual(command[:2], ["blender", "-b"])
+        self.assertEqual(command[-2:], ["--", "serve"])
+        self.assertTrue(command[-3].endswith("worker.py"))
+
+
+def run_all_pool_tests():
+    """Run all worker pool test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestWorkerPool,
+        TestEncoding,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_pool_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
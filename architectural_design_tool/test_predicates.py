@@ -0,0 +1,220 @@
+"""
+Architectural Design Tool - Geometry Predicate Tests
+====================================================
+
+Unit tests for the oriented bounding box intersection (separating axis
+theorem) and containment predicates behind isIntersect and isInside.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import predicates
+from directions import boxVerts
+
+UNIT = [-1, -1, -1, 1, 1, 1]
+
+
+def rotation(axis, angle):
+    """3 x 3 rotation matrix around an axis"""
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    k = np.array([[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]])
+    return np.eye(3) + np.sin(angle) * k + (1 - np.cos(angle)) * k @ k
+
+
+def matrix(rotate=np.eye(3), translate=(0, 0, 0), scale=(1, 1, 1)):
+    """4 x 4 world matrix from rotation, translation and scale"""
+    result = np.eye(4)
+    result[:3, :3] = rotate @ np.diag(scale)
+    result[:3, 3] = translate
+    return result
+
+
+def sampledOverlap(a, b, steps=21):
+    """Brute force: whether any grid point of box b lies inside box a"""
+    grid = np.linspace(-1, 1, steps)
+    local = np.stack(np.meshgrid(grid, grid, grid), axis=-1).reshape(-1, 3)
+    return bool(predicates.containsPoints(a, b[0] + local @ b[1]).any())
+
+
+class TestOBB(unittest.TestCase):
+    """Test building boxes from local bounds and world matrices"""
+
+    def test_corners_follow_matrix(self):
+        """Test that OBB corners are the transformed local bounding box corners"""
+        world = matrix(rotation([0, 0, 1], 0.3), (1, 2, 3), (2, 1, 0.5))
+        box = predicates.obb([0, 0, 0, 1, 2, 4], world)
+        local = np.array([[x, y, z] for x in (0, 1) for y in (0, 2) for z in (0, 4)], dtype=np.float64)
+        expected = local @ world[:3, :3].T + world[:3, 3]
+        np.testing.assert_allclose(
+            np.sort(predicates.corners(box), axis=0), np.sort(expected, axis=0), atol=1e-12
+        )
+        self.assertAlmostEqual(predicates.volume(box), 8 * 1)
+
+
+class TestIntersects(unittest.TestCase):
+    """Test the separating axis intersection test"""
+
+    def test_axis_aligned(self):
+        """Test overlapping, touching and separated axis aligned boxes"""
+        a = predicates.obb(UNIT, np.eye(4))
+        self.assertTrue(predicates.intersects(a, predicates.obb(UNIT, matrix(translate=(1.5, 0, 0)))))
+        self.assertTrue(predicates.intersects(a, predicates.obb(UNIT, matrix(translate=(2, 0, 0)))))
+        self.assertFalse(predicates.intersects(a, predicates.obb(UNIT, matrix(translate=(2.01, 0, 0)))))
+
+    def test_containment_counts_as_intersection(self):
+        """Test that a box inside another intersects it"""
+        a = predicates.obb(UNIT, matrix(scale=(3, 3, 3)))
+        b = predicates.obb(UNIT, matrix(rotation([1, 1, 0], 0.7)))
+        self.assertTrue(predicates.intersects(a, b))
+        self.assertTrue(predicates.intersects(b, a))
+
+    def test_rotated_aabb_false_positive(self):
+        """Test boxes whose world AABBs overlap but which are separated by a face axis"""
+        a = predicates.obb(UNIT, np.eye(4))
+        b = predicates.obb(UNIT, matrix(rotation([0, 0, 1], np.pi / 4), (2.2, 2.2, 0)))
+        self.assertFalse(predicates.intersects(a, b))
+        b = predicates.obb(UNIT, matrix(rotation([0, 0, 1], np.pi / 4), (1.6, 1.6, 0)))
+        self.assertTrue(predicates.intersects(a, b))
+
+    def test_edge_edge_separation(self):
+        """Test boxes that only an edge cross product axis separates"""
+        rotate = rotation([1, 0, 0], np.pi / 4) @ rotation([0, 0, 1], np.pi / 4)
+        a = predicates.obb(UNIT, np.eye(4))
+        b = predicates.obb(UNIT, matrix(rotate, (2.1, 2.1, 0)))
+
+        # No face normal separates the pair
+        faces = np.vstack([np.eye(3), rotate.T])
+        distance = np.abs(faces @ b[0])
+        radius = np.abs(a[1] @ faces.T).sum(axis=0) + np.abs(b[1] @ faces.T).sum(axis=0)
+        self.assertTrue((distance <= radius).all())
+
+        self.assertFalse(predicates.intersects(a, b))
+        self.assertFalse(sampledOverlap(a, b))
+
+        b = predicates.obb(UNIT, matrix(rotate, (1.9, 1.9, 0)))
+        self.assertTrue(predicates.intersects(a, b))
+
+    def test_agrees_with_sampling(self):
+        """Test that the SAT never misses an overlap found by point sampling"""
+        rng = np.random.default_rng(7)
+        a = predicates.obb(UNIT, np.eye(4))
+        for _ in range(200):
+            rotate = rotation(rng.normal(size=3), rng.uniform(0, np.pi))
+            b = predicates.obb(UNIT, matrix(rotate, rng.uniform(-3, 3, 3), rng.uniform(0.2, 1.5, 3)))
+            if sampledOverlap(a, b):
+                self.assertTrue(predicates.intersects(a, b))
+
+    def test_flat_box(self):
+        """Test that a zero-thickness box still intersects correctly"""
+        a = predicates.obb(UNIT, np.eye(4))
+        plane = predicates.obb([-1, -1, 0, 1, 1, 0], matrix(translate=(0, 0, 0.5)))
+        self.assertTrue(predicates.intersects(a, plane))
+        plane = predicates.obb([-1, -1, 0, 1, 1, 0], matrix(translate=(0, 0, 1.5)))
+        self.assertFalse(predicates.intersects(a, plane))
+
+
+class TestContains(unittest.TestCase):
+    """Test containment against oriented boxes"""
+
+    def test_axis_aligned(self):
+        """Test inside, touching and overflowing boxes"""
+        outer = predicates.obb(UNIT, np.eye(4))
+        self.assertTrue(predicates.contains(outer, predicates.obb([-0.5, -0.5, -0.5, 0.5, 0.5, 0.5], np.eye(4))))
+        self.assertTrue(predicates.contains(outer, predicates.obb([0, 0, 0, 1, 1, 1], np.eye(4))))
+        self.assertFalse(predicates.contains(outer, predicates.obb([0, 0, 0, 1.1, 1, 1], np.eye(4))))
+
+    def test_rotated_outer(self):
+        """Test a box inside the world AABB of a rotated box but not inside the box"""
+        outer = predicates.obb(UNIT, matrix(rotation([0, 0, 1], np.pi / 4)))
+        inner = predicates.obb([0.4, 0.4, -0.5, 1.4, 1.4, 0.5], np.eye(4))
+        self.assertFalse(predicates.contains(outer, inner))
+        inner = predicates.obb([-0.3, -0.3, -0.5, 0.3, 0.3, 0.5], np.eye(4))
+        self.assertTrue(predicates.contains(outer, inner))
+
+    def test_scaled_and_sheared(self):
+        """Test containment in a non-orthogonal parallelepiped"""
+        world = np.eye(4)
+        world[0, 1] = 1.0  # x += y
+        outer = predicates.obb(UNIT, world)
+        self.assertTrue(predicates.containsPoints(outer, [[1.9, 1, 0]])[0])
+        self.assertFalse(predicates.containsPoints(outer, [[1.9, -1, 0]])[0])
+
+    def test_flat_outer(self):
+        """Test that only points in the plane of a flat box are inside it"""
+        plane = predicates.obb([-1, -1, 0, 1, 1, 0], np.eye(4))
+        inside = predicates.containsPoints(plane, [[0.5, 0.5, 0], [0.5, 0.5, 0.1], [2, 0, 0]])
+        self.assertEqual(inside.tolist(), [True, False, False])
+
+
+class TestFitOBB(unittest.TestCase):
+    """Test deriving box axes from baked vertices"""
+
+    def test_box_along_tilted_direction(self):
+        """Test that a box built along a tilted direction is recognised with its own edges"""
+        verts = boxVerts([0.3, 0.1, 1], [2, -1, 0.4], 0.5, 1.5, 3) + [4, -2, 1]
+        box, isBox = predicates.fitOBB(verts.astype(np.float32))
+
+        self.assertTrue(isBox)
+        self.assertAlmostEqual(predicates.volume(box), 0.5 * 1.5 * 3, places=4)
+        np.testing.assert_allclose(np.sort(predicates.corners(box), axis=0), np.sort(verts, axis=0), atol=1e-5)
+
+    def test_cube_in_any_vertex_order(self):
+        """Test that a cube is recognised whichever corner comes first"""
+        verts = boxVerts([0, 0, 1], [1, 1, 0], 1, 1, 1)
+        for roll in range(8):
+            self.assertIsNotNone(predicates.boxEdges(np.roll(verts, roll, axis=0)))
+
+    def test_not_a_box(self):
+        """Test that parallelepipeds and moved corners are not boxes"""
+        verts = boxVerts([0, 0, 1], [1, 0, 0], 1, 1, 2)
+        sheared = verts + verts[:, 2:3] * [0.5, 0, 0]
+        self.assertIsNone(predicates.boxEdges(sheared))
+        moved = verts.copy()
+        moved[3] += 0.1
+        self.assertIsNone(predicates.boxEdges(moved))
+        self.assertIsNone(predicates.boxEdges(verts[:6]))
+
+    def test_principal_axes_for_meshes(self):
+        """Test that a rotated non-box point cloud gets a tighter box than its world AABB"""
+        rng = np.random.default_rng(3)
+        local = rng.uniform(-1, 1, (200, 3)) * [4, 0.5, 0.5]
+        points = local @ rotation([0, 0, 1], np.pi / 4).T
+        box, isBox = predicates.fitOBB(points)
+
+        self.assertFalse(isBox)
+        self.assertTrue(predicates.containsPoints(box, points).all())
+        aabb = predicates.obb(np.concatenate([points.min(axis=0), points.max(axis=0)]), np.eye(4))
+        self.assertLess(predicates.volume(box), predicates.volume(aabb) / 2)
+
+
+def run_all_predicates_tests():
+    """Run all geometry predicate test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestOBB,
+        TestFitOBB,
+        TestIntersects,
+        TestContains,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_predicates_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,199 @@
+"""
+Architectural Design Tool - Rule Operator Tests
+===============================================
+
+Unit tests for what the Merge, Offset, Carve and Frature rules do to the
+BaseBox. operators is imported through the addon package against a bpy
+mock whose Operator base is a plain class, so execute runs for real; the
+functions module, the scene and the site constraint are replaced per test.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import Mock, MagicMock, patch
+from mathutils import Vector, Matrix
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+# Mock the Blender modules before importing operators
+mock_bpy = Mock()
+mock_bpy.types.Operator = object
+mock_bpy.app.handlers.persistent = lambda function: function
+sys.modules['bpy'] = mock_bpy
+sys.modules['bmesh'] = Mock()
+sys.modules['mathutils'] = Mock()
+sys.modules['mathutils'].Vector = Vector
+sys.modules['mathutils'].Matrix = Matrix
+
+from test_support import addonModule
+
+operators = addonModule("operators")
+
+
+def makeProps(**overrides):
+    """Scene properties read by the rules"""
+    props = Mock()
+    values = dict(
+        max_attempts=100,
+        min_size=0.5,
+        max_size=1.0,
+        max_area=2.0,
+        add_box_size=0.5,
+        sample_mode="ADAPTIVE",
+        offset_maxoffset=0.5,
+        offset_minthick=0.1,
+        offset_maxthick=0.2,
+        frature_minwidth=0.1,
+        frature_maxwidth=0.3,
+    )
+    values.update(overrides)
+    for key, value in values.items():
+        setattr(props, key, value)
+    return props
+
+
+class RuleTestCase(unittest.TestCase):
+    """Base case: a scene holding BaseBox, mocked functions and no site constraint"""
+
+    def setUp(self):
+        self.base = Mock()
+        self.base.name = "BaseBox"
+        self.props = makeProps()
+        self.context = Mock()
+        self.context.scene.adt_props = self.props
+
+        self.bpy = Mock()
+        self.bpy.context.scene.objects = MagicMock()
+        self.bpy.context.scene.objects.__iter__.side_effect = lambda: iter([self.base])
+        self.bpy.context.scene.objects.__getitem__.side_effect = {"BaseBox": self.base}.__getitem__
+
+        self.fun = Mock()
+        self.fun.randomValue.return_value = 0.2
+        self.fun.dir2Vec3.return_value = Vector((0, 0, 1))
+        self.fun.randomInsidePoint.return_value = Vector((0, 0, 0))
+        self.fun.randomVectors.return_value = (Vector((1, 0, 0)), Vector((0, 1, 0)))
+        self.addBox = Mock()
+        self.fun.sampleAddBox.return_value = (self.addBox, 3)
+
+        self.sitecheck = Mock()
+        self.sitecheck.fromProps.return_value = None
+        for name, value in (("bpy", self.bpy), ("fun", self.fun), ("sitecheck", self.sitecheck)):
+            patcher = patch.object(operators, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def execute(self, rule):
+        operator = rule()
+        operator.report = Mock()
+        return operator.execute(self.context), operator
+
+
+class TestMerge(RuleTestCase):
+    """Test the Merge base rule"""
+
+    def test_union_with_sampled_box(self):
+        """Test that a fresh BaseBox replaces the old one and is joined with the sampled box"""
+        result, operator = self.execute(operators.Merge)
+
+        self.assertEqual(result, {"FINISHED"})
+        self.fun.delobj.assert_called_once_with(self.base)
+        newBase = self.fun.randomSiteCube.return_value
+        self.assertEqual(newBase.name, "BaseBox")
+        self.assertEqual(self.fun.sampleAddBox.call_args.args[:2], ("merge", newBase))
+        self.fun.calBool.assert_called_once_with(newBase, self.addBox, "add")
+
+    def test_no_sample_cancels(self):
+        """Test that running out of attempts cancels without a boolean"""
+        self.fun.sampleAddBox.return_value = (None, self.props.max_attempts)
+        result, operator = self.execute(operators.Merge)
+
+        self.assertEqual(result, {"CANCELLED"})
+        self.fun.calBool.assert_not_called()
+        self.assertEqual(operator.report.call_args.args[0], {"WARNING"})
+
+
+class TestOffset(RuleTestCase):
+    """Test the Offset deformation rule"""
+
+    def test_shell_is_combined_once(self):
+        """Test that a solidified copy of BaseBox is added or subtracted in one boolean"""
+        for subtract, operation in ((True, "sub"), (False, "add")):
+            self.fun.reset_mock()
+            self.fun.randomBool.return_value = subtract
+            result, operator = self.execute(operators.Offset)
+
+            self.assertEqual(result, {"FINISHED"})
+            shell = self.fun.copyobj.return_value
+            self.fun.copyobj.assert_called_once_with(self.base)
+            self.fun.solidifyShell.assert_called_once_with(shell, 0.2, 0.2)
+            self.fun.calBool.assert_called_once_with(self.base, shell, operation)
+
+
+class TestCarve(RuleTestCase):
+    """Test the Carve culling rule"""
+
+    def test_subtracts_sampled_box(self):
+        """Test that the sampled box is subtracted with the configured proposal mode"""
+        result, operator = self.execute(operators.Carve)
+
+        self.assertEqual(result, {"FINISHED"})
+        args = self.fun.sampleAddBox.call_args.args
+        self.assertEqual(args[:2], ("carve", self.base))
+        self.assertEqual(args[-1], self.props.sample_mode)
+        self.fun.calBool.assert_called_once_with(self.base, self.addBox, "sub")
+
+    def test_no_sample_cancels(self):
+        """Test that running out of attempts cancels without a boolean"""
+        self.fun.sampleAddBox.return_value = (None, self.props.max_attempts)
+        result, operator = self.execute(operators.Carve)
+
+        self.assertEqual(result, {"CANCELLED"})
+        self.fun.calBool.assert_not_called()
+
+
+class TestFrature(RuleTestCase):
+    """Test the Frature culling rule"""
+
+    def test_single_boolean_with_l_wall(self):
+        """Test that the analytic L-shaped wall is subtracted with one boolean"""
+        self.fun.boundDiagonal.return_value = 4.0
+        result, operator = self.execute(operators.Frature)
+
+        self.assertEqual(result, {"FINISHED"})
+        self.fun.crateLWall.assert_called_once()
+        point, updir, dir1, dir2, width, length = self.fun.crateLWall.call_args.args
+        self.assertEqual((dir1, dir2), self.fun.randomVectors.return_value)
+        self.assertEqual(width, 0.2)
+        # The wall length follows the BaseBox diagonal
+        self.assertEqual(length, 4.0)
+        self.fun.boundDiagonal.assert_called_once_with(self.base)
+        self.fun.calBool.assert_called_once_with(self.base, self.fun.crateLWall.return_value, "sub")
+        self.fun.crateBoxWithDir.assert_not_called()
+        self.fun.offsetShell.assert_not_called()
+
+
+def run_all_rules_tests():
+    """Run all rule operator test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestMerge,
+        TestOffset,
+        TestCarve,
+        TestFrature,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_rules_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,153 @@
+"""
+Architectural Design Tool - Site Constraint Tests
+=================================================
+
+Unit tests for the analytic site checks (footprint polygon, setback and
+height limit) that rules run on sampled parameters before creating meshes.
+"""
+
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import sitecheck
+from directions import boxVerts
+
+SQUARE = [[0, 0], [10, 0], [10, 10], [0, 10]]
+# L-shaped site: the 10 x 10 square without its upper right 5 x 5 quarter
+L_SHAPE = [[0, 0], [10, 0], [10, 5], [5, 5], [5, 10], [0, 10]]
+
+
+def bounds(lo, hi):
+    return list(lo) + list(hi)
+
+
+class TestPolygon(unittest.TestCase):
+    """Test the polygon helpers"""
+
+    def test_convex_hull(self):
+        """Test that interior points are dropped and the hull is counter-clockwise"""
+        points = np.array(SQUARE + [[5, 5], [2, 3]], dtype=float)
+        hull = sitecheck.convexHull(points)
+        self.assertEqual(len(hull), 4)
+        self.assertAlmostEqual(sitecheck.signedArea(hull), 100)
+
+    def test_footprint_from_face_keeps_concave_outline(self):
+        """Test that a single-face site keeps its L shape and is made counter-clockwise"""
+        verts = np.array([[x, y, 2] for x, y in L_SHAPE], dtype=float)
+        loop = list(range(len(L_SHAPE)))[::-1]
+        outline = sitecheck.footprint(verts, loop)
+        self.assertEqual(len(outline), 6)
+        self.assertAlmostEqual(sitecheck.signedArea(outline), 75)
+        self.assertAlmostEqual(sitecheck.signedArea(sitecheck.footprint(verts)), 87.5)
+
+    def test_points_in_polygon(self):
+        """Test inside, outside and boundary points"""
+        inside = sitecheck.pointsInPolygon([[2, 2], [7, 7], [10, 2], [5, 7]], L_SHAPE)
+        self.assertEqual(inside.tolist(), [True, False, True, True])
+        strict = sitecheck.pointsInPolygon([[2, 2], [10, 2]], L_SHAPE, boundary=False)
+        self.assertEqual(strict.tolist(), [True, False])
+
+    def test_encoding_roundtrip(self):
+        """Test that outlines survive the props string"""
+        text = sitecheck.encodePolygon(L_SHAPE)
+        np.testing.assert_allclose(sitecheck.decodePolygon(text), L_SHAPE)
+        self.assertIsNone(sitecheck.decodePolygon(""))
+
+
+class TestSite(unittest.TestCase):
+    """Test candidate checks against site constraints"""
+
+    def test_box_inside_square(self):
+        """Test boxes inside, touching and crossing the boundary"""
+        site = sitecheck.Site(SQUARE)
+        self.assertTrue(site.fitsBounds(bounds((1, 1, 0), (4, 4, 3))))
+        self.assertTrue(site.fitsBounds(bounds((0, 0, 0), (10, 10, 3))))
+        self.assertFalse(site.fitsBounds(bounds((8, 8, 0), (11, 9, 3))))
+        self.assertEqual(site.rejected, 1)
+
+    def test_concave_corner(self):
+        """Test that a box over the missing quarter of an L-shaped site is rejected"""
+        site = sitecheck.Site(L_SHAPE)
+        self.assertTrue(site.fitsBounds(bounds((1, 1, 0), (9, 4, 1))))
+        # A box over the reflex corner (5, 5)
+        self.assertFalse(site.fitsBounds(bounds((4, 4, 0), (6, 6, 1))))
+        # A triangle whose corners are all inside while its long edge crosses the notch
+        self.assertFalse(site.fitsPoints([[4, 9, 0], [9, 4, 0], [1, 1, 0]]))
+
+    def test_setback(self):
+        """Test that boxes closer to the boundary than the setback are rejected"""
+        site = sitecheck.Site(SQUARE, setback=2)
+        self.assertTrue(site.fitsBounds(bounds((2, 2, 0), (8, 8, 1))))
+        self.assertFalse(site.fitsBounds(bounds((1, 2, 0), (8, 8, 1))))
+        self.assertEqual(site.region, (2, 2, 8, 8))
+
+        concave = sitecheck.Site(L_SHAPE, setback=1)
+        self.assertTrue(concave.fitsBounds(bounds((1, 1, 0), (4, 4, 1))))
+        # 0.5 from the reflex corner
+        self.assertFalse(concave.fitsBounds(bounds((1, 1, 0), (4.5, 4.5, 1))))
+
+    def test_height_limit(self):
+        """Test the height limit measured from the site base"""
+        site = sitecheck.Site(SQUARE, base=2, maxheight=5)
+        self.assertTrue(site.fitsBounds(bounds((1, 1, 2), (3, 3, 7))))
+        self.assertFalse(site.fitsBounds(bounds((1, 1, 2), (3, 3, 7.5))))
+
+        height_only = sitecheck.Site(None, maxheight=5)
+        self.assertIsNone(height_only.region)
+        self.assertTrue(height_only.fitsBounds(bounds((-100, -100, 0), (100, 100, 5))))
+
+    def test_rotated_box(self):
+        """Test a Branch style box given by its corner points"""
+        site = sitecheck.Site(SQUARE)
+        diagonal = np.array([1.0, 1.0, 0.0]) / np.sqrt(2)
+        corners = boxVerts(np.array([0, 0, 1.0]), diagonal, 1, 1, 6) + [2, 2, 0]
+        self.assertTrue(site.fitsPoints(corners))
+        corners = boxVerts(np.array([0, 0, 1.0]), diagonal, 1, 1, 12) + [2, 2, 0]
+        self.assertFalse(site.fitsPoints(corners))
+
+    def test_from_props(self):
+        """Test building the site from the addon properties"""
+        props = SimpleNamespace(
+            site_isenable=True,
+            site_polygon=sitecheck.encodePolygon(SQUARE),
+            site_base=1.0,
+            site_maxheight=20.0,
+            site_setback=0.5,
+        )
+        site = sitecheck.fromProps(props)
+        self.assertEqual(site.base, 1.0)
+        self.assertEqual(site.setback, 0.5)
+        np.testing.assert_allclose(site.polygon, SQUARE)
+
+        props.site_isenable = False
+        self.assertIsNone(sitecheck.fromProps(props))
+
+
+def run_all_sitecheck_tests():
+    """Run all site constraint test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestPolygon,
+        TestSite,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_sitecheck_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,27 @@
+"""
+Architectural Design Tool - Test Support
+========================================
+
+Imports addon modules through their package, the way Blender loads them,
+so relative imports resolve exactly as in production. The package
+__init__ is not run (it registers classes with bpy); test modules mock
+bpy, bmesh and mathutils themselves before importing Blender-dependent
+modules.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+addon_dir = os.path.dirname(os.path.abspath(__file__))
+PACKAGE = os.path.basename(addon_dir)
+
+
+def addonModule(name):
+    """Import <package>.<name> with the addon directory as a bare package"""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [addon_dir]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
@@ -0,0 +1,131 @@
+"""
+Architectural Design Tool - Sweep Tests
+=======================================
+
+Unit tests for expanding parameter sweep grids and merging worker manifests.
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from types import SimpleNamespace
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import sweep
+
+
+class TestExpandSweep(unittest.TestCase):
+    """Test grid and list expansion"""
+    
+    def test_grid_is_cartesian_product(self):
+        """Test that a grid expands to every combination in key order"""
+        configs = sweep.expandSweep({
+            "grid": {"min_size": [0.3, 0.5], "twist_maxangle": [0.5, 1.0, 1.5]},
+        })
+        
+        self.assertEqual(len(configs), 6)
+        self.assertEqual(configs[0], {"min_size": 0.3, "twist_maxangle": 0.5})
+        self.assertEqual(configs[-1], {"min_size": 0.5, "twist_maxangle": 1.5})
+    
+    def test_base_applies_to_every_config(self):
+        """Test that base overrides are merged under grid and list values"""
+        configs = sweep.expandSweep({
+            "base": {"auto_count": 3, "min_size": 1.0},
+            "grid": {"min_size": [0.3]},
+            "list": [{"max_size": 2.0}],
+        })
+        
+        self.assertEqual(configs, [
+            {"auto_count": 3, "min_size": 0.3},
+            {"auto_count": 3, "min_size": 1.0, "max_size": 2.0},
+        ])
+    
+    def test_bare_list(self):
+        """Test that a bare JSON list is used as-is"""
+        configs = sweep.expandSweep([{"min_size": 0.3}, {"min_size": 0.5}])
+        self.assertEqual(configs, [{"min_size": 0.3}, {"min_size": 0.5}])
+    
+    def test_load_from_file(self):
+        """Test loading a sweep definition from JSON"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sweep.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"grid": {"expland_maxoffset": [1, 2]}}, f)
+            
+            self.assertEqual(len(sweep.loadSweep(path)), 2)
+
+
+class TestOverrides(unittest.TestCase):
+    """Test applying and restoring property overrides"""
+    
+    def test_apply_and_restore(self):
+        """Test that applyOverrides returns the values needed to restore"""
+        props = SimpleNamespace(min_size=0.5, max_size=1.0)
+        
+        old = sweep.applyOverrides(props, {"min_size": 0.2})
+        self.assertEqual(props.min_size, 0.2)
+        
+        sweep.applyOverrides(props, old)
+        self.assertEqual(props.min_size, 0.5)
+        self.assertEqual(props.max_size, 1.0)
+    
+    def test_unknown_keys(self):
+        """Test detection of misspelled property names"""
+        props = SimpleNamespace(min_size=0.5)
+        unknown = sweep.unknownKeys(props, [{"min_size": 1}, {"min_szie": 2}])
+        self.assertEqual(unknown, ["min_szie"])
+
+
+class TestShards(unittest.TestCase):
+    """Test splitting configs across workers and merging results"""
+    
+    def test_split_round_robin(self):
+        """Test that every config lands in exactly one shard"""
+        configs = [{"min_size": i} for i in range(5)]
+        shards = sweep.splitShards(configs, 2)
+        
+        self.assertEqual(len(shards), 2)
+        indices = sorted(index for shard in shards for index, _ in shard)
+        self.assertEqual(indices, [0, 1, 2, 3, 4])
+    
+    def test_split_more_workers_than_configs(self):
+        """Test that empty shards are dropped"""
+        shards = sweep.splitShards([{"min_size": 1}], 4)
+        self.assertEqual(len(shards), 1)
+    
+    def test_merge_sorted_by_config(self):
+        """Test that merged manifests are ordered by config index"""
+        parts = [
+            {"configs": [{"config": 1}, {"config": 3}]},
+            {"configs": [{"config": 0}, {"config": 2}]},
+        ]
+        manifest = sweep.mergeManifests("sweep.json", parts)
+        self.assertEqual([entry["config"] for entry in manifest["configs"]], [0, 1, 2, 3])
+
+
+def run_all_sweep_tests():
+    """Run all sweep test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestExpandSweep,
+        TestOverrides,
+        TestShards,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_sweep_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,170 @@
+"""
+Architectural Design Tool - Shared Memory Transport Tests
+=========================================================
+
+Unit tests for passing mesh arrays between processes through
+multiprocessing.shared_memory.
+"""
+
+import unittest
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+from test_support import addonModule
+
+transport = addonModule("transport")
+dataset = addonModule("dataset")
+DatasetReader, DatasetWriter = dataset.DatasetReader, dataset.DatasetWriter
+
+
+def gone(descriptor):
+    try:
+        transport.receive(descriptor).close()
+    except FileNotFoundError:
+        return True
+    return False
+
+
+class TestSharedArrays(unittest.TestCase):
+    """Test writing and mapping named arrays"""
+
+    def setUp(self):
+        self.verts = np.random.default_rng(0).random((7, 3)).astype(np.float32)
+        self.faces = np.array([[0, 1, 2], [2, 3, 4], [4, 5, 6]], dtype=np.int32)
+
+    def test_layout_is_aligned(self):
+        """Test that every array starts on an aligned offset"""
+        fields, size = transport.layout({"verts": self.verts, "faces": self.faces})
+        self.assertEqual([field[0] for field in fields], ["verts", "faces"])
+        for name, dtype, shape, offset in fields:
+            self.assertEqual(offset % transport.ALIGN, 0)
+        self.assertGreaterEqual(size, self.verts.nbytes + self.faces.nbytes)
+
+    def test_roundtrip_zero_copy(self):
+        """Test that the reader maps the writer's data without copying"""
+        block = transport.share(verts=self.verts, faces=self.faces)
+        reader = transport.receive(json.loads(json.dumps(block.descriptor)))
+
+        verts = reader["verts"]
+        np.testing.assert_array_equal(verts, self.verts)
+        np.testing.assert_array_equal(reader["faces"], self.faces)
+        self.assertFalse(verts.flags["OWNDATA"])
+        self.assertEqual(verts.dtype, np.float32)
+
+        # Both sides see the same memory
+        block["verts"][0, 0] = 42
+        self.assertEqual(verts[0, 0], 42)
+
+        del verts
+        reader.close()
+        block.close()
+        block.unlink()
+        self.assertTrue(gone(block.descriptor))
+
+    def test_empty_arrays(self):
+        """Test that empty meshes can be shared"""
+        block = transport.share(verts=np.empty((0, 3), np.float32), faces=np.empty((0, 3), np.int32))
+        self.assertEqual(block["verts"].shape, (0, 3))
+        self.assertEqual(block["faces"].shape, (0, 3))
+        block.close()
+        block.unlink()
+
+    def test_contains(self):
+        """Test optional polygon fields"""
+        block = transport.share(verts=self.verts, faces=self.faces)
+        self.assertIn("faces", block)
+        self.assertNotIn("loops", block)
+        block.close()
+        block.unlink()
+
+    def test_release(self):
+        """Test that discarded results are deleted and double release is harmless"""
+        block = transport.share(verts=self.verts)
+        descriptor = block.descriptor
+        block.close()
+        transport.release(descriptor)
+        self.assertTrue(gone(descriptor))
+        transport.release(descriptor)
+
+    def test_other_process_reads(self):
+        """Test that another process reads the arrays and frees the block"""
+        block = transport.share(verts=self.verts, faces=self.faces)
+        code = (
+            "import sys, json; sys.path.insert(0, sys.argv[1]); import transport;"
+            "b = transport.receive(json.loads(sys.argv[2]));"
+            "print(float(b['verts'].sum()), int(b['faces'].sum()));"
+            "b.close(); b.unlink()"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, os.path.abspath(addon_dir), json.dumps(block.descriptor)],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stderr, "")
+        total, face_total = result.stdout.split()
+        self.assertAlmostEqual(float(total), float(self.verts.sum()), places=4)
+        self.assertEqual(int(face_total), int(self.faces.sum()))
+
+        block.close()
+        self.assertTrue(gone(block.descriptor))
+
+    def test_meshBounds(self):
+        """Test bounds in the cachedBounds layout"""
+        verts = np.array([[0, -1, 2], [3, 1, -2]], dtype=np.float32)
+        self.assertEqual(transport.meshBounds(verts), [0, -1, -2, 3, 1, 2])
+        self.assertIsNone(transport.meshBounds(np.empty((0, 3))))
+
+
+class TestDatasetExport(unittest.TestCase):
+    """Test exporting shared worker results to the dataset"""
+
+    def test_addShared(self):
+        """Test that a shared model is copied into the dataset and freed"""
+        verts = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32)
+        faces = np.array([[0, 1, 2]], dtype=np.int32)
+        block = transport.share(verts=verts, faces=faces)
+        descriptor = block.descriptor
+        block.close()
+
+        with tempfile.TemporaryDirectory() as path:
+            with DatasetWriter(path, shard_size=10) as writer:
+                writer.addShared(descriptor, [0, 3], {"index": 0})
+            self.assertTrue(gone(descriptor))
+
+            reader = DatasetReader(path)
+            model_verts, model_faces = reader.model(0)
+            np.testing.assert_array_equal(model_verts, verts)
+            np.testing.assert_array_equal(model_faces, faces)
+            del model_verts, model_faces, reader
+
+
+def run_all_transport_tests():
+    """Run all shared memory transport test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestSharedArrays,
+        TestDatasetExport,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_transport_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,161 @@
+"""
+Architectural Design Tool - Validity Tests
+==========================================
+
+Unit tests for the NumPy mesh validity checks run after every rule.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+from test_support import addonModule
+
+validity = addonModule("validity")
+
+
+def cube(size=1.0, origin=(0, 0, 0)):
+    """Closed unit cube with outward facing triangles"""
+    verts = np.array(
+        [[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64
+    ) * size + origin
+    quads = [
+        (0, 1, 3, 2),  # -x
+        (4, 6, 7, 5),  # +x
+        (0, 4, 5, 1),  # -y
+        (2, 3, 7, 6),  # +y
+        (0, 2, 6, 4),  # -z
+        (1, 5, 7, 3),  # +z
+    ]
+    tris = np.array([t for a, b, c, d in quads for t in ((a, b, c), (a, c, d))], dtype=np.int32)
+    return verts, tris
+
+
+def torus(rings=8, sides=6):
+    """Closed torus, Euler characteristic 0"""
+    u, v = np.meshgrid(np.arange(rings), np.arange(sides), indexing="ij")
+    a = 2 * np.pi * u / rings
+    b = 2 * np.pi * v / sides
+    r = 3 + np.cos(b)
+    verts = np.stack([r * np.cos(a), r * np.sin(a), np.sin(b)], axis=-1).reshape(-1, 3)
+
+    def index(i, j):
+        return (i % rings) * sides + (j % sides)
+
+    tris = []
+    for i in range(rings):
+        for j in range(sides):
+            p, q, r_, s = index(i, j), index(i + 1, j), index(i + 1, j + 1), index(i, j + 1)
+            tris += [(p, q, r_), (p, r_, s)]
+    return verts, np.array(tris, dtype=np.int32)
+
+
+class TestInspect(unittest.TestCase):
+    """Test volume, Euler characteristic and edge statistics"""
+
+    def test_cube(self):
+        """Test a closed cube"""
+        stats = validity.inspect(*cube(2.0))
+        self.assertAlmostEqual(stats["volume"], 8.0)
+        self.assertEqual(stats["euler"], 2)
+        self.assertEqual(stats["edges"], 18)
+        self.assertEqual(stats["boundary"], 0)
+        self.assertEqual(stats["nonmanifold"], 0)
+        self.assertIsNone(validity.problem(stats))
+
+    def test_volume_is_translation_invariant(self):
+        """Test that the signed volume does not depend on the position"""
+        self.assertAlmostEqual(validity.inspect(*cube(1.0, (5, -3, 2)))["volume"], 1.0)
+
+    def test_torus(self):
+        """Test a closed genus-1 surface"""
+        verts, tris = torus()
+        stats = validity.inspect(verts, tris)
+        self.assertEqual(stats["euler"], 0)
+        self.assertGreater(stats["volume"], 0)
+        self.assertIsNone(validity.problem(stats))
+
+    def test_unused_vertices_are_ignored(self):
+        """Test that loose vertices do not change the Euler characteristic"""
+        verts, tris = cube()
+        verts = np.vstack([verts, [[9, 9, 9]]])
+        self.assertEqual(validity.inspect(verts, tris)["euler"], 2)
+
+
+class TestProblem(unittest.TestCase):
+    """Test the reasons a mesh is rejected"""
+
+    def test_empty(self):
+        """Test that an empty result is rejected"""
+        stats = validity.inspect(np.empty((0, 3)), np.empty((0, 3), dtype=np.int32))
+        self.assertEqual(validity.problem(stats), "空网格")
+
+    def test_open(self):
+        """Test that a mesh with a missing face is rejected as open"""
+        verts, tris = cube()
+        stats = validity.inspect(verts, tris[2:])
+        self.assertEqual(stats["boundary"], 4)
+        self.assertIn("开放边", validity.problem(stats))
+        self.assertNotIn("开放边", validity.problem(stats, manifold=False) or "")
+
+    def test_nonmanifold(self):
+        """Test that an edge shared by more than two faces is rejected"""
+        verts, tris = cube()
+        verts = np.vstack([verts, [[0.5, -1, 0.5]]])
+        tris = np.vstack([tris, [[0, 1, 8], [1, 0, 8]]])
+        stats = validity.inspect(verts, tris)
+        self.assertEqual(stats["nonmanifold"], 1)
+        self.assertIn("非流形边", validity.problem(stats))
+
+    def test_pinched_vertex(self):
+        """Test that two cubes sharing only a corner give an odd Euler characteristic"""
+        verts_a, tris_a = cube()
+        verts_b, tris_b = cube(1.0, (1, 1, 1))
+        # The last corner of the first cube is the first corner of the second
+        verts = np.vstack([verts_a, verts_b[1:]])
+        tris_b = np.where(tris_b == 0, 7, tris_b + 7)
+        stats = validity.inspect(verts, np.vstack([tris_a, tris_b]))
+        self.assertEqual(stats["boundary"], 0)
+        self.assertEqual(stats["euler"], 3)
+        self.assertIn("欧拉数", validity.problem(stats))
+
+    def test_inverted(self):
+        """Test that inward facing normals are rejected"""
+        verts, tris = cube()
+        stats = validity.inspect(verts, tris[:, ::-1])
+        self.assertAlmostEqual(stats["volume"], -1.0)
+        self.assertIn("法线反向", validity.problem(stats))
+
+    def test_flat(self):
+        """Test that a zero-volume result is rejected"""
+        verts, tris = cube()
+        verts[:, 2] = 0
+        self.assertIn("体积过小", validity.problem(validity.inspect(verts, tris), min_volume=1e-6))
+
+
+def run_all_validity_tests():
+    """Run all validity test suites"""
+    test_suite = unittest.TestSuite()
+
+    test_classes = [
+        TestInspect,
+        TestProblem,
+    ]
+
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_validity_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
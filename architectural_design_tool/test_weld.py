@@ -0,0 +1,112 @@
+"""
+Architectural Design Tool - Weld Tests
+======================================
+
+Unit tests for the spatial-hash merge-by-distance used by optimizeMesh.
+"""
+
+import unittest
+import sys
+import os
+from itertools import combinations
+import numpy as np
+
+# Add the addon directory to the path
+addon_dir = os.path.dirname(__file__)
+sys.path.insert(0, addon_dir)
+
+import weld
+
+
+class TestClosePairs(unittest.TestCase):
+    """Test neighbour search on the hash grid"""
+    
+    def test_matches_brute_force(self):
+        """Test that every pair within the distance is found exactly once"""
+        rng = np.random.default_rng(3)
+        points = rng.random((300, 3)) * 0.05
+        dist = 0.005
+        
+        i, j = weld.closePairs(points, dist)
+        found = set(zip(i.tolist(), j.tolist()))
+        expected = {
+            (a, b)
+            for a, b in combinations(range(len(points)), 2)
+            if np.sum((points[a] - points[b]) ** 2) <= dist * dist
+        }
+        
+        self.assertEqual(found, expected)
+        self.assertEqual(len(found), len(i))
+    
+    def test_degenerate_input(self):
+        """Test empty input and non-positive distance"""
+        i, j = weld.closePairs(np.zeros((1, 3)), 0.1)
+        self.assertEqual(len(i), 0)
+        i, j = weld.closePairs(np.zeros((5, 3)), 0)
+        self.assertEqual(len(j), 0)
+
+
+class TestWeldMap(unittest.TestCase):
+    """Test cluster labelling and the weld map"""
+    
+    def test_chain_collapses_to_lowest_index(self):
+        """Test that a chain of close points merges into one cluster"""
+        labels = weld.clusterLabels(5, np.array([3, 2, 1]), np.array([4, 3, 2]))
+        np.testing.assert_array_equal(labels, [0, 1, 1, 1, 1])
+    
+    def test_duplicates_merge(self):
+        """Test that near-duplicate vertices map onto the original"""
+        rng = np.random.default_rng(0)
+        points = rng.random((1000, 3)) * 10
+        coords = np.vstack([points, points[:50] + 1e-5])
+        
+        sources, targets = weld.weldMap(coords, 0.001)
+        
+        np.testing.assert_array_equal(np.sort(sources), np.arange(1000, 1050))
+        np.testing.assert_array_equal(targets[np.argsort(sources)], np.arange(50))
+    
+    def test_candidates_restrict_region(self):
+        """Test that only vertices inside the seam region are welded"""
+        coords = np.array(
+            [[0, 0, 0], [0, 0, 1e-5], [5, 5, 5], [5, 5, 5 + 1e-5]], dtype=np.float64
+        )
+        candidates = weld.regionIndices(coords, (4, 4, 4, 6, 6, 6), margin=0.002)
+        
+        sources, targets = weld.weldMap(coords, 0.001, candidates)
+        
+        np.testing.assert_array_equal(candidates, [2, 3])
+        np.testing.assert_array_equal(sources, [3])
+        np.testing.assert_array_equal(targets, [2])
+    
+    def test_nearIndices_dilates_seeds(self):
+        """Test that vertices next to dirty vertices become candidates"""
+        coords = np.array(
+            [[0, 0, 0], [0.0005, 0, 0], [1, 1, 1], [1, 1, 1.0005]], dtype=np.float64
+        )
+        
+        near = weld.nearIndices(coords, [1], 0.002)
+        
+        np.testing.assert_array_equal(near, [0, 1])
+        np.testing.assert_array_equal(weld.nearIndices(coords, [], 0.002), [])
+
+
+def run_all_weld_tests():
+    """Run all weld test suites"""
+    test_suite = unittest.TestSuite()
+    
+    test_classes = [
+        TestClosePairs,
+        TestWeldMap,
+    ]
+    
+    for test_class in test_classes:
+        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
+        test_suite.addTests(tests)
+    
+    runner = unittest.TextTestRunner(verbosity=2)
+    return runner.run(test_suite)
+
+
+if __name__ == '__main__':
+    result = run_all_weld_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,127 @@
+"""共享内存网格传输：进程间交换顶点/面数组，不经过JSON、pickle或临时文件
+
+一块共享内存存放若干命名数组（16字节对齐），描述符只含块名和各数组的
+(名称, dtype, 形状, 偏移)，可随JSON行协议发送：
+
+    {"shm": "psm_xxx", "fields": [["verts", "<f4", [N, 3], 0], ["faces", "<i4", [M, 3], 64], ...]}
+
+写入方 share() 复制一次，读取方 receive() 得到直接映射共享内存的数组视图。
+网格沿用导出和包围盒使用的布局：verts (N,3) float32 世界坐标、faces (M,3) int32 三角面，
+需要保留多边形时另含 loops/starts（见 functions.shareMesh）。
+
+所有权：块由读取方在用完后 unlink()；写入方在对方读取前必须保持自己的句柄
+（Windows上最后一个句柄关闭时共享内存即被释放）。视图存活时不能 close()。
+"""
+
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+ALIGN = 16
+
+
+def _untrack(shm):
+    # 所有权随描述符移交，不让本进程的resource_tracker在退出时删除或告警
+    if shared_memory._USE_POSIX:
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+
+def layout(arrays):
+    """OutPut:(fields, 总字节数)，fields为[名称, dtype, 形状, 偏移]列表"""
+    fields = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        fields.append([name, array.dtype.str, list(array.shape), offset])
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    return fields, offset
+
+
+class SharedArrays:
+    """一块共享内存中的若干命名数组，block[name] 返回零拷贝视图"""
+
+    def __init__(self, shm, fields):
+        self.shm = shm
+        self.fields = {name: (dtype, tuple(shape), offset) for name, dtype, shape, offset in fields}
+
+    @classmethod
+    def create(cls, arrays):
+        """新建共享内存并写入arrays（{名称: 数组}）"""
+        fields, size = layout(arrays)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        _untrack(shm)
+        block = cls(shm, fields)
+        for name, array in arrays.items():
+            view = block[name]
+            view[...] = array
+            del view
+        return block
+
+    @classmethod
+    def attach(cls, descriptor):
+        """按描述符映射已有的共享内存"""
+        shm = shared_memory.SharedMemory(name=descriptor["shm"])
+        _untrack(shm)
+        return cls(shm, descriptor["fields"])
+
+    @property
+    def descriptor(self):
+        return {
+            "shm": self.shm.name,
+            "fields": [[name, dtype, list(shape), offset] for name, (dtype, shape, offset) in self.fields.items()],
+        }
+
+    def __contains__(self, name):
+        return name in self.fields
+
+    def __getitem__(self, name):
+        dtype, shape, offset = self.fields[name]
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+
+    def close(self):
+        """释放本进程的映射（之前取得的视图必须已释放）"""
+        self.shm.close()
+
+    def unlink(self):
+        """删除共享内存块（由最后的读取方调用）"""
+        if shared_memory._USE_POSIX:
+            # unlink() 会注销跟踪，先补回注册
+            resource_tracker.register(self.shm._name, "shared_memory")
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def share(**arrays):
+    """OutPut:写好数组的SharedArrays，把 .descriptor 发给读取方"""
+    return SharedArrays.create(arrays)
+
+
+def receive(descriptor):
+    """OutPut:映射描述符所指共享内存的SharedArrays"""
+    return SharedArrays.attach(descriptor)
+
+
+def release(descriptor):
+    """不读取直接删除描述符所指的共享内存（丢弃的结果），块已不存在时忽略"""
+    try:
+        block = SharedArrays.attach(descriptor)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def meshBounds(verts):
+    """OutPut:verts的包围盒 [minx, miny, minz, maxx, maxy, maxz]（与cachedBounds相同），空网格为None"""
+    verts = np.asarray(verts).reshape(-1, 3)
+    if not len(verts):
+        return None
+    return verts.min(axis=0).tolist() + verts.max(axis=0).tolist()
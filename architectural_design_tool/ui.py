@@ -20,11 +20,20 @@ class Auto_panel(bpy.types.Panel):
         box.prop(props, "auto_deformation_count", text="形变执行次数")
         box.prop(props, "auto_culling_count", text="剔除执行次数")
         box.prop(props, "auto_isorder", text="是否按序执行")
+        box.prop(props, "auto_seed", text="随机种子")
         
         # 保存选项区域
         box = layout.box()
         box.label(text="保存选项:")
         box.prop(props, "auto_isarrange", text="是否在场景中展示")
+        if props.auto_isarrange:
+            box.prop(props, "lod_isenable", text="生成LOD代理")
+            if props.lod_isenable:
+                box.prop(props, "lod_resolution", text="代理精度")
+                box.prop(props, "lod_default", text="默认代理")
+                box.prop(props, "lod_distance", text="原始网格距离")
+                box.prop(props, "lod_isauto", text="自动切换")
+                box.operator("ronge_adt.update_lod", text="更新LOD")
         box.prop(props, "auto_issave", text="是否自动保存")
         if props.auto_issave:
             # 使用两列布局，一行显示路径，一行显示按钮
@@ -33,9 +42,59 @@ class Auto_panel(bpy.types.Panel):
             
             row = box.row()
             row.operator("ronge_adt.browse_save_path", text="浏览文件夹", icon='FILE_FOLDER')
+            
+            box.prop(props, "auto_saveformat", text="保存格式")
+            if props.auto_saveformat == "DATASET":
+                box.prop(props, "auto_shardsize", text="分片大小")
+        
+        # 度量筛选区域
+        box = layout.box()
+        box.prop(props, "filter_isenable", text="按度量筛选")
+        if props.filter_isenable:
+            box.prop(props, "filter_maxfootprint", text="最大占地面积")
+            box.prop(props, "filter_maxheight", text="最大高度")
+            box.prop(props, "filter_mincompactness", text="最小紧凑度")
+        
+        # 去重区域
+        box = layout.box()
+        box.prop(props, "dedup_isenable", text="剔除重复模型")
+        if props.dedup_isenable:
+            box.prop(props, "dedup_tolerance", text="指纹容差")
+            box.prop(props, "dedup_mode", text="处理方式")
+            if props.dedup_mode == "REGENERATE":
+                box.prop(props, "dedup_retries", text="最大重试次数")
         
         # 执行按钮
         layout.operator("ronge_adt.auto", text="开始自动生成")
+        
+        box = layout.box()
+        box.prop(props, "auto_chunktime", text="每块时长")
+        if props.auto_isrunning:
+            box.progress(factor=props.auto_progress, text=props.auto_progress_text)
+            box.label(text="按Esc取消")
+        else:
+            box.operator("ronge_adt.auto_modal", text="分块生成（可取消）")
+            if props.auto_issave:
+                op = box.operator("ronge_adt.auto_modal", text="断点续跑")
+                op.resume = True
+        
+        # 参数扫描区域
+        box = layout.box()
+        box.label(text="参数扫描:")
+        box.prop(props, "sweep_path", text="扫描配置")
+        box.prop(props, "sweep_workers", text="后台进程数")
+        box.operator("ronge_adt.sweep", text="开始参数扫描")
+        
+        # 结果浏览区域
+        box = layout.box()
+        box.label(text="结果浏览:")
+        box.prop(props, "browse_path", text="数据集")
+        row = box.row()
+        row.prop(props, "browse_centerx", text="X")
+        row.prop(props, "browse_centery", text="Y")
+        box.prop(props, "browse_radius", text="窗口半径")
+        box.prop(props, "browse_spacing", text="间距")
+        box.operator("ronge_adt.load_results", text="载入窗口内结果")
 
 
 class Prop_panel(bpy.types.Panel):
@@ -63,6 +122,40 @@ class Prop_panel(bpy.types.Panel):
         box.prop(props, "max_area", text="最大生成范围")
         box.prop(props, "max_attempts", text="最大尝试次数")
         box.prop(props, "add_box_size", text="附加体比例")
+        box.prop(props, "sample_mode", text="采样方式")
+        
+        box = layout.box()
+        box.label(text="场地约束（Merge/Branch/Extract/Offset）:")
+        box.prop(props, "site_isenable", text="启用")
+        box.operator("ronge_adt.set_site", text="设置激活物体为场地")
+        if props.site_isenable:
+            box.label(text="已设置轮廓" if props.site_polygon else "未设置轮廓，仅限高")
+            box.prop(props, "site_base", text="地面高度")
+            box.prop(props, "site_maxheight", text="限高")
+            box.prop(props, "site_setback", text="退线距离")
+        
+        box = layout.box()
+        box.label(text="复杂度预算:")
+        box.prop(props, "budget_maxverts", text="顶点预算")
+        box.prop(props, "budget_angle", text="融并角度")
+        box.prop(props, "budget_iscollapse", text="超出时塌陷")
+        box.prop(props, "watchdog_isenable", text="单模型看门狗")
+        if props.watchdog_isenable:
+            box.prop(props, "watchdog_seconds", text="单模型时限（秒）")
+            box.prop(props, "watchdog_maxverts", text="单模型顶点上限")
+        box.prop(props, "validity_isenable", text="规则后检查有效性")
+        if props.validity_isenable:
+            box.prop(props, "validity_manifold", text="要求流形")
+            box.prop(props, "validity_minvolume", text="最小体积")
+            box.prop(props, "validity_retries", text="重试次数")
+        
+        box = layout.box()
+        box.label(text="并行候选（Extract/Carve）:")
+        box.prop(props, "pool_isenable", text="启用")
+        if props.pool_isenable:
+            box.prop(props, "pool_workers", text="后台进程数")
+            box.prop(props, "pool_candidates", text="候选数")
+            box.prop(props, "pool_timeout", text="超时（秒）")
 
 
 class Merge_panel(bpy.types.Panel):
@@ -0,0 +1,60 @@
+"""网格有效性检查：每条规则后用foreach_get读出的三角网格数组一次性计算
+
+    体积      有向体积（各三角面与原点构成的四面体体积之和），法线反向时为负
+    欧拉数    V - E + F（只统计被三角面引用的顶点），闭合可定向网格每个连通块贡献 2 - 2*亏格
+    边统计    只属于1个面的边为开放边，属于3个及以上面的边为非流形边
+
+全部为NumPy向量运算，代价与一次 foreach_get 相当，远小于一次布尔运算。
+"""
+
+import numpy as np
+
+from . import fingerprint
+
+
+def edgeCounts(tris):
+    """OutPut:每条无向边被三角面引用的次数"""
+    tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+    if not len(tris):
+        return np.empty(0, dtype=np.int64)
+    edges = np.concatenate([tris[:, [0, 1]], tris[:, [1, 2]], tris[:, [2, 0]]])
+    edges.sort(axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    return counts
+
+
+def inspect(verts, tris):
+    """OutPut:{verts, faces, edges, euler, boundary, nonmanifold, volume}"""
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    tris = np.asarray(tris, dtype=np.int64).reshape(-1, 3)
+    counts = edgeCounts(tris)
+    used = len(np.unique(tris)) if len(tris) else 0
+    return {
+        "verts": used,
+        "faces": len(tris),
+        "edges": len(counts),
+        "euler": used - len(counts) + len(tris),
+        "boundary": int(np.count_nonzero(counts == 1)),
+        "nonmanifold": int(np.count_nonzero(counts > 2)),
+        "volume": fingerprint.signedVolume(verts, tris),
+    }
+
+
+def problem(stats, min_volume=0.0, manifold=True):
+    """OutPut:网格无效的原因，有效时为None
+
+    manifold为True时要求网格闭合且每条边恰好属于两个面
+    """
+    if stats["faces"] == 0:
+        return "空网格"
+    if manifold and stats["nonmanifold"]:
+        return f"{stats['nonmanifold']}条非流形边"
+    if manifold and stats["boundary"]:
+        return f"{stats['boundary']}条开放边"
+    if manifold and stats["euler"] % 2:
+        return f"欧拉数{stats['euler']}为奇数"
+    if stats["volume"] < 0:
+        return f"体积为负（{stats['volume']:.4g}），法线反向"
+    if stats["volume"] <= min_volume:
+        return f"体积过小（{stats['volume']:.4g}）"
+    return None
@@ -0,0 +1,138 @@
+"""按距离合并顶点：基于均匀空间哈希网格的NumPy实现
+
+只在候选顶点（通常是上一次布尔运算接缝附近的顶点）之间查找近邻，
+代价与候选数量成正比，而不是与整个网格成正比。
+"""
+
+import numpy as np
+
+# 3x3x3 邻域偏移
+NEIGHBOR_OFFSETS = np.array(
+    [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)],
+    dtype=np.int64,
+)
+
+# 3x3x3 邻域中字典序不小于(0,0,0)的一半，每对相邻格子只检查一次
+HALF_OFFSETS = np.array(
+    [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        for dz in (-1, 0, 1)
+        if (dx, dy, dz) >= (0, 0, 0)
+    ],
+    dtype=np.int64,
+)
+
+
+def regionIndices(coords, region, margin=0.0):
+    """OutPut:落在包围盒region内的顶点索引
+
+    region:(minx, miny, minz, maxx, maxy, maxz)
+    """
+    lo = np.asarray(region[:3]) - margin
+    hi = np.asarray(region[3:]) + margin
+    inside = np.all((coords >= lo) & (coords <= hi), axis=1)
+    return np.nonzero(inside)[0]
+
+
+def _cellKeys(cells, lo, span):
+    shifted = cells - lo
+    return (shifted[:, 0] * span[1] + shifted[:, 1]) * span[2] + shifted[:, 2]
+
+
+def nearIndices(coords, seeds, dist):
+    """OutPut:与seeds中任一顶点位于相邻网格（格长dist）内的顶点索引，包含seeds本身"""
+    seeds = np.asarray(seeds, dtype=np.int64)
+    if not len(seeds) or dist <= 0:
+        return seeds
+
+    cells = np.floor(coords / dist).astype(np.int64)
+    lo = cells.min(axis=0) - 1
+    span = cells.max(axis=0) - lo + 2
+
+    seed_cells = np.unique(cells[seeds], axis=0)
+    near = np.unique(
+        np.concatenate([_cellKeys(seed_cells + offset, lo, span) for offset in NEIGHBOR_OFFSETS])
+    )
+    return np.nonzero(np.isin(_cellKeys(cells, lo, span), near))[0]
+
+
+def closePairs(points, dist):
+    """OutPut:距离不超过dist的点对 (i, j)，i < j"""
+    count = len(points)
+    if count < 2 or dist <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    cells = np.floor(points / dist).astype(np.int64)
+    lo = cells.min(axis=0) - 1
+    span = cells.max(axis=0) - lo + 2
+
+    keys = _cellKeys(cells, lo, span)
+    order = np.argsort(keys, kind="stable")
+    # 非空格子：键、首个点在order中的位置、点数
+    uniq, first, size = np.unique(keys[order], return_index=True, return_counts=True)
+    ucells = cells[order[first]]
+
+    dist2 = dist * dist
+    pairs_i = []
+    pairs_j = []
+
+    for offset in HALF_OFFSETS:
+        neighbor = _cellKeys(ucells + offset, lo, span)
+        pos = np.minimum(np.searchsorted(uniq, neighbor), len(uniq) - 1)
+        a = np.nonzero(uniq[pos] == neighbor)[0]
+        b = pos[a]
+
+        # 展开两个格子之间的全部点对
+        total = size[a] * size[b]
+        pair = np.repeat(np.arange(len(a)), total)
+        local = np.arange(total.sum()) - np.repeat(np.cumsum(total) - total, total)
+        ia = local // size[b][pair]
+        ib = local % size[b][pair]
+        if not offset.any():
+            keep = ia < ib
+            pair, ia, ib = pair[keep], ia[keep], ib[keep]
+
+        i = order[first[a][pair] + ia]
+        j = order[first[b][pair] + ib]
+        delta = points[i] - points[j]
+        close = np.einsum("ij,ij->i", delta, delta) <= dist2
+        i, j = i[close], j[close]
+        pairs_i.append(np.minimum(i, j))
+        pairs_j.append(np.maximum(i, j))
+
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def clusterLabels(count, pairs_i, pairs_j):
+    """连通分量标记，OutPut:每个点所在分量的最小点序号"""
+    labels = np.arange(count)
+    if len(pairs_i) == 0:
+        return labels
+
+    while True:
+        low = np.minimum(labels[pairs_i], labels[pairs_j])
+        updated = labels.copy()
+        np.minimum.at(updated, pairs_i, low)
+        np.minimum.at(updated, pairs_j, low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def weldMap(coords, dist, candidates=None):
+    """OutPut:(源顶点索引, 目标顶点索引) 两个数组，源顶点应合并到目标顶点
+
+    candidates 为参与合并的顶点索引，None表示全部顶点
+    """
+    if candidates is None:
+        candidates = np.arange(len(coords))
+    candidates = np.asarray(candidates, dtype=np.int64)
+
+    pairs_i, pairs_j = closePairs(coords[candidates], dist)
+    labels = clusterLabels(len(candidates), pairs_i, pairs_j)
+
+    moved = np.nonzero(labels != np.arange(len(candidates)))[0]
+    return candidates[moved], candidates[labels[moved]]
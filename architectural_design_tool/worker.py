@@ -0,0 +1,128 @@
+"""后台worker入口，由协调进程以 blender -b 启动
+
+    blender -b --factory-startup --python architectural_design_tool/worker.py -- sweep <job.json> <shard> <output_dir>
+    blender -b --factory-startup --python architectural_design_tool/worker.py -- serve
+
+serve 为常驻模式，协议见 pool.py
+"""
+
+import importlib
+import json
+import os
+import random
+import sys
+
+import bpy
+
+
+def loadAddon():
+    """注册插件并返回包名"""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(package_dir))
+    package = os.path.basename(package_dir)
+
+    addon = importlib.import_module(package)
+    try:
+        addon.register()
+    except ValueError:
+        pass  # 已注册
+    return package
+
+
+def clearScene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def runSweep(job_path, shard, output_dir):
+    package = loadAddon()
+    pipeline = importlib.import_module(package + ".pipeline")
+    sweep = importlib.import_module(package + ".sweep")
+
+    with open(job_path, "r", encoding="utf-8") as f:
+        job = json.load(f)
+
+    shard = int(shard)
+    props = bpy.context.scene.adt_props
+    sweep.applyOverrides(props, job["base_props"])
+    clearScene()
+
+    manifest = sweep.newManifest(job["source"])
+    manifest["configs"] = pipeline.runConfigs(props, job["shards"][shard], worker=shard)
+    sweep.saveManifest(manifest, os.path.join(output_dir, f"sweep_manifest_{shard}.json"))
+
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.join(output_dir, f"sweep_{shard}.blend"))
+
+
+def runCandidate(fun, sweep, transport, request):
+    """在空场景中以给定种子运行一次规则
+
+    OutPut:(回复字典, 结果所在的共享内存块或None)
+    """
+    props = bpy.context.scene.adt_props
+    sweep.applyOverrides(props, request.get("props", {}))
+    props.pool_isenable = False  # worker内直接运行规则
+    clearScene()
+
+    base = request.get("base")
+    if base is not None:
+        with transport.receive(base) as block:
+            mesh = fun.meshFromShared("BaseBox", block)
+        fun.linkMesh("BaseBox", mesh, (0, 0, 0))
+
+    random.seed(request["seed"])
+    result = getattr(bpy.ops.ronge_adt, request["rule"])()
+    if "FINISHED" not in result:
+        return {"id": request["id"], "status": "CANCELLED"}, None
+
+    block = fun.shareMesh(bpy.context.scene.objects["BaseBox"])
+    return {"id": request["id"], "status": "FINISHED", "mesh": block.descriptor}, block
+
+
+def runServe():
+    package = loadAddon()
+    fun = importlib.import_module(package + ".functions")
+    pool = importlib.import_module(package + ".pool")
+    sweep = importlib.import_module(package + ".sweep")
+    transport = importlib.import_module(package + ".transport")
+
+    # 启动完成，协调进程从此刻起计算请求时限
+    print(pool.encodeReply(pool.READY_REPLY), flush=True)
+
+    # 上一个结果的共享内存句柄，协调进程读取（或丢弃）前保持打开
+    held = None
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if held is not None:
+            held.close()
+            held = None
+        try:
+            reply, held = runCandidate(fun, sweep, transport, request)
+        except Exception as e:
+            reply = {"id": request.get("id"), "status": "ERROR", "message": str(e)}
+        print(pool.encodeReply(reply), flush=True)
+
+
+COMMANDS = {
+    "sweep": runSweep,
+    "serve": runServe,
+}
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if not argv or argv[0] not in COMMANDS:
+        print(f"用法: worker.py -- <{'|'.join(COMMANDS)}> ...")
+        return 1
+
+    COMMANDS[argv[0]](*argv[1:])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
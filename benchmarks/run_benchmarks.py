@@ -0,0 +1,406 @@
+"""
+Architectural Design Tool - Benchmark Suite
+===========================================
+
+Times every rule operator (Merge through Expland) and full Auto chains inside
+a real Blender session, using fixed seeds across a grid of input sizes,
+Twist cut intervals and attempt budgets.
+
+Usage:
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- \
+        [--output bench_results.json] [--baseline benchmarks/baseline.json] \
+        [--update-baseline] [--tolerance 0.25] [--repeat 5] [--quick] [--clip-compare]
+
+Each case records mean/min time per call, throughput (calls per second),
+peak memory and the vertex count of the resulting BaseBox. Memory is
+measured in extra, untimed runs so it never inflates the timings. The main
+figure is the peak resident set size (RSS) during one run, measured from
+the RSS before it. This covers Blender's native mesh and BVH allocations.
+On Linux the kernel's peak counter is reset before each run
+(/proc/self/clear_refs); elsewhere only growth of the process-wide
+ru_maxrss is visible, so the figure is a lower bound. A second run under
+tracemalloc records the peak Python heap as a secondary figure. When a
+baseline file exists, every case is compared against it and the process
+exits with code 1 if any case regressed.
+
+Boolean cutters are clipped to the BaseBox bounds before sub/mul booleans;
+each case reports how much that shrank the operands. With --clip-compare,
+every case is run a second time with clipping disabled and the time saved
+is recorded.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import bpy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Make the addon importable when run from the repository root
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repo_dir)
+
+import architectural_design_tool as adt
+from architectural_design_tool import functions
+
+
+BASE_RULES = ["merge", "branch", "extract"]
+DEFORMATION_RULES = ["offset", "twist", "shift"]
+CULLING_RULES = ["carve", "frature", "expland"]
+
+# 输入尺寸：(名称, 覆盖参数)
+SCALES = [
+    ("s", {"min_size": 0.5, "max_size": 1.0, "max_area": 1.0}),
+    ("m", {"min_size": 1.0, "max_size": 2.0, "max_area": 3.0}),
+    ("l", {"min_size": 2.0, "max_size": 4.0, "max_area": 8.0}),
+]
+INTERVALS = [0.1, 0.05, 0.025]
+ATTEMPTS = [100, 1000]
+CHAINS = [(1, 1), (2, 2), (3, 3)]
+
+SAMPLING_RULES = ["merge", "extract", "carve"]
+DEFAULT_SEED = 20251122
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def parseArgs():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(description="ADT benchmark suite")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--auto-count", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="只运行最小尺寸")
+    parser.add_argument("--filter", default="", help="只运行包含该字符串的用例")
+    parser.add_argument("--clip-compare", action="store_true", help="再关闭切割体裁剪运行一次作对比")
+    return parser.parse_args(argv)
+
+
+def resetScene():
+    """删除场景中所有物体并清理数据块"""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def applyProps(props, overrides):
+    """应用参数覆盖，返回原值用于恢复"""
+    old = {}
+    for key, value in overrides.items():
+        old[key] = getattr(props, key)
+        setattr(props, key, value)
+    return old
+
+
+def callRule(rule):
+    return getattr(bpy.ops.ronge_adt, rule)()
+
+
+def baseVertexCount():
+    base = bpy.context.scene.objects.get("BaseBox")
+    if base is None:
+        return 0
+    return len(base.data.vertices)
+
+
+def buildCases(args):
+    """生成所有用例：(用例ID, 类型, 规则, 参数覆盖)"""
+    scales = SCALES[:1] if args.quick else SCALES
+    cases = []
+
+    for scale_name, scale in scales:
+        for rule in BASE_RULES + DEFORMATION_RULES + CULLING_RULES:
+            if rule in SAMPLING_RULES:
+                for attempts in ATTEMPTS:
+                    overrides = dict(scale, max_attempts=attempts)
+                    cases.append((f"{rule}/{scale_name}/a{attempts}", "rule", rule, overrides))
+            elif rule == "twist":
+                for interval in INTERVALS:
+                    overrides = dict(scale, twist_cutinterval=interval)
+                    cases.append((f"{rule}/{scale_name}/i{interval}", "rule", rule, overrides))
+            else:
+                cases.append((f"{rule}/{scale_name}", "rule", rule, dict(scale)))
+
+        for deformation, culling in CHAINS:
+            overrides = dict(
+                scale,
+                auto_count=args.auto_count,
+                auto_deformation_count=deformation,
+                auto_culling_count=culling,
+            )
+            cases.append((f"auto/{scale_name}/d{deformation}c{culling}", "auto", "auto", overrides))
+
+    if args.filter:
+        cases = [case for case in cases if args.filter in case[0]]
+    return cases
+
+
+def prepareRun(kind, rule, seed):
+    """清空场景并设置种子，形变/剔除规则先生成一个BaseBox（不计时），OutPut:是否成功"""
+    resetScene()
+    random.seed(seed)
+    if kind == "rule" and rule not in BASE_RULES:
+        return "FINISHED" in callRule("merge")
+    return True
+
+
+def callCase(kind, rule):
+    if kind == "auto":
+        return bpy.ops.ronge_adt.auto()
+    return callRule(rule)
+
+
+def currentRss():
+    """OutPut:当前常驻内存(KB)，无法读取时为None"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024
+
+
+def resetPeakRss():
+    """把内核记录的常驻内存峰值(VmHWM)重置为当前值，OutPut:是否成功（仅Linux）"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peakRss():
+    """OutPut:进程常驻内存峰值(KB)，无法读取时为None"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS以字节为单位
+    return peak / 1024 if sys.platform == "darwin" else float(peak)
+
+
+def peakMemory(kind, rule, seed):
+    """单独运行一次（不计时）测常驻内存峰值增量，再在tracemalloc下运行一次测Python内存峰值
+
+    OutPut:(常驻内存峰值增量KB, Python内存峰值KB)，准备失败或无法读取时对应项为None
+    """
+    rss = None
+    if prepareRun(kind, rule, seed):
+        before = currentRss()
+        if not resetPeakRss():
+            # 无法重置峰值时只能看到超过此前峰值的部分
+            before = peakRss()
+        callCase(kind, rule)
+        after = peakRss()
+        if before is not None and after is not None:
+            rss = max(after - before, 0.0)
+
+    if not prepareRun(kind, rule, seed):
+        return rss, None
+    tracemalloc.start()
+    try:
+        callCase(kind, rule)
+        return rss, tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def runCase(props, kind, rule, overrides, repeat, seed, memory=True):
+    """以固定种子运行一个用例 repeat 次，memory为True时再单独测内存峰值"""
+    old = applyProps(props, overrides)
+    timings = []
+    vertex_counts = []
+    failures = 0
+    rss_peak = py_peak = None
+    functions.resetClipStats()
+
+    try:
+        for run in range(repeat):
+            if not prepareRun(kind, rule, seed + run):
+                failures += 1
+                continue
+
+            start = time.perf_counter()
+            result = callCase(kind, rule)
+            elapsed = time.perf_counter() - start
+
+            if "FINISHED" not in result:
+                failures += 1
+                continue
+
+            timings.append(elapsed)
+            if kind == "auto":
+                vertex_counts.append(
+                    sum(len(obj.data.vertices) for obj in bpy.data.objects if obj.type == "MESH")
+                )
+            else:
+                vertex_counts.append(baseVertexCount())
+
+        # 裁剪统计只来自计时运行
+        clip = dict(functions.clipStats)
+        if memory:
+            rss_peak, py_peak = peakMemory(kind, rule, seed)
+    finally:
+        applyProps(props, old)
+        resetScene()
+
+    units = overrides.get("auto_count", 1) if kind == "auto" else 1
+    mean = sum(timings) / len(timings) if timings else None
+    clip["extent_ratio"] = (
+        clip["extent_after"] / clip["extent_before"] if clip["extent_before"] else None
+    )
+
+    return {
+        "kind": kind,
+        "rule": rule,
+        "params": overrides,
+        "seed": seed,
+        "runs": repeat,
+        "failures": failures,
+        "mean_s": mean,
+        "min_s": min(timings) if timings else None,
+        "throughput": units / mean if mean else None,
+        "rss_peak_kb": rss_peak,
+        "py_peak_kb": py_peak,
+        "vertex_counts": vertex_counts,
+        "clip": clip,
+    }
+
+
+def runUnclipped(props, kind, rule, overrides, repeat, seed):
+    """关闭切割体裁剪重新运行用例，OutPut:平均耗时"""
+    functions.CLIP_CUTTERS = False
+    try:
+        return runCase(props, kind, rule, overrides, repeat, seed, memory=False)["mean_s"]
+    finally:
+        functions.CLIP_CUTTERS = True
+
+
+def compareBaseline(results, baseline, tolerance):
+    """与基准比较，返回 (回退列表, 输出变化列表)"""
+    regressions = []
+    changed = []
+
+    for case_id, base in baseline.get("results", {}).items():
+        current = results.get(case_id)
+        if current is None or current["mean_s"] is None or not base.get("mean_s"):
+            continue
+
+        ratio = current["mean_s"] / base["mean_s"]
+        current["baseline_ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append((case_id, ratio))
+
+        # 固定种子下输出顶点数应保持一致
+        if base.get("vertex_counts") != current["vertex_counts"]:
+            changed.append(case_id)
+
+    return regressions, changed
+
+
+def main():
+    args = parseArgs()
+
+    try:
+        adt.register()
+    except ValueError:
+        pass  # 已注册
+
+    props = bpy.context.scene.adt_props
+    cases = buildCases(args)
+
+    print("Architectural Design Tool - Benchmark Suite")
+    print("=" * 60)
+    print(f"Cases: {len(cases)}  Repeat: {args.repeat}  Seed: {args.seed}")
+    print("-" * 60)
+
+    results = {}
+    for case_id, kind, rule, overrides in cases:
+        result = runCase(props, kind, rule, overrides, args.repeat, args.seed)
+        results[case_id] = result
+
+        mean = f"{result['mean_s'] * 1000:10.2f}ms" if result["mean_s"] else "       n/a"
+        throughput = f"{result['throughput']:8.2f}/s" if result["throughput"] else "     n/a"
+        clip = ""
+        if result["clip"]["count"]:
+            clip = f"  clip={result['clip']['count']}x->{result['clip']['extent_ratio']:.1%}"
+
+        if args.clip_compare and result["clip"]["count"]:
+            unclipped = runUnclipped(props, kind, rule, overrides, args.repeat, args.seed)
+            result["unclipped_mean_s"] = unclipped
+            if unclipped and result["mean_s"]:
+                result["clip_saved_s"] = unclipped - result["mean_s"]
+                clip += f" saved={result['clip_saved_s'] * 1000:.2f}ms"
+        rss = f"  rss=+{result['rss_peak_kb'] / 1024:.1f}MB" if result["rss_peak_kb"] is not None else ""
+        print(f"{case_id:<28} {mean} {throughput}  fail={result['failures']}{rss}{clip}")
+
+    report = {
+        "meta": {
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "blender": bpy.app.version_string,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "addon_version": list(adt.bl_info["version"]),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions, changed = compareBaseline(results, baseline, args.tolerance)
+        report["regressions"] = [case_id for case_id, _ in regressions]
+        report["output_changed"] = changed
+
+        print("-" * 60)
+        for case_id, ratio in regressions:
+            print(f"REGRESSION {case_id}: {ratio:.2f}x baseline")
+        for case_id in changed:
+            print(f"OUTPUT CHANGED {case_id}")
+        if regressions:
+            exit_code = 1
+        else:
+            print(f"No regressions beyond {args.tolerance:.0%} tolerance")
+    elif not args.update_baseline:
+        print(f"No baseline at {args.baseline}, skipping comparison")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
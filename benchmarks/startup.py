@@ -0,0 +1,154 @@
+"""
+Architectural Design Tool - Startup Benchmark
+=============================================
+
+Measures how long a fresh `blender -b` worker takes before it can run its
+first rule, which is the fixed cost every farm or sweep worker pays.
+
+Usage (plain Python, launches Blender itself):
+    python benchmarks/startup.py [--blender /path/to/blender] [--repeat 5] \
+        [--output startup_results.json]
+
+Each mode is run `repeat` times in a new process:
+    bare        Blender start and quit, no addon
+    register    import + headless register()
+    full        import + registration including the UI panels
+    first_op    headless register() followed by the first Merge call
+
+Wall time is measured around the whole process; in-process timings for
+import, register and the first operator are reported by the child on a
+line prefixed with ADT_STARTUP.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程中执行的代码：按模式导入、注册插件并汇报各阶段耗时
+CHILD_CODE = """
+import json, sys, time
+mode = {mode!r}
+timings = {{}}
+if mode != "bare":
+    sys.path.insert(0, {repo_dir!r})
+    import bpy
+    start = time.perf_counter()
+    import architectural_design_tool as adt
+    timings["import_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if mode == "full":
+        # -b 下register()总是无界面注册，这里手动连同面板一起注册
+        bpy.utils.register_classes_factory(adt.classes + adt.uiClasses())[0]()
+        bpy.types.Scene.adt_props = bpy.props.PointerProperty(type=adt.props.ADTProps)
+    else:
+        adt.register()
+    timings["register_s"] = time.perf_counter() - start
+
+    if mode == "first_op":
+        start = time.perf_counter()
+        bpy.ops.ronge_adt.merge()
+        timings["first_op_s"] = time.perf_counter() - start
+print("ADT_STARTUP " + json.dumps(timings))
+"""
+
+MODES = ["bare", "register", "full", "first_op"]
+
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="ADT worker startup benchmark")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="startup_results.json")
+    return parser.parse_args()
+
+
+def runOnce(blender, mode):
+    """OutPut:(进程总耗时, 子进程汇报的各阶段耗时)"""
+    command = [
+        blender,
+        "-b",
+        "--factory-startup",
+        "--python-expr",
+        CHILD_CODE.format(mode=mode, repo_dir=repo_dir),
+    ]
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    timings = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("ADT_STARTUP "):
+            timings = json.loads(line[len("ADT_STARTUP "):])
+    if result.returncode != 0 or "ADT_STARTUP" not in result.stdout:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+        raise RuntimeError(f"{mode} 运行失败，退出码 {result.returncode}")
+    return wall, timings
+
+
+def summarize(values):
+    return {
+        "mean_s": statistics.mean(values),
+        "min_s": min(values),
+        "max_s": max(values),
+    }
+
+
+def main():
+    args = parseArgs()
+
+    print("Architectural Design Tool - Startup Benchmark")
+    print("=" * 60)
+
+    results = {}
+    for mode in MODES:
+        walls = []
+        stages = {}
+        for i in range(args.repeat):
+            wall, timings = runOnce(args.blender, mode)
+            walls.append(wall)
+            for key, value in timings.items():
+                stages.setdefault(key, []).append(value)
+
+        results[mode] = {"wall": summarize(walls)}
+        results[mode].update({key: summarize(values) for key, values in stages.items()})
+
+        detail = "  ".join(
+            f"{key}={summary['mean_s'] * 1000:.1f}ms"
+            for key, summary in results[mode].items()
+            if key != "wall"
+        )
+        print(f"{mode:<10} wall={results[mode]['wall']['mean_s'] * 1000:8.1f}ms  {detail}")
+
+    # 插件相对裸启动的额外开销
+    bare = results["bare"]["wall"]["mean_s"]
+    for mode in MODES[1:]:
+        results[mode]["overhead_s"] = results[mode]["wall"]["mean_s"] - bare
+
+    report = {
+        "meta": {
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "blender": args.blender,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())